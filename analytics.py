@@ -0,0 +1,265 @@
+# app/analytics.py
+
+import math
+import bisect
+from array import array
+
+NAN = float('nan')
+
+_numpy_module = False  # Not imported yet; see _numpy()
+
+
+def _numpy():
+    """Returns NumPy, or None if it is missing (pure Python fallbacks below).
+
+    Imported on first use rather than at start-up, since loading NumPy costs
+    more than everything else the portal imports.
+    """
+    global _numpy_module
+    if _numpy_module is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy_module = numpy
+    return _numpy_module
+
+
+def _to_float(value):
+    """Marks are stored as numbers, though older files may still hold strings
+    like "16.7"; anything non-numeric or non-finite is missing."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return NAN
+    return number if math.isfinite(number) else NAN
+
+
+class _CourseColumns:
+    """Column-oriented copy of one course's numbers: one row per enrolled student.
+
+    Columns are array('d') so rows can be updated in place and appended
+    cheaply; NumPy reads them through the buffer protocol without copying.
+    Missing values are NaN.
+    """
+    def __init__(self):
+        self.ids = []
+        self.rows = {}  # student_id -> row
+        self.attendance = array('d')
+        self.marks = {}  # subject -> array('d')
+
+    def set_row(self, student_id, course_data):
+        row = self.rows.get(student_id)
+        if row is None:
+            row = self.rows[student_id] = len(self.ids)
+            self.ids.append(student_id)
+            self.attendance.append(NAN)
+            for column in self.marks.values():
+                column.append(NAN)
+
+        self.attendance[row] = _to_float(course_data.get('attendance'))
+        marks = course_data.get('marks', {})
+        for subject, column in self.marks.items():
+            column[row] = _to_float(marks.get(subject))
+        for subject, mark in marks.items():
+            if subject not in self.marks:
+                column = self.marks[subject] = array('d', [NAN]) * len(self.ids)
+                column[row] = _to_float(mark)
+
+    def drop_row(self, student_id):
+        """Removes a row by moving the last row into its place."""
+        row = self.rows.pop(student_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            self.attendance[row] = self.attendance[last]
+            for column in self.marks.values():
+                column[row] = column[last]
+        self.ids.pop()
+        self.attendance.pop()
+        for column in self.marks.values():
+            column.pop()
+
+
+def _values(column):
+    """Returns the non-missing values of a column (NumPy array or sorted list)."""
+    np = _numpy()
+    if np is not None:
+        values = np.frombuffer(column, dtype=np.float64)
+        return np.sort(values[~np.isnan(values)])
+    return sorted(v for v in column if v == v)
+
+
+def _percentile(ordered, q):
+    """Linear interpolation between closest ranks, like numpy.percentile's default."""
+    np = _numpy()
+    if np is not None:
+        return float(np.percentile(ordered, q))
+    position = (len(ordered) - 1) * q / 100.0
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _describe(column, percentiles=(25, 50, 75)):
+    np = _numpy()
+    ordered = _values(column)
+    count = len(ordered)
+    if not count:
+        return {"count": 0}
+    total = float(ordered.sum()) if np is not None else math.fsum(ordered)
+    summary = {"count": count, "mean": total / count,
+               "min": float(ordered[0]), "max": float(ordered[-1])}
+    for q in percentiles:
+        summary[f"p{q}"] = _percentile(ordered, q)
+    return summary
+
+
+class Analytics:
+    """Aggregate statistics over courses, kept up to date incrementally.
+
+    A course's columns are built the first time it is queried. After that,
+    DataManager reports every saved student through students_changed() and
+    only those students' rows are refreshed.
+    """
+    def __init__(self, data_manager):
+        self.dm = data_manager
+        self._courses = {}  # course_id -> _CourseColumns
+
+    def reset(self):
+        """Forgets every course, e.g. after the data was reloaded from disk."""
+        self._courses = {}
+
+    def students_changed(self, student_ids):
+        if not self._courses:
+            return
+        students = self.dm.student_data.get('students', {})
+        for student_id in student_ids:
+            entry = students.get(student_id) if student_id in students else None
+            course_data = entry.get('course_data', {}) if entry else {}
+            enrolled = entry.get('enrolled_courses', []) if entry else []
+            for course_id, columns in self._courses.items():
+                if course_id in enrolled:
+                    columns.set_row(student_id, course_data.get(course_id, {}))
+                else:
+                    columns.drop_row(student_id)
+
+    def _columns(self, course_id):
+        columns = self._courses.get(course_id)
+        if columns is None:
+            columns = _CourseColumns()
+            students = self.dm.student_data.get('students', {})
+            for student_id in self.dm.get_students_in_course(course_id):
+                course_data = students[student_id].get('course_data', {}).get(course_id, {})
+                columns.set_row(student_id, course_data)
+            self._courses[course_id] = columns
+        return columns
+
+    # ---------- Queries ----------
+
+    def course_summary(self, course_id):
+        """Returns enrollment, attendance and per-assessment statistics for a course."""
+        columns = self._columns(course_id)
+        marks = {}
+        for subject, column in columns.marks.items():
+            summary = _describe(column)
+            if summary["count"]:  # Skip assessments left over from dropped students
+                marks[subject] = summary
+        return {"students": len(columns.ids),
+                "attendance": _describe(columns.attendance),
+                "marks": marks}
+
+    def percentiles(self, course_id, subject, qs=(25, 50, 75)):
+        """Returns {q: value} for one assessment; empty if nobody has a mark."""
+        column = self._columns(course_id).marks.get(subject)
+        ordered = _values(column) if column is not None else []
+        if not len(ordered):
+            return {}
+        return {q: _percentile(ordered, q) for q in qs}
+
+    def histogram(self, course_id, subject=None, bins=10, value_range=None):
+        """Returns (counts, edges) for an assessment, or attendance if subject is None.
+
+        Bins are equal-width; the last bin includes its right edge, as in
+        numpy.histogram.
+        """
+        np = _numpy()
+        columns = self._columns(course_id)
+        column = columns.attendance if subject is None else columns.marks.get(subject, array('d'))
+        ordered = _values(column)
+        if value_range is None:
+            value_range = (float(ordered[0]), float(ordered[-1])) if len(ordered) else (0.0, 1.0)
+        low, high = value_range
+        if high <= low:
+            low, high = low - 0.5, high + 0.5
+        if np is not None:
+            counts, edges = np.histogram(ordered, bins=bins, range=(low, high))
+            return counts.tolist(), edges.tolist()
+        width = (high - low) / bins
+        edges = [low + i * width for i in range(bins)] + [high]
+        counts = [0] * bins
+        for value in ordered:
+            if low <= value <= high:
+                counts[min(bisect.bisect_right(edges, value) - 1, bins - 1)] += 1
+        return counts, edges
+
+    def weighted_totals(self, course_id):
+        """Returns [(student_id, weighted percentage)], best first.
+
+        Uses each assessment's max score and weight from the course
+        definitions; students without any marks are left out.
+        """
+        np = _numpy()
+        columns = self._columns(course_id)
+        assessments = self.dm.get_assessments(course_id)
+        scales = {subject: (assessments.get(subject, {}).get('weight', 1), self.dm.max_score(course_id, subject))
+                  for subject in columns.marks}
+        if np is not None:
+            earned = np.zeros(len(columns.ids))
+            weights = np.zeros(len(columns.ids))
+            for subject, column in columns.marks.items():
+                weight, max_score = scales[subject]
+                values = np.frombuffer(column, dtype=np.float64)
+                present = ~np.isnan(values)
+                earned[present] += weight * values[present] / max_score
+                weights[present] += weight
+            rows = np.flatnonzero(weights > 0)
+            totals = np.round(100 * earned[rows] / weights[rows], 2)
+            order = np.argsort(-totals, kind='stable')
+            return [(columns.ids[rows[i]], float(totals[i])) for i in order]
+
+        earned = [0.0] * len(columns.ids)
+        weights = [0.0] * len(columns.ids)
+        for subject, column in columns.marks.items():
+            weight, max_score = scales[subject]
+            for row, value in enumerate(column):
+                if value == value:
+                    earned[row] += weight * value / max_score
+                    weights[row] += weight
+        totals = [(columns.ids[row], round(100 * earned[row] / weights[row], 2))
+                  for row in range(len(columns.ids)) if weights[row]]
+        totals.sort(key=lambda item: -item[1])
+        return totals
+
+    def attendance_below(self, threshold=75, course_id=None):
+        """Returns (student_id, course_id, attendance) rows below the threshold.
+
+        Covers one course, or every course when course_id is None. Students
+        without recorded attendance are not listed.
+        """
+        np = _numpy()
+        course_ids = [course_id] if course_id is not None else list(self.dm.courses)
+        rows = []
+        for cid in course_ids:
+            columns = self._columns(cid)
+            if np is not None:
+                values = np.frombuffer(columns.attendance, dtype=np.float64)
+                hits = np.flatnonzero(values < threshold)  # NaN compares False
+            else:
+                hits = [row for row, value in enumerate(columns.attendance) if value < threshold]
+            rows.extend((columns.ids[row], cid, columns.attendance[row]) for row in hits)
+        return rows
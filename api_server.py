@@ -0,0 +1,399 @@
+# app/api_server.py
+"""Headless HTTP/JSON API in front of one shared DataManager, e.g.
+
+    python -m app.api_server --port 8765
+
+    POST /login                                  {"role", "user_id", "password"} -> {"token"}
+    POST /logout
+    GET  /students/<sid>/courses
+    GET  /students/<sid>/courses/<cid>           attendance, marks and projects
+    PUT  /students/<sid>/courses/<cid>/attendance {"attendance": 90}
+    POST /students/<sid>/courses/<cid>/marks     {"subject", "mark"}
+    PUT  /students/<sid>/courses/<cid>/projects/<pid>/status {"status"}
+    GET  /courses/<cid>/students
+    POST /courses/<cid>/attendance               {"attendance": {sid: pct}}
+    POST /courses/<cid>/marks                    {"subject", "marks": {sid: mark}}
+    GET  /students/<sid>/exams                   the student's exams, with clash flags
+    GET  /exams
+    POST /exams                                  {"subject", "date", "time"}
+    POST /batch                                  {"requests": [{"method", "path", "body"}]}
+
+Other requests carry "Authorization: Bearer <token>"; a token expires once
+unused for SESSION_TTL seconds. Connections are kept alive (HTTP/1.1), and
+/batch runs many operations in one round trip.
+"""
+import os
+import re
+import json
+import time
+import asyncio
+import secrets
+import argparse
+from http import HTTPStatus
+from urllib.parse import urlsplit, unquote
+
+from app.data_manager import DataManager
+from app.serializers import UnsupportedFormatError
+
+# Same data layout as main.py
+DATA_DIR = 'data'
+CRED_PATH = os.path.join(DATA_DIR, 'credentials.json')
+STUDENT_DATA_PATH = os.path.join(DATA_DIR, 'student_data.json')
+COURSE_PATH = os.path.join(DATA_DIR, 'courses.json')
+JOURNAL_PATH = os.path.join(DATA_DIR, 'journal.log')
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH = 1000
+IDLE_TIMEOUT = 30  # Seconds a kept-alive connection may sit idle
+BODY_TIMEOUT = 30  # Seconds a client may take to send a request body
+SESSION_TTL = 8 * 60 * 60  # Seconds a session token lasts without being used
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _route(method, pattern):
+    """Marks an ApiServer method as the handler for a path pattern."""
+    regex = re.compile('^' + re.sub(r'<(\w+)>', r'(?P<\1>[^/]+)', pattern) + '$')
+
+    def decorator(handler):
+        handler.route = (method, regex)
+        return handler
+    return decorator
+
+
+class ApiServer:
+    """Routes JSON requests to a DataManager shared by every connection.
+
+    Handlers run on the event loop, so DataManager calls never overlap;
+    only the PBKDF2 part of a login is pushed to a worker thread, and any
+    resulting write happens back on the loop.
+    """
+    def __init__(self, data_manager, session_ttl=SESSION_TTL):
+        self.dm = data_manager
+        self.session_ttl = session_ttl
+        self.sessions = {}  # token -> [(role, user_id), expiry time]
+        self.routes = [getattr(self, name).route + (getattr(self, name),)
+                       for name in dir(self) if hasattr(getattr(self, name), 'route')]
+
+    # ---------- Connections ----------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, 431, {"error": "Request headers too large."}, False)
+                    break
+
+                try:
+                    method, target, version, headers = self._parse_head(head)
+                    length = int(headers.get('content-length', 0))
+                    if length < 0 or length > MAX_BODY_BYTES:
+                        raise ApiError(413, "Request body too large.")
+                    if 'chunked' in headers.get('transfer-encoding', ''):
+                        raise ApiError(411, "Chunked bodies are not supported; send Content-Length.")
+                except (ApiError, ValueError) as e:
+                    status = e.status if isinstance(e, ApiError) else 400
+                    await self._send(writer, status, {"error": getattr(e, 'message', "Bad request.")}, False)
+                    break
+
+                try:
+                    body = await asyncio.wait_for(reader.readexactly(length), BODY_TIMEOUT) if length else b""
+                except asyncio.TimeoutError:
+                    break  # A stalled upload must not hold the connection forever
+                if version == 'HTTP/1.1':
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                else:
+                    keep_alive = headers.get('connection', '').lower() == 'keep-alive'
+
+                status, payload = await self.dispatch(method, target, body, headers.get('authorization'))
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _parse_head(self, head):
+        lines = head.decode('latin-1').split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise ApiError(400, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return parts[0].upper(), parts[1], parts[2], headers
+
+    async def _send(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    # ---------- Dispatch ----------
+
+    async def dispatch(self, method, target, body, authorization=None, allow_batch=True):
+        """Returns (status, payload) for one request."""
+        try:
+            path = urlsplit(target).path
+            try:
+                data = json.loads(body) if body else {}
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise ApiError(400, "Request body is not valid JSON.")
+            if not isinstance(data, dict):
+                raise ApiError(400, "Request body must be a JSON object.")
+
+            # Pick up what other processes changed (a no-op unless --shared)
+            self.dm.refresh()
+            if (method, path) == ('POST', '/login'):
+                return await self.login(data)
+            session = self._session(authorization)
+            if (method, path) == ('POST', '/logout'):
+                return self.logout(authorization)
+            if (method, path) == ('POST', '/batch'):
+                if not allow_batch:
+                    raise ApiError(400, "Batches cannot be nested.")
+                return await self.batch(data, authorization)
+
+            path_allowed = False
+            for route_method, regex, handler in self.routes:
+                match = regex.match(path)
+                if match:
+                    path_allowed = True
+                    if route_method == method:
+                        params = {k: unquote(v) for k, v in match.groupdict().items()}
+                        return handler(session, data, **params)
+            if path_allowed:
+                raise ApiError(405, "Method not allowed.")
+            raise ApiError(404, "Not found.")
+        except ApiError as e:
+            return e.status, {"error": e.message}
+        except Exception:
+            # A bug in one handler must not drop the connection
+            return 500, {"error": "Internal server error."}
+
+    def _token(self, authorization):
+        return (authorization or '').removeprefix('Bearer ').strip()
+
+    def _session(self, authorization):
+        """Returns (role, user_id) for a live token and extends its lifetime."""
+        entry = self.sessions.get(self._token(authorization))
+        now = time.monotonic()
+        if entry is None or entry[1] < now:
+            raise ApiError(401, "Log in first.")
+        entry[1] = now + self.session_ttl
+        return entry[0]
+
+    def _drop_expired_sessions(self):
+        now = time.monotonic()
+        for token in [t for t, (_, expires) in self.sessions.items() if expires < now]:
+            del self.sessions[token]
+
+    def _result(self, success, message):
+        """Turns a DataManager (success, message) pair into a response."""
+        if success:
+            return 200, {"message": message}
+        return 400, {"error": message}
+
+    def _field(self, data, key, types=(str,)):
+        """Returns data[key] (None if absent), rejecting values of the wrong JSON type."""
+        value = data.get(key)
+        if value is not None and (not isinstance(value, types) or isinstance(value, bool)):
+            raise ApiError(400, f"{key} has the wrong type.")
+        return value
+
+    # ---------- Access Checks ----------
+
+    def _require_student(self, session, student_id):
+        role, user_id = session
+        if role == 'student' and user_id != student_id:
+            raise ApiError(403, "Students can only see their own records.")
+        if student_id not in self.dm.credentials.get('student', {}):
+            raise ApiError(404, "Student not found.")
+
+    def _require_course(self, session, course_id, teaching=False):
+        role, user_id = session
+        if course_id not in self.dm.courses:
+            raise ApiError(404, "Course not found.")
+        if role == 'faculty' and course_id not in self.dm.get_courses_for_faculty(user_id):
+            raise ApiError(403, "You do not teach this course.")
+        if teaching and role == 'student':
+            raise ApiError(403, "Only faculty and admins can do this.")
+
+    def _require_enrolled(self, student_id, course_id):
+        if not self.dm.is_enrolled(student_id, course_id):
+            raise ApiError(400, "Student is not enrolled in this course.")
+
+    # ---------- Endpoints ----------
+
+    async def login(self, data):
+        role, user_id, password = (self._field(data, key) for key in ('role', 'user_id', 'password'))
+        if not role or not user_id or not password:
+            raise ApiError(400, "role, user_id and password are required.")
+        # PBKDF2 is deliberately slow; keep it off the event loop, but save
+        # any upgraded hash here (SQLite connections are bound to this thread)
+        verified = await asyncio.get_running_loop().run_in_executor(
+            None, self.dm.check_password, role, user_id, password)
+        if verified is None:
+            raise ApiError(401, "Invalid credentials.")
+        self.dm.complete_login(role, user_id, password, *verified)
+        self._drop_expired_sessions()
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = [(role, user_id), time.monotonic() + self.session_ttl]
+        return 200, {"token": token, "role": role, "user_id": user_id}
+
+    def logout(self, authorization):
+        # Only this token; the user's other sessions stay logged in
+        self.sessions.pop(self._token(authorization), None)
+        return 200, {"message": "Logged out."}
+
+    async def batch(self, data, authorization):
+        requests = data.get('requests')
+        if not isinstance(requests, list) or not requests:
+            raise ApiError(400, "requests must be a non-empty list.")
+        if len(requests) > MAX_BATCH:
+            raise ApiError(413, f"At most {MAX_BATCH} requests per batch.")
+        results = []
+        for item in requests:
+            if not isinstance(item, dict):
+                results.append({"status": 400, "body": {"error": "Each request must be an object."}})
+                continue
+            body = json.dumps(item.get('body') or {}).encode('utf-8')
+            status, payload = await self.dispatch(str(item.get('method', 'GET')).upper(),
+                                                  str(item.get('path', '')), body,
+                                                  authorization, allow_batch=False)
+            results.append({"status": status, "body": payload})
+        return 200, {"results": results}
+
+    @_route('GET', '/students/<student_id>/courses')
+    def student_courses(self, session, data, student_id):
+        self._require_student(session, student_id)
+        return 200, {"courses": self.dm.get_courses_for_student(student_id)}
+
+    @_route('GET', '/students/<student_id>/courses/<course_id>')
+    def student_course(self, session, data, student_id, course_id):
+        self._require_student(session, student_id)
+        self._require_course(session, course_id)
+        return 200, {"attendance": self.dm.get_attendance(student_id, course_id),
+                     "marks": self.dm.get_marks(student_id, course_id),
+                     "projects": self.dm.get_projects(student_id, course_id)}
+
+    @_route('PUT', '/students/<student_id>/courses/<course_id>/attendance')
+    def set_attendance(self, session, data, student_id, course_id):
+        self._require_student(session, student_id)
+        self._require_course(session, course_id, teaching=True)
+        self._require_enrolled(student_id, course_id)
+        attendance = self._field(data, 'attendance', (int, float, str))
+        return self._result(*self.dm.set_attendance(student_id, course_id, attendance))
+
+    @_route('POST', '/students/<student_id>/courses/<course_id>/marks')
+    def add_mark(self, session, data, student_id, course_id):
+        self._require_student(session, student_id)
+        self._require_course(session, course_id, teaching=True)
+        self._require_enrolled(student_id, course_id)
+        return self._result(*self.dm.add_student_mark(student_id, course_id, self._field(data, 'subject'),
+                                                      self._field(data, 'mark', (int, float, str))))
+
+    @_route('PUT', '/students/<student_id>/courses/<course_id>/projects/<project_id>/status')
+    def set_project_status(self, session, data, student_id, course_id, project_id):
+        self._require_student(session, student_id)
+        self._require_course(session, course_id)
+        status = self._field(data, 'status')
+        # Students may hand in their own work; anything else is for faculty
+        if session[0] == 'student' and status != 'submitted':
+            raise ApiError(403, "Students can only mark a project as submitted.")
+        if not project_id.isdecimal():  # isdigit() also accepts e.g. "²", which int() rejects
+            raise ApiError(404, "Project not found.")
+        return self._result(*self.dm.set_project_status(student_id, course_id, int(project_id), status))
+
+    @_route('GET', '/courses/<course_id>/students')
+    def roster(self, session, data, course_id):
+        self._require_course(session, course_id, teaching=True)
+        return 200, {"students": self.dm.get_students_in_course(course_id)}
+
+    @_route('POST', '/courses/<course_id>/attendance')
+    def set_attendance_bulk(self, session, data, course_id):
+        self._require_course(session, course_id, teaching=True)
+        attendance = data.get('attendance')
+        if not isinstance(attendance, dict):
+            raise ApiError(400, "attendance must map student IDs to percentages.")
+        return self._result(*self.dm.set_attendance_bulk(course_id, attendance))
+
+    @_route('POST', '/courses/<course_id>/marks')
+    def add_marks_bulk(self, session, data, course_id):
+        self._require_course(session, course_id, teaching=True)
+        marks = data.get('marks')
+        if not isinstance(marks, dict):
+            raise ApiError(400, "marks must map student IDs to marks.")
+        return self._result(*self.dm.add_marks_bulk(course_id, self._field(data, 'subject'), marks))
+
+    @_route('GET', '/students/<student_id>/exams')
+    def student_exams(self, session, data, student_id):
+        self._require_student(session, student_id)
+        return 200, {"exams": self.dm.get_student_exams(student_id)}
+
+    @_route('GET', '/exams')
+    def exams(self, session, data):
+        return 200, {"exams": self.dm.get_exam_schedule()}
+
+    @_route('POST', '/exams')
+    def add_exam(self, session, data):
+        if session[0] != 'admin':
+            raise ApiError(403, "Only admins can schedule exams.")
+        return self._result(*self.dm.add_exam(*(self._field(data, key) for key in ('subject', 'date', 'time'))))
+
+
+async def serve(data_manager, host='127.0.0.1', port=8765, session_ttl=SESSION_TTL):
+    """Starts the API server and returns the asyncio Server (port 0 picks a free one)."""
+    api = ApiServer(data_manager, session_ttl)
+    return await asyncio.start_server(api.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the portal's data as an HTTP/JSON API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--shared', action='store_true',
+                        help="share the data folder with portals started with --shared")
+    args = parser.parse_args(argv)
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    try:
+        data_manager = DataManager(CRED_PATH, STUDENT_DATA_PATH, COURSE_PATH, journal_file=JOURNAL_PATH,
+                                   background_writes=True, fsync_every=20, fsync_interval_ms=200,
+                                   file_format='compact', shared=args.shared)
+    except UnsupportedFormatError as e:
+        raise SystemExit(f"Cannot start: {e}")
+
+    async def run():
+        server = await serve(data_manager, args.host, args.port)
+        print(f"Serving on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        data_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,46 @@
 # app/data_manager.py
 
 import os
-import json
+import math
+import time
+import contextlib
+import functools
+import threading
+
+from app.journal import Journal
+from app.sqlite_store import SQLiteStore, migrate_json_to_sqlite
+from app.shard_store import ShardStore
+from app.student_cache import LazyStudentMap
+from app.passwords import hash_password, hash_passwords, is_hashed, verify_password, VerifiedCache, DEFAULT_ITERATIONS
+from app.writer import BackgroundWriter
+from app.durable_io import atomic_write, FsyncBatcher
+from app import serializers
+from app.file_lock import FileLock
+from app.analytics import Analytics
+from app.timetable import TimetableIndex, slot_mask, mask_slots
+from app import exam_scheduler
+from app.search_index import SearchIndex
+from app.events import EventBus
+
+DEFAULT_MAX_SCORE = 100
+PROJECT_STATUSES = ('assigned', 'submitted', 'graded')
+
+def _synchronized(method):
+    """Runs a mutating method under the DataManager lock, so the background
+    writer never serializes a store while it is half-updated. In shared mode
+    this also takes the cross-process lock and picks up external changes."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._exclusive():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class DataManager:
-    def __init__(self, credentials_file, student_data_file, courses_file):
+    def __init__(self, credentials_file, student_data_file, courses_file, journal_file=None, compact_every=500,
+                 db_file=None, student_dir=None, max_loaded_students=1000,
+                 password_iterations=DEFAULT_ITERATIONS, login_cache_ttl=300, background_writes=False,
+                 fsync_every=1, fsync_interval_ms=0, file_format='json', shared=False, defer_loading=False,
+                 read_only=False):
         self.credentials_file = credentials_file
         self.student_data_file = student_data_file
         self.courses_file = courses_file
@@ -13,63 +49,686 @@ class DataManager:
         self.student_data = {}
         self.exam_schedule = []
         self.courses = {}
-        
-        self._load_credentials()
-        self._load_courses()
-        self._load_student_data()
+
+        # Read-only view, e.g. for exports next to a running portal: nothing is
+        # ever written (no defaults for missing files, no password rehashing,
+        # no journal recovery or compaction) and mutators raise. Covers the
+        # JSON and journal layout only.
+        if read_only and (db_file or student_dir):
+            raise ValueError("read_only works with the JSON files and journal only.")
+        self.read_only = read_only
+
+        # With background_writes, file saves run on a worker thread so callers
+        # (e.g. Tk button callbacks) never wait on disk; flush() is the barrier.
+        self.lock = threading.RLock()
+        # Nesting depth of _exclusive(); the lazy student cache is only trimmed
+        # when the outermost operation ends, after everything it touched is saved
+        self._depth = 0
+        self.writer = BackgroundWriter() if background_writes and not shared else None
+
+        # Shared mode: several processes may use the same data directory. Every
+        # mutation holds an advisory file lock and first reloads whatever
+        # another process changed, detected via file stamps (mtime, size), the
+        # journal's length or SQLite's data_version. Saves are synchronous.
+        self.file_lock = None
+        if shared:
+            data_dir = os.path.dirname(os.path.abspath(credentials_file))
+            self.file_lock = FileLock(os.path.join(data_dir, '.portal.lock'))
+        self._stamps = {}
+        self._db_version = None
+
+        # Course statistics, built on first query and then updated per saved student
+        self.analytics = Analytics(self)
+        # Per-role search indexes over user IDs, built on first search
+        self._user_indexes = {}
+        # Change stamps for cached views: a counter bumped on every save and
+        # reload, plus the value it had when each key or store last changed
+        self._version = 0
+        self._versions = {}
+        # Change events (student, course, field) for subscribers such as the
+        # GUI; everything one locked operation emits is delivered as one batch
+        self.events = EventBus()
+
+        # Files are replaced atomically (temp file + rename); fsyncs are grouped
+        # to one per `fsync_every` writes or per `fsync_interval_ms`.
+        self.batcher = FsyncBatcher(fsync_every, fsync_interval_ms)
+
+        # On-disk encoding for snapshot files: 'json' (indented), 'compact' or
+        # 'binary'. Loading detects the format, so switching needs no migration.
+        if file_format not in serializers.FORMATS:
+            raise ValueError(f"Unknown file format '{file_format}'.")
+        self.file_format = file_format
+
+        # Passwords are stored as salted PBKDF2 hashes; legacy plaintext entries
+        # are hashed when the credentials are loaded. Successful logins are
+        # remembered briefly so re-authentication doesn't pay the KDF again.
+        self.password_iterations = password_iterations
+        self.login_cache = VerifiedCache(ttl=login_cache_ttl)
+
+        # Optional write-ahead journal: mutations append one record each and
+        # the snapshot files are only rewritten every `compact_every` records.
+        self.journal = Journal(journal_file, self.batcher) if journal_file else None
+        self.compact_every = compact_every
+
+        # Optional SQLite engine: replaces both the JSON files and the journal,
+        # and loads each student's data only when it is first needed.
+        self.db = None
+        # Optional sharded student storage: one file per student in student_dir,
+        # loaded lazily with at most `max_loaded_students` kept in memory.
+        self.shards = None
+        self.student_dir = student_dir
+        self.max_loaded_students = max_loaded_students
+
+        # Reverse enrollment index: course_id -> {student_id: None}, used as an
+        # insertion-ordered set so rosters keep their enrollment order.
+        self.course_students = {}
+        # Faculty index: faculty_id -> {course_id: None}
+        self.faculty_courses = {}
+        # Timetable slot bitmasks per course, for rendering and clash checks
+        self.timetable = TimetableIndex(self.courses)
+
+        # Optional fast start: only credentials are read here, and courses and
+        # student data wait for load(), e.g. on a background thread after
+        # login. Shared and SQLite modes always load everything up front.
+        # load_times records seconds per loading phase for startup reports.
+        self.loaded = threading.Event()
+        self.load_times = {}
+        self._deferred = defer_loading and not shared and not db_file
+        with self.file_lock or contextlib.nullcontext():
+            if db_file:
+                with self._timed('database'):
+                    self._load_from_db(db_file)
+                self.journal = None
+                self._db_version = self.db.data_version()
+            else:
+                with self._timed('credentials'):
+                    self._load_credentials()
+                if self._deferred and self.journal:
+                    self._replay_journal(stores=('credentials',))
+                elif not self._deferred:
+                    self._load_data()
+            self._hash_plaintext_passwords()
+        if not self._deferred:
+            self._build_indexes()
+            self.loaded.set()
+
+    # ---------- Loading ----------
+
+    @contextlib.contextmanager
+    def _timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.load_times[phase] = self.load_times.get(phase, 0) + time.perf_counter() - start
+
+    def _load_data(self):
+        """Reads courses and student data (everything but credentials)."""
+        with self._timed('courses'):
+            self._load_courses()
+        with self._timed('student data'):
+            if self.student_dir:
+                self._load_student_shards(self.student_dir)
+            else:
+                self._load_student_data()
+        if self.journal:
+            with self._timed('journal'):
+                self._replay_journal()
+        self._record_stamps()
+
+    def _build_indexes(self):
+        with self._timed('indexes'):
+            self._build_enrollment_index()
+            self._build_faculty_index()
+            self.timetable = TimetableIndex(self.courses)
+
+    def load(self):
+        """Reads the data a defer_loading=True construction skipped.
+
+        Safe to call from a worker thread: other operations wait on the lock
+        until it is done, and `loaded` is set afterwards. Does nothing once
+        everything is loaded. If reading fails, the error propagates and the
+        load stays pending: mutators call load() again and raise the same
+        way, and close() leaves the snapshot files alone.
+        """
+        with self.events.batch(), self.lock:
+            if self._deferred:
+                # Cleared up front for the torn-journal compaction _load_data
+                # may run; other threads can't see it before we finish
+                self._deferred = False
+                try:
+                    self._load_data()
+                except BaseException:
+                    self._deferred = True
+                    raise
+                self._build_indexes()
+                self.events.emit()
+            self.loaded.set()
+
+    # ---------- Change stamps ----------
+
+    def _touch(self, store, keys=None):
+        """Records a change to some keys of a store, or to all of it when keys is None."""
+        self._version += 1
+        self._versions[(store,)] = self._version
+        if keys is None:
+            self._versions[(store, None)] = self._version
+        else:
+            for key in keys:
+                self._versions[(store,) + tuple(key)] = self._version
+
+    def subscribe(self, callback):
+        """Calls callback([ChangeEvent, ...]) after each operation that changed data.
+
+        The callback runs on the thread that made the change, after the lock
+        is released; GUI code should hand the events over to its own thread.
+
+        Returns a function that unsubscribes the callback.
+        """
+        return self.events.subscribe(callback)
+
+    def data_version(self, store=None, *key):
+        """Returns a stamp that changes whenever the given data changes.
+
+        data_version() covers everything, data_version('courses') one store and
+        data_version('student_data', 'students', 'S1') one key. 'roster' is
+        also accepted as a store, keyed by course ID, for enrollment changes.
+        Views remember the stamp they were drawn at and redraw when it moves.
+        """
+        if store is None:
+            return self._version
+        if not key:
+            return self._versions.get((store,), 0)
+        return max(self._versions.get((store, None), 0), self._versions.get((store,) + key, 0))
+
+    # ---------- Persistence ----------
+
+    def _store_root(self, store):
+        if store == 'credentials':
+            return self.credentials
+        if store == 'courses':
+            return self.courses
+        self.student_data['exam_schedule'] = self.exam_schedule
+        return self.student_data
+
+    def _save_store(self, store):
+        if store == 'credentials':
+            self._save_credentials()
+        elif store == 'courses':
+            self._save_courses()
+        else:
+            self._save_student_data()
+
+    def _persist(self, store, *keys):
+        """Persists changes to the given top-level keys of a store.
+
+        Keys are paths such as ('students', 'Harshit') or ('faculty', 'Prabhu').
+        Without a journal or database the whole store file is rewritten;
+        otherwise only the current value of each key is written, so the cost
+        is O(change).
+        """
+        if not keys:
+            return
+        self._touch(store, keys)
+
+        if store == 'student_data':
+            self.analytics.students_changed(key[1] for key in keys if key[0] == 'students')
+        elif store == 'credentials':
+            self._update_user_indexes(keys)
+
+        if self.db:
+            self.db.write(self._collect_records(store, keys))
+            if not self._depth:
+                self._trim_student_cache()
+            return
+
+        if self.shards and store == 'student_data':
+            self.shards.write(self._collect_records(store, keys))
+            self._stamps[self.shards.index_path] = self._stamp(self.shards.index_path)
+            if not self._depth:
+                self._trim_student_cache()
+            return
+
+        if self.journal is None:
+            self._submit(store, lambda: self._save_store(store))
+            return
+
+        records = self._collect_records(store, keys)
+        self._submit(None, lambda: self._append_journal(records))
+
+    def _submit(self, key, job):
+        """Runs a save job now, or queues it on the background writer."""
+        if self.writer:
+            self.writer.submit(key, job)
+        else:
+            job()
+
+    def _append_journal(self, records):
+        # Only the encoding needs the lock. Appends and compactions all run
+        # on the writer thread (or under the caller's lock without one), so
+        # they stay in order while the disk I/O happens outside the lock.
+        with self.lock:
+            lines = self.journal.encode(records)
+        self.journal.write(lines)
+        if self.journal.pending >= self.compact_every:
+            self._compact()
+
+    def _collect_records(self, store, keys):
+        """Returns (store, key, value, deleted) records for the given keys."""
+        root = self._store_root(store)
+        records = []
+        for key in keys:
+            node = root
+            try:
+                for part in key:
+                    node = node[part]
+                records.append((store, key, node, False))
+            except (KeyError, TypeError):
+                # The key no longer exists, so record a deletion
+                records.append((store, key, None, True))
+        return records
+
+    def _load_from_db(self, db_file):
+        if os.path.exists(db_file):
+            self.db = SQLiteStore(db_file)
+        else:
+            # First run against this database: migrate the JSON layout, then
+            # the journal records not yet compacted into it
+            self.db = migrate_json_to_sqlite(self.credentials_file, self.student_data_file, self.courses_file, db_file)
+            if self.journal:
+                records, _ = self.journal.replay()
+                self.db.write(records)
+                self.journal.truncate()  # The database holds every change from here on
+
+        if self.db.is_empty():
+            self.credentials = self._get_default_credentials()
+            self.courses = self._get_default_courses()
+            self.student_data = self._get_default_student_data()
+            self.exam_schedule = self.student_data['exam_schedule']
+            self._persist('credentials', *[(r, u) for r in self.credentials for u in self.credentials[r]])
+            self._persist('courses', *[(c,) for c in self.courses])
+            self._persist('student_data', *[('students', s) for s in self.student_data['students']])
+
+        self.credentials = self.db.load_credentials()
+        self.courses = self.db.load_courses()
+        self.exam_schedule = self.db.load_exam_schedule()
+        self.student_data = {"students": LazyStudentMap(self.db, self.max_loaded_students),
+                             "exam_schedule": self.exam_schedule}
+
+    def _load_student_shards(self, student_dir):
+        shard_format = 'compact' if self.file_format == 'json' else self.file_format
+        shards = ShardStore(student_dir, self.batcher, shard_format)
+        if shards.is_empty():
+            # First run with sharding: split the existing student file once,
+            # with the student changes the journal holds beyond it
+            if os.path.exists(self.student_data_file):
+                self._load_student_data()
+            else:
+                self.student_data = self._get_default_student_data()
+            if self.journal:
+                self._apply_records(self.journal.replay()[0], stores=('student_data',))
+            shards.migrate_from(self.student_data)
+        self.shards = shards
+
+        self.exam_schedule = self.shards.load_exam_schedule()
+        self.student_data = {"students": LazyStudentMap(self.shards, self.max_loaded_students),
+                             "exam_schedule": self.exam_schedule}
+
+    def _trim_student_cache(self):
+        # Every loaded student is saved by now, so all of them may be evicted
+        students = self.student_data.get('students')
+        if isinstance(students, LazyStudentMap):
+            students.flush()
+
+    def _build_enrollment_index(self):
+        self.course_students = {}
+        if self.db or self.shards:
+            # Read enrollments from the store instead of loading every student
+            enrollments = (self.db or self.shards).enrollments()
+        else:
+            enrollments = ((student_id, course_id)
+                           for student_id, data in self.student_data.get('students', {}).items()
+                           for course_id in data.get('enrolled_courses', []))
+        for student_id, course_id in enrollments:
+            self.course_students.setdefault(course_id, {})[student_id] = None
+        self._touch('roster')
+
+    def _index_enrollment(self, student_id, course_id):
+        self.course_students.setdefault(course_id, {})[student_id] = None
+        self._touch('roster', [(course_id,)])
+
+    def _unindex_student(self, student_id, course_ids):
+        for course_id in course_ids:
+            self.course_students.get(course_id, {}).pop(student_id, None)
+        self._touch('roster', [(course_id,) for course_id in course_ids])
+
+    def _replay_journal(self, from_offset=False, stores=None):
+        records, clean = self.journal.replay(from_offset)
+        self._apply_records(records, stores)
+
+        # A torn last record means we crashed mid-append; fold what we have
+        # into the snapshots so new records don't land after a broken line.
+        # A read-only view leaves that to the process that owns the journal.
+        if not clean and not self.read_only:
+            if stores is None:
+                self._submit(None, self._compact)  # In order with any queued appends
+            else:
+                self.load()  # Recover now, before anything is appended after the torn line
+        return bool(records)
+
+    def _apply_records(self, records, stores=None):
+        """Applies journal records to the in-memory stores (only to the given
+        stores, if any)."""
+        for store, key, value, deleted in records:
+            if stores is not None and store not in stores:
+                continue  # Applied again by the full replay once loaded
+            if store == 'student_data' and self.shards:
+                continue  # Folded into the shards when they were created
+            node = self._store_root(store)
+            for part in key[:-1]:
+                node = node.setdefault(part, {})
+            if deleted:
+                node.pop(key[-1], None)
+            else:
+                node[key[-1]] = value
+        self.exam_schedule = self.student_data.get('exam_schedule', [])
+
+    # ---------- Multi-process Access ----------
+
+    @contextlib.contextmanager
+    def _exclusive(self):
+        if self.read_only:
+            raise RuntimeError("This DataManager was opened read-only.")
+        # The batch wraps the lock, so subscribers run once it is released
+        # and can't stall (or deadlock with) other threads waiting on it
+        with self.events.batch(), self.lock:
+            if self._deferred:
+                # Mutators need the courses and student data too; don't run
+                # them against the empty stores of a deferred start
+                self.load()
+            self._depth += 1
+            try:
+                if self.file_lock is None:
+                    yield
+                else:
+                    with self.file_lock:
+                        self._refresh_if_changed()
+                        yield
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    # A nested save (e.g. adopting legacy projects) must not
+                    # evict students the outer operation has yet to save
+                    self._trim_student_cache()
+
+    def refresh(self):
+        """Picks up changes other processes made to the shared data directory."""
+        if self.file_lock is not None and not self.read_only:
+            with self._exclusive():
+                pass
+
+    def _stamp(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _record_stamps(self):
+        for path in (self.credentials_file, self.courses_file, self.student_data_file):
+            self._stamps[path] = self._stamp(path)
+        if self.shards:
+            self._stamps[self.shards.index_path] = self._stamp(self.shards.index_path)
+
+    def _changed(self, path):
+        return self._stamps.get(path) != self._stamp(path)
+
+    def _refresh_if_changed(self):
+        """Reloads only the sections another process has changed."""
+        if self.db:
+            if self.db.data_version() != self._db_version:
+                self._user_indexes = {}
+                self.credentials = self.db.load_credentials()
+                self.courses = self.db.load_courses()
+                self.exam_schedule = self.db.load_exam_schedule()
+                self.student_data = {"students": LazyStudentMap(self.db, self.max_loaded_students),
+                                     "exam_schedule": self.exam_schedule}
+                self._db_version = self.db.data_version()
+                self._build_enrollment_index()
+                self._build_faculty_index()
+                self.timetable = TimetableIndex(self.courses)
+                self.analytics.reset()
+                for store in ('credentials', 'courses', 'student_data'):
+                    self._touch(store)
+                self.events.emit()
+            return
+
+        reloaded = set()
+        if self._changed(self.credentials_file):
+            self._load_credentials()
+            reloaded.add('credentials')
+        if self._changed(self.courses_file):
+            self._load_courses()
+            reloaded.add('courses')
+        if self.shards:
+            if self._changed(self.shards.index_path):
+                self.shards.reload_index()
+                self.exam_schedule = self.shards.load_exam_schedule()
+                self.student_data['exam_schedule'] = self.exam_schedule
+                self.student_data['students'].reload_ids()
+                reloaded.add('student_data')
+            students = self.student_data['students']
+            changed = self.shards.changed_students(students.loaded_ids())
+            students.invalidate(changed)
+            self.analytics.students_changed(changed)
+            if changed:
+                self._touch('student_data', [('students', student_id) for student_id in changed])
+                for student_id in changed:
+                    self.events.emit(student_id)
+        elif self._changed(self.student_data_file):
+            self._load_student_data()
+            reloaded.add('student_data')
+
+        if self.journal:
+            # Snapshots reloaded (or the journal compacted elsewhere) means the
+            # whole journal applies again; otherwise only the new tail does.
+            if reloaded or self.journal.size() < self.journal.offset:
+                self._replay_journal()
+                reloaded.update(('credentials', 'courses', 'student_data'))
+            elif self._replay_journal(from_offset=True):
+                reloaded.update(('credentials', 'courses', 'student_data'))
+
+        self._record_stamps()
+        for store in reloaded:
+            self._touch(store)
+        if reloaded:
+            self.events.emit()
+        if 'credentials' in reloaded:
+            self._user_indexes = {}
+        if 'student_data' in reloaded:
+            self._build_enrollment_index()
+            self.analytics.reset()
+        if 'courses' in reloaded:
+            self._build_faculty_index()
+            self.timetable = TimetableIndex(self.courses)
+
+    def compact(self):
+        """Rewrites all snapshot files and empties the journal."""
+        if self._deferred:
+            # Only credentials are in memory; the journal keeps every change
+            raise RuntimeError("Cannot compact before the data is loaded.")
+        if self.writer:
+            # In order with the appends the writer still has queued
+            self.writer.submit(None, self._compact)
+            self.writer.wait()
+        else:
+            self._compact()
+
+    def _compact(self):
+        # Each snapshot is encoded under the lock and written and fsynced
+        # outside it, so other threads (e.g. Tk) don't wait on the disk.
+        # Records appended meanwhile stay in the journal. In shared mode
+        # the whole compaction holds the locks, like every save there.
+        with self._exclusive() if self.file_lock else contextlib.nullcontext():
+            with self._exclusive():
+                # Everything appended before this offset is in the snapshots
+                offset = self.journal.offset if self.journal else 0
+            self._save_credentials()
+            self._save_courses()
+            if not self.shards:
+                self._save_student_data()
+            if self.journal:
+                # The snapshots must be on disk before the journal is dropped
+                self.batcher.sync_pending()
+                with self.lock:
+                    self.journal.truncate(offset)
+
+    def flush(self):
+        """Durability barrier: returns once every queued save has been written."""
+        if self.writer:
+            self.writer.wait()
+        self.batcher.sync_pending()
+
+    def close(self):
+        """Drains pending saves and folds the journal into the snapshot files."""
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        if self.db:
+            self.db.close()
+        elif self.journal and self.journal.pending and not self.read_only and not self._deferred:
+            # Skipped while loading is pending or has failed: the snapshots
+            # would be rewritten from stores that were never (fully) read
+            self.compact()
+        self.batcher.close()
+
+    def _quarantine(self, path):
+        """Moves an unreadable data file aside instead of overwriting it with defaults.
+
+        Only for CorruptDataError: an UnsupportedFormatError (e.g. msgpack
+        not installed) is left to propagate, so the portal refuses to start
+        rather than setting a good file aside.
+        """
+        if not self.read_only:
+            os.replace(path, f"{path}.corrupt")
 
     # ---------- Credential Management ----------
     
     def _load_credentials(self):
         if os.path.exists(self.credentials_file):
-            with open(self.credentials_file, 'r') as c:
-                try:
-                    self.credentials = json.load(c)
-                except json.JSONDecodeError:
-                    self.credentials = self._get_default_credentials()
-                    self._save_credentials()
+            try:
+                self.credentials = serializers.load(self.credentials_file)
+            except serializers.CorruptDataError:
+                self.credentials = None
+            if self.credentials is None:
+                self._quarantine(self.credentials_file)
+                self.credentials = self._get_default_credentials()
+                self._save_credentials()
         else:
             self.credentials = self._get_default_credentials()
             self._save_credentials()
 
     def _get_default_credentials(self):
-        return {
+        credentials = {
             'admin': {'admin': 'admin12'},
             'student': {'Harshit': 'harshit12', 'SHILAJIT': 'SHILAJIT12', 'Shourya': 'shourya12'},
             'faculty': {'Prabhu': 'prabhu12', 'Sukanta': 'sukanta12', 'Diddy': 'oiloiloil'}
         }
+        # Never written to disk in plaintext
+        users = [(role, user_id) for role in credentials for user_id in credentials[role]]
+        hashes = hash_passwords([credentials[r][u] for r, u in users], self.password_iterations)
+        for (role, user_id), stored in zip(users, hashes):
+            credentials[role][user_id] = stored
+        return credentials
+
+    def _hash_plaintext_passwords(self):
+        """Hashes legacy plaintext passwords, so users who never log in
+        don't stay in plaintext on disk."""
+        users = [(role, user_id) for role, users in self.credentials.items()
+                 for user_id, stored in users.items() if not is_hashed(stored)]
+        if not users or self.read_only:
+            return
+        hashes = hash_passwords([str(self.credentials[r][u]) for r, u in users], self.password_iterations)
+        for (role, user_id), stored in zip(users, hashes):
+            self.credentials[role][user_id] = stored
+        self._persist('credentials', *users)
 
     def _save_credentials(self):
-        with open(self.credentials_file, 'w') as c:
-            json.dump(self.credentials, c, indent=4)
+        if self.read_only:
+            return
+        with self.lock:
+            data = serializers.dumps(self.credentials, self.file_format)
+        atomic_write(self.credentials_file, data, self.batcher)
+        self._stamps[self.credentials_file] = self._stamp(self.credentials_file)
             
     def validate_login(self, role, user_id, password):
-        return self.credentials.get(role, {}).get(user_id) == password
+        verified = self.check_password(role, user_id, password)
+        return verified is not None and self.complete_login(role, user_id, password, *verified)
+
+    def check_password(self, role, user_id, password):
+        """The slow half of validate_login: runs the KDF but never writes, so
+        it is safe on a worker thread. Returns None for a failed login, else
+        (stored, upgraded) for complete_login(), upgraded being a new hash
+        to save or None.
+        """
+        stored = self.credentials.get(role, {}).get(user_id)
+        if stored is None:
+            return None
+        if self.login_cache.check(role, user_id, password, stored):
+            return stored, None
 
+        ok, needs_upgrade = verify_password(password, stored, self.password_iterations)
+        if not ok:
+            return None
+        return stored, (hash_password(password, self.password_iterations) if needs_upgrade else None)
+
+    def complete_login(self, role, user_id, password, stored, upgraded):
+        """Saves the upgraded hash from check_password(), if any, on the
+        calling thread, and remembers the login. Returns True."""
+        if upgraded is not None:
+            with self._exclusive():
+                # Skip the upgrade if the password changed while we were hashing
+                if self.credentials.get(role, {}).get(user_id) != stored:
+                    return True
+                self.credentials[role][user_id] = stored = upgraded
+                self._persist('credentials', (role, user_id))
+        self.login_cache.add(role, user_id, password, stored)
+        return True
+
+    @_synchronized
     def delete_user(self, role, user_id):
         if user_id in self.credentials.get(role, {}):
             del self.credentials[role][user_id]
-            self._save_credentials()
+            self.login_cache.discard(role, user_id)
+            self._persist('credentials', (role, user_id))
+            self.events.emit(user_id if role == 'student' else None, None, 'users')
             
             # Clean up student data if they were a student
             if role == 'student' and user_id in self.student_data['students']:
+                for course_id in self.get_courses_for_student(user_id):
+                    self.events.emit(user_id, course_id, 'enrollment')
+                self._unindex_student(user_id, self.get_courses_for_student(user_id))
                 del self.student_data['students'][user_id]
-                self._save_student_data()
+                self._persist('student_data', ('students', user_id))
             
             # Clean up course data if they were a faculty member
             if role == 'faculty':
-                for course_id, data in self.courses.items():
-                    if data.get('faculty') == user_id:
-                        data['faculty'] = None
-                self._save_courses()
+                changed = []
+                for course_id in self.faculty_courses.pop(user_id, {}):
+                    self.courses[course_id]['faculty'] = None
+                    changed.append((course_id,))
+                    self.events.emit(None, course_id, 'faculty')
+                self._persist('courses', *changed)
                 
             return True, f"{role.capitalize()} '{user_id}' deleted successfully."
         return False, f"{role.capitalize()} ID not found."
 
+    @_synchronized
     def reset_password(self, role, user_id, new_password):
         if user_id in self.credentials.get(role, {}):
-            self.credentials[role][user_id] = new_password
-            self._save_credentials()
+            self.credentials[role][user_id] = hash_password(new_password, self.password_iterations)
+            self.login_cache.discard(role, user_id)
+            self._persist('credentials', (role, user_id))
             return True, f"Password for {role.capitalize()} '{user_id}' reset successfully."
         return False, f"{role.capitalize()} ID not found."
     
@@ -80,8 +739,26 @@ class DataManager:
     def get_all_faculty(self):
         """Returns a list of all faculty IDs."""
         return list(self.credentials.get('faculty', {}).keys())
+
+    def search_users(self, role, query='', limit=None):
+        """Returns user IDs of a role matching query: prefix matches first,
+        then substring matches (all IDs, sorted, for an empty query)."""
+        index = self._user_indexes.get(role)
+        if index is None:
+            index = self._user_indexes[role] = SearchIndex(self.credentials.get(role, {}))
+        return index.search(query, limit)
+
+    def _update_user_indexes(self, keys):
+        for role, user_id in keys:
+            index = self._user_indexes.get(role)
+            if index is not None:
+                if user_id in self.credentials.get(role, {}):
+                    index.add(user_id)
+                else:
+                    index.remove(user_id)
     
     # *** MODIFIED METHOD ***
+    @_synchronized
     def add_user(self, role, user_id, password, courses=None): # Added courses=None
         if not user_id or not password:
             return False, "User ID and password cannot be empty."
@@ -94,27 +771,18 @@ class DataManager:
                  return False, f"User ID '{user_id}' already exists in the {r} role."
 
         if role == 'student':
-            # 1. Assign ALL courses to the new student
-            all_course_ids = self.get_all_course_ids()
+            # 1. Enroll the new student in the selected courses only
+            course_ids = [c for c in courses or [] if c in self.courses]
             
-            self.credentials['student'][user_id] = password
-            self.student_data['students'][user_id] = {
-                "enrolled_courses": all_course_ids, # Enroll in all courses
-                "course_data": {}
-            }
-            # Initialize course_data for all enrolled courses
-            for course_id in all_course_ids:
-                self.student_data['students'][user_id]['course_data'][course_id] = {
-                    "attendance": None,
-                    "marks": {},
-                    "projects": []
-                }
-            self._save_credentials()
-            self._save_student_data()
-            return True, f"Student '{user_id}' added successfully and enrolled in all courses ({len(all_course_ids)} total)."
+            self.credentials['student'][user_id] = hash_password(password, self.password_iterations)
+            self._new_student_entry(user_id, course_ids)
+            self._persist('credentials', ('student', user_id))
+            self._persist('student_data', ('students', user_id))
+            self.events.emit(user_id, None, 'users')
+            return True, f"Student '{user_id}' added successfully and enrolled in {len(course_ids)} courses."
 
         elif role == 'faculty':
-            self.credentials['faculty'][user_id] = password
+            self.credentials['faculty'][user_id] = hash_password(password, self.password_iterations)
             
             # 2. Assign selected courses to the faculty member
             assigned_courses = []
@@ -122,35 +790,54 @@ class DataManager:
                 for course_id in courses:
                     if course_id in self.courses:
                         # Update the course data to assign the faculty member
-                        self.courses[course_id]['faculty'] = user_id
+                        self._assign_faculty(course_id, user_id)
                         assigned_courses.append(course_id)
-                self._save_courses()
+                        self.events.emit(None, course_id, 'faculty')
+                self._persist('courses', *[(c,) for c in assigned_courses])
                 
-            self._save_credentials()
+            self._persist('credentials', ('faculty', user_id))
+            self.events.emit(None, None, 'users')
             course_list = ", ".join(assigned_courses) if assigned_courses else "No courses assigned."
             return True, f"Faculty '{user_id}' added successfully. Courses assigned: {course_list}"
         
         elif role == 'admin':
-             self.credentials['admin'][user_id] = password
-             self._save_credentials()
+             self.credentials['admin'][user_id] = hash_password(password, self.password_iterations)
+             self._persist('credentials', ('admin', user_id))
+             self.events.emit(None, None, 'users')
              return True, f"Admin '{user_id}' added successfully."
 
         else:
             return False, "Invalid role specified."
 
+    def _new_student_entry(self, student_id, course_ids):
+        """Creates a student's entry enrolled in the given courses.
+
+        course_data for a course is only created on the first write to it
+        (see _get_student_course_data).
+        """
+        self.student_data['students'][student_id] = {
+            "enrolled_courses": list(course_ids),
+            "course_data": {}
+        }
+        for course_id in course_ids:
+            self._index_enrollment(student_id, course_id)
+            self.events.emit(student_id, course_id, 'enrollment')
+
     # ---------- Student Data Management ----------
     
     def _load_student_data(self):
         if os.path.exists(self.student_data_file):
-            with open(self.student_data_file, 'r') as s:
-                try:
-                    data = json.load(s)
-                    self.student_data = data
-                    # Load exam schedule separately
-                    self.exam_schedule = data.get('exam_schedule', [])
-                except json.JSONDecodeError:
-                    self.student_data = self._get_default_student_data()
-                    self._save_student_data()
+            try:
+                data = serializers.load(self.student_data_file)
+                self.student_data = data
+                # Load exam schedule separately
+                self.exam_schedule = data.get('exam_schedule', [])
+            except serializers.CorruptDataError:
+                self.student_data = None
+            if self.student_data is None:
+                self._quarantine(self.student_data_file)
+                self.student_data = self._get_default_student_data()
+                self._save_student_data()
         else:
             self.student_data = self._get_default_student_data()
             self._save_student_data()
@@ -166,25 +853,36 @@ class DataManager:
         return default_data
 
     def _save_student_data(self):
+        if self.read_only:
+            return
         # Ensure exam_schedule is saved back into student_data structure
-        self.student_data['exam_schedule'] = self.exam_schedule
-        with open(self.student_data_file, 'w') as s:
-            json.dump(self.student_data, s, indent=4)
+        with self.lock:
+            self.student_data['exam_schedule'] = self.exam_schedule
+            data = serializers.dumps(self.student_data, self.file_format)
+        atomic_write(self.student_data_file, data, self.batcher)
+        self._stamps[self.student_data_file] = self._stamp(self.student_data_file)
 
-    def _get_student_course_data(self, student_id, course_id, save_after=True):
-        # Helper function to ensure student/course structure exists
+    def _get_student_course_data(self, student_id, course_id):
+        # Helper function to ensure the course record of an enrolled student
+        # exists. Callers check enrollment first: only enroll_* may enroll.
         student_entry = self.student_data['students'].setdefault(student_id, {"enrolled_courses": [], "course_data": {}})
+        if isinstance(self.student_data['students'], LazyStudentMap):
+            # Keep the entry in memory until the caller persists it
+            self.student_data['students'].mark_dirty(student_id)
         course_data = student_entry['course_data'].setdefault(course_id, {
             "attendance": None,
             "marks": {},
             "projects": []
         })
-        # Ensure enrollment list is updated
-        if course_id not in student_entry['enrolled_courses']:
-            student_entry['enrolled_courses'].append(course_id)
-            if save_after:
-                 self._save_student_data()
-
+        # Marks saved before typed assessments are strings; convert them as the record is rewritten
+        marks = course_data["marks"]
+        for subject, mark in marks.items():
+            if isinstance(mark, str):
+                score, error = self.parse_mark(mark, float('inf'))
+                if not error:
+                    marks[subject] = score
+        if course_data.get("projects"):
+            self._adopt_legacy_projects(course_id, course_data)
         return course_data
 
     def get_courses_for_student(self, student_id):
@@ -193,23 +891,39 @@ class DataManager:
 
     def get_students_in_course(self, course_id):
         """Returns a list of student IDs enrolled in a course."""
-        enrolled = []
-        for student_id, data in self.student_data.get('students', {}).items():
-            if course_id in data.get('enrolled_courses', []):
-                enrolled.append(student_id)
-        return enrolled
+        return list(self.course_students.get(course_id, ()))
 
-    def set_attendance(self, student_id, course_id, percentage):
+    def is_enrolled(self, student_id, course_id):
+        """Returns True if the student is enrolled in the course."""
+        return student_id in self.course_students.get(course_id, ())
+
+    def parse_attendance(self, percentage):
+        """Returns (percent, error) for a raw attendance value, which must be a
+        whole number (90 or 90.0, but not 89.5)."""
         try:
-            percent = int(percentage)
-            if not (0 <= percent <= 100):
-                 return False, "Attendance must be between 0 and 100."
-        except ValueError:
-            return False, "Attendance must be a valid number."
+            value = float(percentage)
+        except (TypeError, ValueError, OverflowError):
+            return None, "Attendance must be a valid number."
+        if not math.isfinite(value) or not (0 <= value <= 100):
+            return None, "Attendance must be between 0 and 100."
+        if not value.is_integer():
+            return None, "Attendance must be a whole number."
+        return int(value), None
+
+    @_synchronized
+    def set_attendance(self, student_id, course_id, percentage):
+        percent, error = self.parse_attendance(percentage)
+        if error:
+            return False, error
+        if course_id not in self.courses:
+            return False, "Course not found."
+        if not self.is_enrolled(student_id, course_id):
+            return False, f"{student_id} is not enrolled in {course_id}."
             
         course_data = self._get_student_course_data(student_id, course_id)
         course_data["attendance"] = percent
-        self._save_student_data()
+        self._persist('student_data', ('students', student_id))
+        self.events.emit(student_id, course_id, 'attendance')
         return True, f"Attendance for {student_id} in {course_id} set to {percent}%."
 
     def get_attendance(self, student_id, course_id):
@@ -220,78 +934,546 @@ class DataManager:
         course_data = self.student_data.get('students', {}).get(student_id, {}).get('course_data', {}).get(course_id, {})
         return course_data.get('marks', {})
 
-    def get_projects(self, student_id, course_id):
-        course_data = self.student_data.get('students', {}).get(student_id, {}).get('course_data', {}).get(course_id, {})
-        return course_data.get('projects', [])
-
+    @_synchronized
     def add_student_mark(self, student_id, course_id, subject, mark):
         if not student_id:
             return False, "Student ID cannot be empty."
         if student_id not in self.credentials.get('student', {}):
             return False, "Student not found."
-        if not subject or not mark:
+        if course_id not in self.courses:
+            return False, "Course not found."
+        if not self.is_enrolled(student_id, course_id):
+            return False, f"{student_id} is not enrolled in {course_id}."
+        if not subject or mark in (None, ''):
             return False, "Subject and Mark fields are required."
-        
+        score, error = self.parse_mark(mark, self.max_score(course_id, subject))
+        if error:
+            return False, error
+
+        self._register_assessments(course_id, [subject])
         course_data = self._get_student_course_data(student_id, course_id)
-        course_data["marks"][subject] = mark
-        self._save_student_data()
+        course_data["marks"][subject] = score
+        self._persist('student_data', ('students', student_id))
+        self.events.emit(student_id, course_id, 'marks')
         return True, f"Mark recorded for {student_id} in {course_id}."
 
+    # ---------- Assessments ----------
+    # Each course keeps typed definitions, courses[cid]['assessments'] =
+    # {name: {"max": 100, "weight": 1}}, and marks are stored as numbers.
+    # Marks for an undefined assessment register it with the defaults.
+
+    def get_assessments(self, course_id):
+        """Returns {name: {"max": ..., "weight": ...}} for a course."""
+        return self.courses.get(course_id, {}).get('assessments', {})
+
+    def max_score(self, course_id, subject):
+        return self.get_assessments(course_id).get(subject, {}).get('max', DEFAULT_MAX_SCORE)
+
+    def parse_mark(self, mark, max_score=DEFAULT_MAX_SCORE):
+        """Returns (score, error) for a raw mark; whole numbers come back as ints."""
+        try:
+            score = float(mark)
+        except (TypeError, ValueError, OverflowError):
+            return None, "Mark must be a valid number."
+        if not math.isfinite(score) or not (0 <= score <= max_score):
+            return None, f"Mark must be between 0 and {max_score:g}."
+        return (int(score) if score.is_integer() else score), None
+
+    def _register_assessments(self, course_id, subjects):
+        if course_id not in self.courses:
+            return
+        assessments = self.courses[course_id].setdefault('assessments', {})
+        new = [s for s in subjects if s and s not in assessments]
+        for subject in new:
+            assessments[subject] = {"max": DEFAULT_MAX_SCORE, "weight": 1}
+        if new:
+            self._persist('courses', (course_id,))
+            self.events.emit(None, course_id, 'assessments')
+
+    @_synchronized
+    def define_assessment(self, course_id, name, max_score=DEFAULT_MAX_SCORE, weight=1):
+        """Adds or updates an assessment's maximum score and weight."""
+        if course_id not in self.courses:
+            return False, "Course not found."
+        if not name:
+            return False, "Assessment name is required."
+        try:
+            max_score, weight = float(max_score), float(weight)
+        except (TypeError, ValueError, OverflowError):
+            return False, "Max score and weight must be numbers."
+        if not math.isfinite(max_score) or max_score <= 0:
+            return False, "Max score must be greater than 0."
+        if not math.isfinite(weight) or weight < 0:
+            return False, "Weight cannot be negative."
+        stats = self.analytics.course_summary(course_id)["marks"].get(name)
+        if stats and stats["max"] > max_score:
+            return False, f"Existing marks for '{name}' go up to {stats['max']:g}."
+
+        self.courses[course_id].setdefault('assessments', {})[name] = {
+            "max": int(max_score) if max_score.is_integer() else max_score,
+            "weight": int(weight) if weight.is_integer() else weight}
+        self._persist('courses', (course_id,))
+        self.events.emit(None, course_id, 'assessments')
+        return True, f"Assessment '{name}' saved for {course_id}."
+
+    def weighted_total(self, student_id, course_id):
+        """Returns the weighted percentage over the assessments the student has
+        marks for, or None if there are none."""
+        assessments = self.get_assessments(course_id)
+        earned = total_weight = 0.0
+        for subject, mark in self.get_marks(student_id, course_id).items():
+            score, error = self.parse_mark(mark, float('inf'))
+            if error:
+                continue
+            definition = assessments.get(subject, {})
+            weight = definition.get('weight', 1)
+            earned += weight * score / definition.get('max', DEFAULT_MAX_SCORE)
+            total_weight += weight
+        if not total_weight:
+            return None
+        return round(100 * earned / total_weight, 2)
+
+    # ---------- Bulk Operations ----------
+    # Each bulk call validates every row first and then persists all touched
+    # students with a single flush, instead of one save per student.
+
+    @_synchronized
+    def set_attendance_bulk(self, course_id, attendance):
+        """Sets attendance for many students at once from {student_id: percentage}."""
+        if course_id not in self.courses:
+            return False, "Course not found."
+        parsed = {}
+        for student_id, percentage in attendance.items():
+            if student_id not in self.credentials.get('student', {}):
+                return False, f"Student '{student_id}' not found."
+            if not self.is_enrolled(student_id, course_id):
+                return False, f"{student_id} is not enrolled in {course_id}."
+            percent, error = self.parse_attendance(percentage)
+            if error:
+                return False, f"{student_id}: {error}"
+            parsed[student_id] = percent
+        if not parsed:
+            return False, "No attendance values to save."
+
+        for student_id, percent in parsed.items():
+            self._get_student_course_data(student_id, course_id)["attendance"] = percent
+            self.events.emit(student_id, course_id, 'attendance')
+        self._persist('student_data', *[('students', s) for s in parsed])
+        return True, f"Attendance saved for {len(parsed)} students in {course_id}."
+
+    @_synchronized
+    def add_marks_bulk(self, course_id, subject, marks):
+        """Records one assessment for many students at once from {student_id: mark}."""
+        if course_id not in self.courses:
+            return False, "Course not found."
+        if not subject:
+            return False, "Assessment name is required."
+        max_score = self.max_score(course_id, subject)
+        scores = {}
+        for student_id, mark in marks.items():
+            if student_id not in self.credentials.get('student', {}):
+                return False, f"Student '{student_id}' not found."
+            if not self.is_enrolled(student_id, course_id):
+                return False, f"{student_id} is not enrolled in {course_id}."
+            if mark in (None, ''):
+                return False, f"{student_id}: Mark is required."
+            score, error = self.parse_mark(mark, max_score)
+            if error:
+                return False, f"{student_id}: {error}"
+            scores[student_id] = score
+        if not scores:
+            return False, "No marks to save."
+
+        self._register_assessments(course_id, [subject])
+        for student_id, score in scores.items():
+            self._get_student_course_data(student_id, course_id)["marks"][subject] = score
+            self.events.emit(student_id, course_id, 'marks')
+        self._persist('student_data', *[('students', s) for s in scores])
+        return True, f"'{subject}' marks saved for {len(marks)} students in {course_id}."
+
+    def add_users_bulk(self, users, hashes=None):
+        """Adds many users from (role, user_id, password, courses) tuples with one flush.
+
+        courses are the ones a student is enrolled in or a faculty member
+        teaches, and passwords are hashed, as with add_user. hashes, if
+        given, are the passwords already hashed with hash_passwords(), e.g.
+        on a worker thread. Returns (success, message); nothing is added
+        unless every row is valid.
+        """
+        users = list(users)
+        for role, user_id, password, courses in users:
+            if role not in ('student', 'faculty', 'admin'):
+                return False, f"Invalid role '{role}' for '{user_id}'."
+            if not user_id or not password:
+                return False, "User ID and password cannot be empty."
+        if hashes is None:
+            # The KDF dominates; hash the whole batch in parallel, outside the lock
+            hashes = hash_passwords([password for _, _, password, _ in users], self.password_iterations)
+        return self._add_hashed_users(users, hashes)
+
+    @_synchronized
+    def _add_hashed_users(self, users, hashes):
+        seen = set()
+        for role, user_id, password, courses in users:
+            if user_id in seen or any(user_id in self.credentials.get(r, {}) for r in self.credentials):
+                return False, f"User ID '{user_id}' already exists."
+            seen.add(user_id)
+
+        cred_keys, student_keys, course_keys = [], [], []
+        for (role, user_id, password, courses), stored in zip(users, hashes):
+            self.credentials.setdefault(role, {})[user_id] = stored
+            cred_keys.append((role, user_id))
+            self.events.emit(user_id if role == 'student' else None, None, 'users')
+            if role == 'student':
+                self._new_student_entry(user_id, [c for c in courses or [] if c in self.courses])
+                student_keys.append(('students', user_id))
+            elif role == 'faculty':
+                for course_id in courses or []:
+                    if course_id in self.courses:
+                        self._assign_faculty(course_id, user_id)
+                        course_keys.append((course_id,))
+                        self.events.emit(None, course_id, 'faculty')
+
+        self._persist('credentials', *cred_keys)
+        self._persist('student_data', *student_keys)
+        self._persist('courses', *course_keys)
+        return True, f"{len(users)} users added."
+
+    @_synchronized
+    def record_grades_bulk(self, rows):
+        """Records (student_id, course_id, subject, mark, attendance) rows with one flush.
+
+        subject/mark and attendance are each optional (None to skip). Rows
+        are assumed to be validated by the caller, e.g. the CSV importer, with
+        marks already parsed by parse_mark(); nothing is recorded unless every
+        student is enrolled in the row's course.
+        """
+        for student_id, course_id, subject, mark, attendance in rows:
+            if not self.is_enrolled(student_id, course_id):
+                return False, f"{student_id} is not enrolled in {course_id}."
+
+        subjects = {}
+        for student_id, course_id, subject, mark, attendance in rows:
+            if subject:
+                subjects.setdefault(course_id, {})[subject] = None
+        for course_id, names in subjects.items():
+            self._register_assessments(course_id, names)
+
+        touched = {}
+        for student_id, course_id, subject, mark, attendance in rows:
+            course_data = self._get_student_course_data(student_id, course_id)
+            if subject:
+                course_data["marks"][subject] = mark
+                self.events.emit(student_id, course_id, 'marks')
+            if attendance is not None:
+                course_data["attendance"] = attendance
+                self.events.emit(student_id, course_id, 'attendance')
+            touched[student_id] = None
+        self._persist('student_data', *[('students', s) for s in touched])
+        return True, f"{len(rows)} grade rows recorded."
+
+    @_synchronized
+    def enroll_students(self, course_id, student_ids):
+        """Enrolls many students in a course with a single flush."""
+        return self.enroll_cohort(student_ids, [course_id])
+
+    # ---------- Enrollment ----------
+    # Enrolling only records the course in the student's enrolled_courses;
+    # course_data for it is created on the first write. Dropping keeps any
+    # recorded attendance/marks so they reappear on re-enrollment.
+
+    def _enroll(self, student_id, course_id):
+        """Adds one enrollment; returns False if it already existed."""
+        if self.is_enrolled(student_id, course_id):
+            return False
+        students = self.student_data['students']
+        entry = students.setdefault(student_id, {"enrolled_courses": [], "course_data": {}})
+        if isinstance(students, LazyStudentMap):
+            students.mark_dirty(student_id)
+        entry['enrolled_courses'].append(course_id)
+        self._index_enrollment(student_id, course_id)
+        self.events.emit(student_id, course_id, 'enrollment')
+        return True
+
+    def _drop(self, student_id, course_id):
+        """Removes one enrollment; returns False if there was none."""
+        if not self.is_enrolled(student_id, course_id):
+            return False
+        students = self.student_data['students']
+        entry = students[student_id]
+        if isinstance(students, LazyStudentMap):
+            students.mark_dirty(student_id)
+        if course_id in entry['enrolled_courses']:
+            entry['enrolled_courses'].remove(course_id)
+        course_data = entry.get('course_data', {})
+        data = course_data.get(course_id)
+        if data is not None and data.get('attendance') is None and not data.get('marks') \
+                and not data.get('projects') and not data.get('submissions'):
+            del course_data[course_id]  # Nothing recorded, so nothing worth keeping
+        self._unindex_student(student_id, [course_id])
+        self.events.emit(student_id, course_id, 'enrollment')
+        return True
+
+    def _check_enrollment_args(self, student_ids, course_ids):
+        unknown = [c for c in course_ids if c not in self.courses]
+        if unknown:
+            return f"Course '{unknown[0]}' not found."
+        missing = [s for s in student_ids if s not in self.credentials.get('student', {})]
+        if missing:
+            return f"Student '{missing[0]}' not found."
+        return None
+
+    @_synchronized
+    def enroll_student(self, student_id, course_id):
+        return self.enroll_cohort([student_id], [course_id])
+
+    @_synchronized
+    def drop_student(self, student_id, course_id):
+        return self.drop_cohort([student_id], [course_id])
+
+    @_synchronized
+    def enroll_cohort(self, student_ids, course_ids):
+        """Enrolls every given student in every given course with one flush."""
+        error = self._check_enrollment_args(student_ids, course_ids)
+        if error:
+            return False, error
+        touched = {}
+        added = 0
+        for student_id in student_ids:
+            for course_id in course_ids:
+                if self._enroll(student_id, course_id):
+                    touched[student_id] = None
+                    added += 1
+        self._persist('student_data', *[('students', s) for s in touched])
+        return True, f"{added} enrollments added for {len(touched)} students."
+
+    @_synchronized
+    def drop_cohort(self, student_ids, course_ids):
+        """Drops every given student from every given course with one flush."""
+        error = self._check_enrollment_args(student_ids, course_ids)
+        if error:
+            return False, error
+        touched = {}
+        dropped = 0
+        for student_id in student_ids:
+            for course_id in course_ids:
+                if self._drop(student_id, course_id):
+                    touched[student_id] = None
+                    dropped += 1
+        self._persist('student_data', *[('students', s) for s in touched])
+        return True, f"{dropped} enrollments dropped for {len(touched)} students."
+
+    # ---------- Projects ----------
+    # Projects are defined once per course in courses[cid]['projects'] as
+    # {"id", "title", "due"}, with courses[cid]['next_project_id'] the next
+    # unused ID; a student's record only holds their own status,
+    # course_data['submissions'] = {project_id: status}. Per-student
+    # 'projects' lists from older files are still shown, and move into the
+    # course definitions when the student's record is next written.
+
+    def get_course_projects(self, course_id):
+        return self.courses.get(course_id, {}).get('projects', [])
+
+    def _find_project(self, course_id, project_id):
+        for project in self.get_course_projects(course_id):
+            if project['id'] == project_id:
+                return project
+        return None
+
+    def get_projects(self, student_id, course_id):
+        """Returns the course's projects with this student's status, plus any
+        per-student projects not yet moved to the course."""
+        course_data = self.student_data.get('students', {}).get(student_id, {}).get('course_data', {}).get(course_id, {})
+        submissions = course_data.get('submissions', {})
+        projects = [dict(p, status=submissions.get(str(p['id']), 'assigned'))
+                    for p in self.get_course_projects(course_id)]
+        shared = {(p['title'], p['due']) for p in projects}
+        projects += [p for p in course_data.get('projects', []) if (p.get('title'), p.get('due')) not in shared]
+        return projects
+
+    def _adopt_legacy_projects(self, course_id, course_data):
+        """Moves a student's copied project dicts into the course definitions."""
+        if course_id not in self.courses:
+            return
+        shared = {(p['title'], p['due']) for p in self.get_course_projects(course_id)}
+        new = [p for p in course_data['projects'] if (p.get('title'), p.get('due')) not in shared]
+        for project in new:
+            self._new_project(course_id, project.get('title'), project.get('due'))
+        course_data['projects'] = []
+        if new:
+            self._persist('courses', (course_id,))
+            self.events.emit(None, course_id, 'projects')
+
+    def _new_project(self, course_id, title, due_date):
+        course = self.courses[course_id]
+        projects = course.setdefault('projects', [])
+        # IDs come from a per-course counter and are never reused, so a new
+        # project can't pick up a deleted one's submission statuses
+        project_id = max(course.get('next_project_id', 1), max((p['id'] for p in projects), default=0) + 1)
+        course['next_project_id'] = project_id + 1
+        project = {"id": project_id, "title": title, "due": due_date}
+        projects.append(project)
+        return project
+
+    @_synchronized
     def add_project(self, course_id, title, due_date):
         if not title or not due_date:
             return False, "Project Title and Due Date are required."
-            
-        project_entry = {"title": title, "due": due_date}
-        
-        # Get all students in that course
-        enrolled_students = self.get_students_in_course(course_id)
-        if not enrolled_students:
-            return False, "No students are enrolled in this course."
-            
-        for s in enrolled_students:
-            course_data = self._get_student_course_data(s, course_id, save_after=False)
-            course_data["projects"].append(project_entry)
-        
-        self._save_student_data()
-        return True, f"Project '{title}' added for all {len(enrolled_students)} enrolled students in {course_id}."
+        if course_id not in self.courses:
+            return False, "Course not found."
+
+        self._new_project(course_id, title, due_date)
+        self._persist('courses', (course_id,))
+        self.events.emit(None, course_id, 'projects')
+        enrolled = len(self.course_students.get(course_id, ()))
+        return True, f"Project '{title}' added for all {enrolled} enrolled students in {course_id}."
+
+    @_synchronized
+    def edit_project(self, course_id, project_id, title=None, due_date=None):
+        project = self._find_project(course_id, project_id)
+        if project is None:
+            return False, "Project not found."
+        if title is not None:
+            if not title:
+                return False, "Project Title cannot be empty."
+            project['title'] = title
+        if due_date is not None:
+            if not due_date:
+                return False, "Due Date cannot be empty."
+            project['due'] = due_date
+        self._persist('courses', (course_id,))
+        self.events.emit(None, course_id, 'projects')
+        return True, f"Project '{project['title']}' updated."
+
+    @_synchronized
+    def delete_project(self, course_id, project_id):
+        # Students' submission entries for it are simply no longer shown
+        project = self._find_project(course_id, project_id)
+        if project is None:
+            return False, "Project not found."
+        course = self.courses[course_id]
+        course['projects'].remove(project)
+        # Files written before the counter existed may lack it; keep this ID used
+        course['next_project_id'] = max(course.get('next_project_id', 1), project['id'] + 1)
+        self._persist('courses', (course_id,))
+        self.events.emit(None, course_id, 'projects')
+        return True, f"Project '{project['title']}' deleted."
+
+    @_synchronized
+    def set_project_status(self, student_id, course_id, project_id, status):
+        if status not in PROJECT_STATUSES:
+            return False, f"Status must be one of: {', '.join(PROJECT_STATUSES)}."
+        if self._find_project(course_id, project_id) is None:
+            return False, "Project not found."
+        if not self.is_enrolled(student_id, course_id):
+            return False, f"{student_id} is not enrolled in {course_id}."
+
+        course_data = self._get_student_course_data(student_id, course_id)
+        # JSON object keys are strings, so the ID is stored as one
+        course_data.setdefault('submissions', {})[str(project_id)] = status
+        self._persist('student_data', ('students', student_id))
+        self.events.emit(student_id, course_id, 'projects')
+        return True, f"Project marked as {status} for {student_id}."
 
     def get_exam_schedule(self):
         return self.exam_schedule
 
-    def add_exam(self, subject, date, time):
+    @_synchronized
+    def add_exam(self, subject, date, time, course_id=None):
         if not subject or not date or not time:
             return False, "All fields (Subject, Date, Time) are required."
+        if course_id and course_id not in self.courses:
+            return False, "Course not found."
         
         exam = {"subject": subject, "date": date, "time": time}
+        if course_id:
+            exam["course_id"] = course_id
         self.exam_schedule.append(exam)
-        self._save_student_data()
+        self._persist('student_data', ('exam_schedule',))
+        self.events.emit(None, course_id, 'exams')
         return True, f"Exam '{subject}' scheduled successfully."
 
+    # ---------- Exam Scheduling ----------
+    # Exams with a "course_id" belong to that course's students; exams
+    # without one (added before courses were linked) are shown to everyone.
+
+    def get_student_exams(self, student_id):
+        """Returns the exams relevant to a student, each with a 'clash' flag."""
+        courses = set(self.get_courses_for_student(student_id))
+        exams = [e for e in self.exam_schedule if e.get('course_id') is None or e['course_id'] in courses]
+        clashes = exam_scheduler.student_clashes([e for e in exams if e.get('course_id')])
+        return [dict(e, clash=(e.get('date'), e.get('time')) in clashes and e.get('course_id') is not None)
+                for e in exams]
+
+    @_synchronized
+    def schedule_exams(self, slots, course_ids=None, capacity=None):
+        """Assigns every course (or the given ones) an exam slot from
+        [(date, time)], keeping students' clashes to a minimum.
+
+        capacity optionally limits the students sitting in one slot. Earlier
+        course-linked exams for these courses are replaced.
+        """
+        slots = [(date, time) for date, time in slots if date and time]
+        if not slots:
+            return False, "At least one exam slot (date and time) is required."
+        course_ids = list(self.courses) if course_ids is None else [c for c in course_ids if c in self.courses]
+        if not course_ids:
+            return False, "No courses to schedule."
+
+        rosters = {c: self.course_students.get(c, {}) for c in course_ids}
+        graph = exam_scheduler.conflict_graph(rosters)
+        sizes = {c: len(students) for c, students in rosters.items()}
+        assignment, stats = exam_scheduler.assign_slots(graph, len(slots), sizes, capacity)
+
+        scheduled = set(course_ids)
+        self.exam_schedule[:] = [e for e in self.exam_schedule if e.get('course_id') not in scheduled]
+        for course_id in course_ids:
+            date, time = slots[assignment[course_id]]
+            self.exam_schedule.append({"subject": self.get_course_name(course_id), "date": date,
+                                       "time": time, "course_id": course_id})
+            self.events.emit(None, course_id, 'exams')
+        self._persist('student_data', ('exam_schedule',))
+
+        message = f"{len(course_ids)} exams scheduled in {len(slots)} slots; {stats['conflicts']} student clashes."
+        if stats['over_capacity']:
+            message += f" {len(stats['over_capacity'])} slots are over capacity."
+        return True, message
+
     # ---------- Course Management ----------
 
     def _load_courses(self):
         if os.path.exists(self.courses_file):
-            with open(self.courses_file, 'r') as c:
-                try:
-                    self.courses = json.load(c)
-                except json.JSONDecodeError:
-                    self.courses = self._get_default_courses()
-                    self._save_courses()
+            try:
+                self.courses = serializers.load(self.courses_file)
+            except serializers.CorruptDataError:
+                self.courses = None
+            if self.courses is None:
+                self._quarantine(self.courses_file)
+                self.courses = self._get_default_courses()
+                self._save_courses()
         else:
             self.courses = self._get_default_courses()
             self._save_courses()
 
     def _get_default_courses(self):
         return {
-            "CS101": {"name": "Intro to Python", "faculty": "Prabhu"},
-            "MATH201": {"name": "Calculus I", "faculty": "Sukanta"},
-            "PHYS101": {"name": "Basic Engineering", "faculty": "Prabhu"},
-            "CHEM101": {"name": "Chemistry", "faculty": "Diddy"}
+            "CS101": {"name": "Intro to Python", "faculty": "Prabhu",
+                      "timetable": ["Tue 10:00", "Wed 11:00", "Fri 9:00"]},
+            "MATH201": {"name": "Calculus I", "faculty": "Sukanta",
+                        "timetable": ["Mon 11:00", "Tue 12:00", "Thu 10:00"]},
+            "PHYS101": {"name": "Basic Engineering", "faculty": "Prabhu",
+                        "timetable": ["Mon 9:00", "Wed 10:00", "Fri 10:00"]},
+            "CHEM101": {"name": "Chemistry", "faculty": "Diddy",
+                        "timetable": ["Tue 9:00", "Thu 9:00", "Fri 11:00"]}
         }
 
     def _save_courses(self):
-        with open(self.courses_file, 'w') as c:
-            json.dump(self.courses, c, indent=4)
+        if self.read_only:
+            return
+        with self.lock:
+            data = serializers.dumps(self.courses, self.file_format)
+        atomic_write(self.courses_file, data, self.batcher)
+        self._stamps[self.courses_file] = self._stamp(self.courses_file)
             
     # *** NEW METHOD ***
     def get_all_course_ids(self):
@@ -301,10 +1483,76 @@ class DataManager:
     def get_course_name(self, course_id):
         return self.courses.get(course_id, {}).get('name', course_id)
     
+    # ---------- Timetable ----------
+    # Courses list their weekly slots in courses[cid]['timetable'], e.g.
+    # ["Mon 9:00", "Wed 11:00"]; see app/timetable.py for the slot grid.
+
+    def get_course_slots(self, course_id):
+        return self.courses.get(course_id, {}).get('timetable', [])
+
+    @_synchronized
+    def set_course_slots(self, course_id, slots):
+        """Replaces a course's weekly slots. Refuses slots that would double-book
+        its faculty; reports how many enrolled students end up with a clash."""
+        if course_id not in self.courses:
+            return False, "Course not found."
+        try:
+            mask = slot_mask(slots)
+        except ValueError as e:
+            return False, str(e)
+        faculty_id = self.courses[course_id].get('faculty')
+        for other in self.faculty_courses.get(faculty_id, {}):
+            overlap = self.timetable.masks.get(other, 0) & mask
+            if other != course_id and overlap:
+                return False, f"{faculty_id} already teaches {other} at {', '.join(mask_slots(overlap))}."
+
+        self.courses[course_id]['timetable'] = mask_slots(mask)
+        self.timetable.update_course(course_id)
+        self._persist('courses', (course_id,))
+        self.events.emit(None, course_id, 'timetable')
+        clashing = {owner for owner, *_ in self.find_timetable_clashes(self.get_students_in_course(course_id))}
+        message = f"Timetable for {course_id} saved."
+        if clashing:
+            message += f" {len(clashing)} enrolled students now have clashes."
+        return True, message
+
+    def get_student_timetable(self, student_id):
+        """Returns [(day, [course name or '' per period])] for a student's courses."""
+        return self.timetable.grid(self.get_courses_for_student(student_id))
+
+    def find_timetable_clashes(self, student_ids=None):
+        """Returns (owner, course_a, course_b, slots) for every clash among the
+        given students' courses (all students and faculty by default).
+
+        Course sets come from the enrollment index, so no student records
+        are loaded.
+        """
+        wanted = None if student_ids is None else set(student_ids)
+        student_courses = {}
+        for course_id, students in self.course_students.items():
+            for student_id in students:
+                if wanted is None or student_id in wanted:
+                    student_courses.setdefault(student_id, []).append(course_id)
+        assignments = list(student_courses.items())
+        if student_ids is None:
+            assignments += [(faculty_id, list(courses)) for faculty_id, courses in self.faculty_courses.items()]
+        return self.timetable.find_clashes(assignments)
+
+    def _build_faculty_index(self):
+        self.faculty_courses = {}
+        for course_id, data in self.courses.items():
+            if data.get('faculty'):
+                self.faculty_courses.setdefault(data['faculty'], {})[course_id] = None
+
+    def _assign_faculty(self, course_id, faculty_id):
+        """Sets a course's faculty and moves it between faculty index entries."""
+        previous = self.courses[course_id].get('faculty')
+        if previous:
+            self.faculty_courses.get(previous, {}).pop(course_id, None)
+        self.courses[course_id]['faculty'] = faculty_id
+        if faculty_id:
+            self.faculty_courses.setdefault(faculty_id, {})[course_id] = None
+    
     def get_courses_for_faculty(self, faculty_id):
         """Returns a dict of {course_id: course_name} taught by a faculty member."""
-        faculty_courses = {}
-        for course_id, data in self.courses.items():
-            if data.get('faculty') == faculty_id:
-                faculty_courses[course_id] = data['name']
-        return faculty_courses
\ No newline at end of file
+        return {course_id: self.courses[course_id]['name'] for course_id in self.faculty_courses.get(faculty_id, ())}
\ No newline at end of file
@@ -0,0 +1,114 @@
+# app/durable_io.py
+
+import os
+import time
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+def _fsync_path(path):
+    """fsyncs a file (or, on POSIX, a directory) by path; failures are logged."""
+    if os.path.isdir(path):
+        if not hasattr(os, 'O_DIRECTORY'):
+            return  # Directories can't be fsynced on Windows
+        flags = os.O_RDONLY | os.O_DIRECTORY
+    else:
+        # Windows refuses to fsync a read-only descriptor (EBADF)
+        flags = os.O_RDWR | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(path, flags)
+    except FileNotFoundError:
+        return  # Replaced or deleted since it was written; nothing left to sync
+    except OSError as e:
+        log.warning("Could not open %s to fsync it: %s", path, e)
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        log.warning("fsync of %s failed: %s", path, e)
+    finally:
+        os.close(fd)
+
+
+class FsyncBatcher:
+    """Groups fsyncs: one per `every` writes or per `interval_ms`, whichever first.
+
+    atomic_write() always fsyncs the new file before renaming it, so only
+    the directory fsync that persists the rename is grouped; a replace in
+    between may revert to the old file on power failure, but never to an
+    empty one. Journal appends are grouped whole. every=1 syncs every write.
+    """
+    def __init__(self, every=1, interval_ms=0):
+        self.every = max(1, every)
+        self.interval = interval_ms / 1000.0
+        self._lock = threading.Lock()
+        self._count = 0
+        self._last_sync = time.monotonic()
+        self._unsynced = set()
+        self._timer = None
+
+    def due(self):
+        """Counts one write and returns True if it should be fsynced now."""
+        with self._lock:
+            self._count += 1
+            if self._count >= self.every:
+                return True
+            return bool(self.interval) and time.monotonic() - self._last_sync >= self.interval
+
+    def written(self, path, synced, file_synced=False):
+        """Records a finished write; if it was synced, syncs everything pending too.
+
+        file_synced means the file's data is already on disk and only its
+        directory entry still needs an fsync.
+        """
+        if synced:
+            with self._lock:
+                self._unsynced.add(os.path.dirname(os.path.abspath(path)))
+            self.sync_pending()
+            return
+        with self._lock:
+            if not file_synced:
+                self._unsynced.add(os.path.abspath(path))
+            self._unsynced.add(os.path.dirname(os.path.abspath(path)))
+            if self.interval and self._timer is None:
+                # Bound how long an unsynced write can linger if no more writes come
+                self._timer = threading.Timer(self.interval, self.sync_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync_pending(self):
+        with self._lock:
+            paths = self._unsynced
+            self._unsynced = set()
+            self._count = 0
+            self._last_sync = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        # Files before directories, so renames are persisted after their data
+        for path in sorted(paths, key=os.path.isdir):
+            _fsync_path(path)
+
+    def close(self):
+        self.sync_pending()
+
+
+def atomic_write(path, data, batcher=None):
+    """Replaces a file's contents (str or bytes) atomically via a temp file and rename.
+
+    A crash mid-write leaves either the old file or the new one, never a
+    truncated mix. The temp file is always fsynced before the rename; with
+    a batcher only the directory fsync is grouped.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb' if isinstance(data, bytes) else 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if batcher is not None:
+        batcher.written(path, batcher.due(), file_synced=True)
+    else:
+        _fsync_path(os.path.dirname(os.path.abspath(path)))
@@ -0,0 +1,67 @@
+# app/events.py
+
+import threading
+import contextlib
+from collections import namedtuple
+
+# What changed. Any part may be None, meaning "any": ChangeEvent('S1', 'CS101',
+# 'marks') is one student's marks, ChangeEvent(None, 'CS101', 'projects') a
+# course's project list and EVERYTHING a reload from disk.
+ChangeEvent = namedtuple('ChangeEvent', 'student_id course_id field')
+EVERYTHING = ChangeEvent(None, None, None)
+
+
+class EventBus:
+    """Collects change events and hands them to subscribers in batches.
+
+    Events emitted inside batch() are coalesced (duplicates dropped, order
+    kept) and delivered once when the outermost batch ends, so a bulk
+    operation touching 500 students calls each subscriber once. Batches and
+    pending events are per thread: subscribers run on the thread that made
+    the change, once its outermost batch has ended.
+    """
+    def __init__(self):
+        self._subscribers = []
+        self._local = threading.local()
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, 'pending'):
+            state.pending = {}  # ChangeEvent -> None, an insertion-ordered set
+            state.depth = 0
+        return state
+
+    def subscribe(self, callback):
+        """Registers callback(events); returns a function that unsubscribes it."""
+        self._subscribers.append(callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def emit(self, student_id=None, course_id=None, field=None):
+        state = self._state()
+        state.pending[ChangeEvent(student_id, course_id, field)] = None
+        if not state.depth:
+            self._deliver(state)
+
+    @contextlib.contextmanager
+    def batch(self):
+        state = self._state()
+        state.depth += 1
+        try:
+            yield
+        finally:
+            state.depth -= 1
+            if not state.depth:
+                self._deliver(state)
+
+    def _deliver(self, state):
+        if not state.pending:
+            return
+        events, state.pending = list(state.pending), {}
+        if EVERYTHING in events:
+            events = [EVERYTHING]
+        for callback in list(self._subscribers):
+            callback(events)
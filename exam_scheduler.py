@@ -0,0 +1,96 @@
+# app/exam_scheduler.py
+
+import heapq
+
+# Exam scheduling as weighted graph colouring: courses are nodes, an edge's
+# weight is the number of students the two courses share, and the colours
+# are the available exam slots. DSatur colours the most constrained course
+# first; when every slot already holds a neighbour, the course goes where
+# it clashes with the fewest students.
+
+
+def conflict_graph(rosters):
+    """Returns {course_id: {other_course_id: shared_students}} for {course_id: student_ids}.
+
+    Students are grouped by their exact set of courses first, so the pair
+    loop runs once per distinct combination rather than once per student.
+    """
+    student_courses = {}
+    for course_id, students in rosters.items():
+        for student_id in students:
+            student_courses.setdefault(student_id, []).append(course_id)
+
+    combinations = {}
+    for courses in student_courses.values():
+        if len(courses) > 1:
+            key = tuple(courses)
+            combinations[key] = combinations.get(key, 0) + 1
+
+    graph = {course_id: {} for course_id in rosters}
+    for courses, count in combinations.items():
+        for i, a in enumerate(courses):
+            for b in courses[i + 1:]:
+                graph[a][b] = graph[a].get(b, 0) + count
+                graph[b][a] = graph[b].get(a, 0) + count
+    return graph
+
+
+def assign_slots(graph, slot_count, sizes=None, capacity=None):
+    """Colours the conflict graph with slot_count slots.
+
+    sizes ({course_id: students}) and capacity (seats per slot) are
+    optional; when given, a slot is only chosen while it has room, unless
+    no slot does. Returns ({course_id: slot_index}, stats) where stats has
+    'conflicts' (student clashes left) and 'over_capacity' (slot indexes).
+    """
+    if slot_count < 1:
+        raise ValueError("At least one exam slot is needed.")
+    sizes = sizes or {}
+    assignment = {}
+    load = [0] * slot_count
+    neighbour_slots = {course_id: set() for course_id in graph}
+    weight = {course_id: sum(edges.values()) for course_id, edges in graph.items()}
+
+    # Max-heap on (saturation, weighted degree); stale entries are skipped
+    heap = [(0, -weight[c], i, c) for i, c in enumerate(graph)]
+    heapq.heapify(heap)
+    order = {c: i for i, c in enumerate(graph)}
+
+    while heap:
+        neg_saturation, _, _, course_id = heapq.heappop(heap)
+        if course_id in assignment or -neg_saturation != len(neighbour_slots[course_id]):
+            continue
+
+        size = sizes.get(course_id, 0)
+        fits = [s for s in range(slot_count) if capacity is None or load[s] + size <= capacity]
+        candidates = fits or range(slot_count)
+        free = [s for s in candidates if s not in neighbour_slots[course_id]]
+        if free:
+            slot = free[0]
+        else:
+            clash = [0] * slot_count
+            for other, shared in graph[course_id].items():
+                if other in assignment:
+                    clash[assignment[other]] += shared
+            slot = min(candidates, key=lambda s: (clash[s], load[s]))
+
+        assignment[course_id] = slot
+        load[slot] += size
+        for other in graph[course_id]:
+            if other not in assignment and slot not in neighbour_slots[other]:
+                neighbour_slots[other].add(slot)
+                heapq.heappush(heap, (-len(neighbour_slots[other]), -weight[other], order[other], other))
+
+    conflicts = sum(shared for a, edges in graph.items() for b, shared in edges.items()
+                    if a < b and assignment[a] == assignment[b])
+    over = [s for s in range(slot_count) if capacity is not None and load[s] > capacity]
+    return assignment, {"conflicts": conflicts, "over_capacity": over}
+
+
+def student_clashes(exams):
+    """Returns the (date, time) pairs that appear more than once in a list of exams."""
+    seen = {}
+    for exam in exams:
+        slot = (exam.get('date'), exam.get('time'))
+        seen[slot] = seen.get(slot, 0) + 1
+    return {slot for slot, count in seen.items() if count > 1}
@@ -0,0 +1,54 @@
+# export_cli.py
+"""Command-line exports, e.g.
+
+    python -m app.export_cli gradebook CS101 -o cs101.csv
+    python -m app.export_cli attendance --below 75 --format jsonl -o shortfall.jsonl
+"""
+import os
+import argparse
+
+from app.data_manager import DataManager
+from app import exporter
+
+# Same data layout as main.py
+DATA_DIR = 'data'
+CRED_PATH = os.path.join(DATA_DIR, 'credentials.json')
+STUDENT_DATA_PATH = os.path.join(DATA_DIR, 'student_data.json')
+COURSE_PATH = os.path.join(DATA_DIR, 'courses.json')
+JOURNAL_PATH = os.path.join(DATA_DIR, 'journal.log')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export portal data as CSV or JSONL.")
+    sub = parser.add_subparsers(dest='report', required=True)
+
+    gradebook = sub.add_parser('gradebook', help="Per-course gradebook")
+    gradebook.add_argument('course_id')
+
+    attendance = sub.add_parser('attendance', help="Institution-wide attendance report")
+    attendance.add_argument('--below', type=int, help="Only rows with attendance below this percentage")
+
+    for p in (gradebook, attendance):
+        p.add_argument('-o', '--output', required=True)
+        p.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+        p.add_argument('--shared', action='store_true',
+                       help="read under the lock of portals started with --shared")
+
+    args = parser.parse_args(argv)
+    # Read-only, so an export next to a running portal never compacts or
+    # truncates the journal that portal is appending to
+    data_manager = DataManager(CRED_PATH, STUDENT_DATA_PATH, COURSE_PATH, journal_file=JOURNAL_PATH,
+                               read_only=True, shared=args.shared)
+    try:
+        if args.report == 'gradebook':
+            success, message = exporter.export_gradebook(data_manager, args.course_id, args.output, args.format)
+        else:
+            success, message = exporter.export_attendance(data_manager, args.output, args.format, args.below)
+    finally:
+        data_manager.close()
+    print(message)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# app/exporter.py
+
+import csv
+import json
+
+# Reports are built from generators over the DataManager's indexes, so each
+# row is produced, written and dropped in turn instead of copying the whole
+# nested student dict first.
+
+ATTENDANCE_FIELDS = ['student_id', 'course_id', 'course_name', 'attendance']
+
+
+def _assessment_names(dm, course_id):
+    """Returns every assessment name used in a course: defined ones first,
+    then any others found in first-seen order."""
+    assessments = dict.fromkeys(dm.get_assessments(course_id))
+    for student_id in dm.get_students_in_course(course_id):
+        for subject in dm.get_marks(student_id, course_id):
+            assessments[subject] = None
+    return list(assessments)
+
+
+def gradebook_fields(dm, course_id):
+    """Returns the CSV header for a course gradebook."""
+    return ['student_id', 'attendance'] + _assessment_names(dm, course_id) + ['weighted_total']
+
+
+def iter_gradebook(dm, course_id, assessments=None):
+    """Yields one row per enrolled student: id, attendance, a column per
+    assessment and the weighted total."""
+    if assessments is None:
+        assessments = _assessment_names(dm, course_id)
+    for student_id in dm.get_students_in_course(course_id):
+        marks = dm.get_marks(student_id, course_id)
+        row = {'student_id': student_id, 'attendance': dm.get_attendance(student_id, course_id)}
+        for subject in assessments:
+            row[subject] = marks.get(subject)
+        row['weighted_total'] = dm.weighted_total(student_id, course_id)
+        yield row
+
+
+def iter_attendance_report(dm, below=None):
+    """Yields attendance for every enrollment in every course.
+
+    If below is given, only rows with recorded attendance under that
+    percentage are produced.
+    """
+    for course_id in dm.get_all_course_ids():
+        course_name = dm.get_course_name(course_id)
+        for student_id in dm.get_students_in_course(course_id):
+            attendance = dm.get_attendance(student_id, course_id)
+            if below is not None and (attendance is None or attendance >= below):
+                continue
+            yield {'student_id': student_id, 'course_id': course_id,
+                   'course_name': course_name, 'attendance': attendance}
+
+
+def write_rows(rows, path, fmt='csv', fieldnames=None):
+    """Streams rows to a CSV or JSONL file and returns how many were written."""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+                count += 1
+        elif fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            raise ValueError(f"Unknown export format '{fmt}'.")
+    return count
+
+
+def export_gradebook(dm, course_id, path, fmt='csv'):
+    if course_id not in dm.courses:
+        return False, "Course not found."
+    fields = gradebook_fields(dm, course_id)
+    count = write_rows(iter_gradebook(dm, course_id, fields[2:-1]), path, fmt, fields)
+    return True, f"Gradebook for {course_id} exported ({count} students)."
+
+
+def export_attendance(dm, path, fmt='csv', below=None):
+    count = write_rows(iter_attendance_report(dm, below), path, fmt, ATTENDANCE_FIELDS)
+    return True, f"Attendance report exported ({count} rows)."
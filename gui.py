@@ -1,17 +1,199 @@
 # app/gui.py
 
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+import tkinter.font as tkfont
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import ttkbootstrap as tkb
 
+from app import timetable
+from app.data_manager import PROJECT_STATUSES
+from app.search_index import SearchIndex
+
 # Define some theme colors (used for backgrounds/text where tkb doesn't override)
 BG_COLOR = "#F0F0F0"
 HEADER_COLOR = "#003366"  # A dark blue
 TITLE_COLOR = "#FFFFFF"
 
+# ---------- Widgets ----------
+
+def sync_rows(tree, rows):
+    """Makes a Treeview show rows [(iid, values)], touching only rows that differ."""
+    existing = set(tree.get_children())
+    stale = existing - {iid for iid, _ in rows}
+    if stale:
+        tree.delete(*stale)
+    for index, (iid, values) in enumerate(rows):
+        if iid not in existing:
+            tree.insert('', index, iid=iid, values=values)
+            continue
+        if tuple(map(str, tree.item(iid, 'values'))) != tuple(map(str, values)):
+            tree.item(iid, values=values)
+        if tree.index(iid) != index:
+            tree.move(iid, '', index)
+
+class VirtualList(tkb.Frame):
+    """A scrollable list that only puts the rows in view into its Listbox.
+
+    The full list stays in self.items; scrolling re-renders one window of
+    rows, so 40k entries cost about the same as 15.
+    """
+    def __init__(self, parent, items=(), height=15, font=("Arial", 12)):
+        super().__init__(parent)
+        self.items = list(items)
+        self.height = height
+        self.top = 0
+        self.selected = None
+        self.line_height = tkfont.Font(font=font).metrics('linespace') + 1
+
+        self.scrollbar = tkb.Scrollbar(self, orient='vertical', command=self._on_scrollbar)
+        self.listbox = tk.Listbox(self, font=font, height=height, exportselection=False, activestyle='none')
+        self.scrollbar.pack(side='right', fill='y')
+        self.listbox.pack(side='left', fill='both', expand=True)
+
+        self.listbox.bind('<<ListboxSelect>>', self._on_select)
+        self.listbox.bind('<Configure>', self._on_resize)
+        self.listbox.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.listbox.bind('<Button-4>', lambda e: self.scroll(-3))  # X11 wheel
+        self.listbox.bind('<Button-5>', lambda e: self.scroll(3))
+        self.listbox.bind('<Up>', lambda e: self._move(-1))
+        self.listbox.bind('<Down>', lambda e: self._move(1))
+        self.render()
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.top = 0
+        if self.selected not in self.items:
+            self.selected = None
+        self.render()
+
+    def remove(self, item):
+        """Removes one row in place, keeping the scroll position."""
+        try:
+            self.items.remove(item)
+        except ValueError:
+            return
+        if self.selected == item:
+            self.selected = None
+        self.scroll(0)
+
+    def scroll(self, rows):
+        self.top = max(0, min(self.top + rows, len(self.items) - self.height))
+        self.render()
+
+    def render(self):
+        visible = self.items[self.top:self.top + self.height]
+        self.listbox.delete(0, 'end')
+        if visible:
+            self.listbox.insert('end', *visible)
+        if self.selected in visible:
+            self.listbox.selection_set(visible.index(self.selected))
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.height) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.top = int(float(amount) * len(self.items))
+            self.scroll(0)
+        elif action == 'scroll':
+            self.scroll(int(amount) * (self.height if unit == 'pages' else 1))
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.items[self.top + selection[0]]
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self.line_height)
+        if rows != self.height:
+            self.height = rows
+            self.scroll(0)
+
+    def _move(self, delta):
+        if not self.items:
+            return 'break'
+        index = self.items.index(self.selected) + delta if self.selected in self.items else self.top
+        index = max(0, min(index, len(self.items) - 1))
+        self.selected = self.items[index]
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.height:
+            self.top = index - self.height + 1
+        self.render()
+        return 'break'
+
+class StudentPicker(tkb.Frame):
+    """A typeahead combobox over a roster SearchIndex.
+
+    Typing filters the roster (prefix matches first). The dropdown only ever
+    holds one page of matches, and the arrow buttons turn pages.
+    """
+    PAGE_SIZE = 50
+
+    def __init__(self, parent, roster, placeholder="Select Student"):
+        super().__init__(parent)
+        self.roster = roster
+        self.placeholder = placeholder
+        self.matches = []
+        self.page = 0
+
+        self.var = tk.StringVar(value=placeholder)
+        self.combo = tkb.Combobox(self, textvariable=self.var, bootstyle="secondary")
+        self.combo.pack(side='left', fill='x', expand=True)
+        tkb.Button(self, text="▶", width=3, bootstyle="secondary-outline", command=lambda: self.turn(1)).pack(side='right')
+        tkb.Button(self, text="◀", width=3, bootstyle="secondary-outline", command=lambda: self.turn(-1)).pack(side='right', padx=(5, 0))
+        self.page_label = tkb.Label(self, text="", width=16, anchor='e')
+        self.page_label.pack(side='right', padx=5)
+
+        self.combo.bind('<KeyRelease>', self._on_type)
+        self.combo.bind('<FocusIn>', self._on_focus)
+        self.filter('')
+
+    def filter(self, query):
+        self.matches = self.roster.search(query)
+        self.page = 0
+        self._show_page()
+
+    def turn(self, delta):
+        last = max(0, (len(self.matches) - 1) // self.PAGE_SIZE)
+        self.page = max(0, min(self.page + delta, last))
+        self._show_page()
+
+    def get(self):
+        """Returns the chosen student ID, or None if the text is not on the roster."""
+        value = self.var.get().strip()
+        return value if value in self.roster else None
+
+    def clear(self):
+        self.var.set(self.placeholder)
+        self.filter('')
+
+    def _show_page(self):
+        start = self.page * self.PAGE_SIZE
+        self.combo['values'] = self.matches[start:start + self.PAGE_SIZE]
+        if self.matches:
+            end = min(start + self.PAGE_SIZE, len(self.matches))
+            self.page_label.config(text=f"{start + 1}-{end} of {len(self.matches)}")
+        else:
+            self.page_label.config(text="No matches")
+
+    def _on_type(self, event):
+        if event.keysym in ('Up', 'Down', 'Return', 'Escape', 'Tab'):
+            return
+        query = self.var.get()
+        self.filter('' if query == self.placeholder else query)
+
+    def _on_focus(self, event):
+        if self.var.get() == self.placeholder:
+            self.var.set('')
+
 class App(tkb.Window):
     """Main application window that manages all frames."""
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, startup=None):
         # 1. Set a theme for the whole application (e.g., 'cosmo' for light/clean)
         super().__init__(themename="cosmo") 
         
@@ -19,6 +201,13 @@ class App(tkb.Window):
         self.current_user = None
         self.current_role = None
 
+        # Fast start: a DataManager built with defer_loading=True is loaded on
+        # a worker thread after the first login. startup, if given, is a
+        # StartupTimer that gets the GUI's milestones.
+        self.startup = startup
+        self._loader = None
+        self._load_error = None
+
         self.title("VIT University Portal")
         self.geometry("900x600")
 
@@ -31,23 +220,40 @@ class App(tkb.Window):
 
         self.frames = {}
         self.show_frame(LoginFrame)
+        if startup:
+            self.after_idle(lambda: startup.mark('login screen shown'))
+
+        # Make sure queued background saves reach disk before the window goes away
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        try:
+            self.data_manager.flush()
+        except OSError as e:
+            messagebox.showerror("Save Failed", f"Some changes could not be saved: {e}")
+        self.destroy()
 
     def show_frame(self, FrameClass):
         """Raises a frame to the top."""
-        # Destroy old role-specific frames on logout
+        # Role frames are kept for the next login; only their cached views,
+        # which hold the previous user's data, are dropped on logout
         if FrameClass == LoginFrame:
             for F in self.frames.values():
-                if F.__class__ != LoginFrame:
-                    F.destroy()
-            self.frames = {}
+                if isinstance(F, DashboardFrame):
+                    F.forget_views()
             self.current_user = None
             self.current_role = None
-            
+
+        # Pick up edits made by other processes sharing the data directory
+        self.data_manager.refresh()
+
         if FrameClass not in self.frames:
             self.frames[FrameClass] = FrameClass(self.container, self)
         
         frame = self.frames[FrameClass]
         frame.grid(row=0, column=0, sticky="nsew")
+        if isinstance(frame, DashboardFrame):
+            frame.header_label.config(text=f"{frame.title} (Welcome, {self.current_user})")
         
         # Call 'on_show' method if it exists, to refresh data
         if hasattr(frame, "on_show"):
@@ -55,20 +261,79 @@ class App(tkb.Window):
             
         frame.tkraise()
 
+    def after_data_loaded(self, callback):
+        """Calls callback on the Tk thread once all data is loaded, loading it
+        on a worker thread first if the DataManager deferred it."""
+        dm = self.data_manager
+        if dm.loaded.is_set():
+            callback()
+            return
+        if self._loader is None:
+            def run():
+                try:
+                    dm.load()
+                except Exception as e:  # Reported on the Tk thread by poll()
+                    self._load_error = e
+            self._loader = threading.Thread(target=run, name="data-loader", daemon=True)
+            self._loader.start()
+
+        def poll():
+            if dm.loaded.is_set():
+                if self.startup:
+                    self.startup.mark('data loaded')
+                callback()
+            elif self._load_error is not None:
+                # Forget the failed attempt, so the next login runs load() again
+                error, self._loader, self._load_error = self._load_error, None, None
+                messagebox.showerror("Loading Failed", f"Could not load the portal data: {error}")
+                self.show_frame(LoginFrame)  # Also clears the busy state
+            else:
+                self.after(50, poll)
+        poll()
+
     def attempt_login(self, role, user, password):
-        if self.data_manager.validate_login(role, user, password):
-            self.current_user = user
-            self.current_role = role
-            if role == 'student':
-                self.show_frame(StudentFrame)
-            elif role == 'faculty':
-                self.show_frame(FacultyFrame)
-            elif role == 'admin':
-                self.show_frame(AdminFrame)
-            return True
-        else:
-            messagebox.showerror("Login Failed", "Invalid username or password.")
-            return False
+        """Checks the password on a worker thread, since a first login runs
+        the full PBKDF2 hash, and finishes the login on the Tk thread."""
+        login_frame = self.frames[LoginFrame]
+        login_frame.set_busy("Signing in...")
+        result = {}
+
+        def run():
+            try:
+                result['verified'] = self.data_manager.check_password(role, user, password)
+            except Exception as e:  # Reported on the Tk thread by poll()
+                result['error'] = e
+        worker = threading.Thread(target=run, name="login", daemon=True)
+        worker.start()
+
+        def poll():
+            if worker.is_alive():
+                self.after(50, poll)
+                return
+            login_frame.on_show()
+            verified = result.get('verified')
+            if 'error' in result:
+                messagebox.showerror("Login Failed", f"Could not check the password: {result['error']}")
+            elif verified is None:
+                messagebox.showerror("Login Failed", "Invalid username or password.")
+            else:
+                self.data_manager.complete_login(role, user, password, *verified)
+                self._open_dashboard(role, user)
+        poll()
+
+    def _open_dashboard(self, role, user):
+        self.current_user = user
+        self.current_role = role
+        frame_class = {'student': StudentFrame, 'faculty': FacultyFrame, 'admin': AdminFrame}.get(role)
+        if frame_class:
+            if not self.data_manager.loaded.is_set():
+                self.frames[LoginFrame].set_busy("Loading data...")
+
+            def show():
+                self.show_frame(frame_class)
+                if self.startup:
+                    self.startup.mark('dashboard shown')
+            self.after_data_loaded(show)
 
 # ---------- Login Page ----------
 
@@ -99,8 +364,19 @@ class LoginFrame(tkb.Frame):
         self.pass_entry = tkb.Entry(main_frame, show="*", font=("Arial", 12))
         self.pass_entry.pack(pady=5, fill='x')
 
-        login_button = tkb.Button(main_frame, text="Login", command=self.on_login, bootstyle="primary")
-        login_button.pack(pady=5, fill='x', ipady=10)
+        self.login_button = tkb.Button(main_frame, text="Login", command=self.on_login, bootstyle="primary")
+        self.login_button.pack(pady=5, fill='x', ipady=10)
+
+        self.status_label = tkb.Label(main_frame, text="", font=("Arial", 10))
+        self.status_label.pack(pady=5)
+
+    def on_show(self):
+        self.status_label.config(text="")
+        self.login_button.config(state='normal')
+
+    def set_busy(self, message):
+        self.status_label.config(text=message)
+        self.login_button.config(state='disabled')
 
     def on_login(self):
         role = self.role.get()
@@ -112,9 +388,26 @@ class LoginFrame(tkb.Frame):
 
 class DashboardFrame(tkb.Frame):
     """A base class for the Student, Faculty, and Admin dashboards."""
+    title = "Dashboard"
+    role = None  # The login role this dashboard serves
+    MAX_VIEWS = 16
+    EVENT_POLL_MS = 100
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+
+        # Built content views kept alive between visits: key -> [frame, data
+        # stamp, update callback, stamp function], least recently used first
+        self.views = {}
+        # Key of the view or screen currently in the content pane
+        self.showing = None
+
+        # Data change events can arrive on any thread (e.g. the data loader or
+        # an import worker), so they are queued and drained here on the Tk thread
+        self._events = queue.Queue()
+        self._unsubscribe = controller.data_manager.subscribe(self._events.put)
+        self._poll_job = self.after(self.EVENT_POLL_MS, self._apply_events)
         
         # 1. Header
         header = tkb.Frame(self, bootstyle="primary")
@@ -138,17 +431,88 @@ class DashboardFrame(tkb.Frame):
         self.content_pane = tkb.Frame(main_pane, padding=20)
         main_pane.add(self.content_pane, stretch="always")
         
+    def destroy(self):
+        self._unsubscribe()
+        self.after_cancel(self._poll_job)
+        super().destroy()
+
     def clear_content_pane(self):
-        """Removes all widgets from the content pane."""
+        """Removes all widgets from the content pane; cached views are only hidden."""
+        self.showing = None
+        cached = {view[0] for view in self.views.values()}
         for widget in self.content_pane.winfo_children():
-            widget.destroy()
+            if widget in cached:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
+    def show_view(self, key, stamp, build):
+        """Shows the cached view for key, building it on first use.
+
+        build(frame) fills a new frame and may return an update(fields=None)
+        callback. stamp() returns what the view depends on (e.g.
+        DataManager.data_version values); when it differs from the stamp the
+        view was drawn at, the callback patches it in place, and views without
+        one are rebuilt.
+        """
+        self.clear_content_pane()
+        view = self.views.pop(key, None)
+        current = stamp()
+        if view is not None and view[1] != current:
+            if view[2] is None:
+                view[0].destroy()
+                view = None
+            else:
+                view[2]()
+                view[1] = current
+        if view is None:
+            frame = tkb.Frame(self.content_pane)
+            view = [frame, current, None, stamp]
+            view[2] = build(frame)
+            if len(self.views) >= self.MAX_VIEWS:
+                self.views.pop(next(iter(self.views)))[0].destroy()
+        self.views[key] = view
+        self.showing = key
+        view[0].pack(fill='both', expand=True)
+
+    def patch_view(self, key, fields=None):
+        """Brings a cached view up to date in place, e.g. after change events."""
+        view = self.views.get(key)
+        if view is not None and view[2] is not None:
+            view[2](fields)
+            view[1] = view[3]()
+
+    def forget_views(self):
+        for frame, *_ in self.views.values():
+            frame.destroy()
+        self.views = {}
+        self.showing = None
+
+    def _apply_events(self):
+        pending = {}
+        while True:
+            try:
+                pending.update(dict.fromkeys(self._events.get_nowait()))
+            except queue.Empty:
+                break
+        # Dashboards stay alive after logout; a hidden one drops its events
+        # and is redrawn in full by on_show() when its role next logs in
+        if pending and self.controller.current_role == self.role:
+            self.on_data_changed(list(pending))
+        self._poll_job = self.after(self.EVENT_POLL_MS, self._apply_events)
+
+    def on_data_changed(self, events):
+        """Called with the ChangeEvents since the last poll; subclasses
+        update only the widgets those events touch."""
 
 # ---------- Student Dashboard ----------
 
 class StudentFrame(DashboardFrame):
+    title = "🧑‍🎓 Student Dashboard"
+    role = 'student'
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.header_label.config(text=f"🧑‍🎓 Student Dashboard (Welcome, {controller.current_user})")
         
         self.student_courses = {}
         
@@ -171,6 +535,7 @@ class StudentFrame(DashboardFrame):
         dm = self.controller.data_manager
         student_id = self.controller.current_user
         course_ids = dm.get_courses_for_student(student_id)
+        self.student_courses = {}
         
         if not course_ids:
             tkb.Label(self.course_nav_frame, text="Not enrolled in any courses.").pack()
@@ -194,94 +559,134 @@ class StudentFrame(DashboardFrame):
         tkb.Label(self.content_pane, text="Welcome to your Dashboard", font=("Arial", 16, "bold")).pack(anchor='w')
         tkb.Label(self.content_pane, text="Select a course from the left menu to view your marks, attendance, and projects.").pack(anchor='w', pady=10)
 
+    def on_data_changed(self, events):
+        dm = self.controller.data_manager
+        student_id = self.controller.current_user
+        mine = [e for e in events if e.student_id in (None, student_id)]
+        if not mine:
+            return
+        fields = {e.field for e in mine}
+        if fields & {'enrollment', None}:
+            self.refresh_course_nav()
+
+        if isinstance(self.showing, tuple):
+            course_id = self.showing[1]
+            if not dm.is_enrolled(student_id, course_id):
+                self.show_welcome()
+                return
+            fields = {e.field for e in mine if e.course_id in (None, course_id)}
+            if fields:
+                self.patch_view(self.showing, None if None in fields else fields)
+        elif self.showing == 'timetable' and fields & {'timetable', 'enrollment', None}:
+            self.show_timetable()
+        elif self.showing == 'exams' and fields & {'exams', 'enrollment', None}:
+            self.show_exam_schedule()
+
     def show_course_dashboard(self, course_id):
-        self.clear_content_pane()
+        dm = self.controller.data_manager
+        dm.refresh()
+        student_id = self.controller.current_user
+        stamp = lambda: (dm.data_version('student_data', 'students', student_id), dm.data_version('courses', course_id))
+        self.show_view(('course', course_id), stamp, lambda frame: self.build_course_dashboard(frame, course_id))
+
+    def build_course_dashboard(self, frame, course_id):
+        """Builds a course view and returns the callback that patches it in place."""
         dm = self.controller.data_manager
         student_id = self.controller.current_user
         course_name = self.student_courses.get(course_id, course_id)
         
-        tkb.Label(self.content_pane, text=f"{course_name} ({course_id})", font=("Arial", 16, "bold")).pack(anchor='w')
+        tkb.Label(frame, text=f"{course_name} ({course_id})", font=("Arial", 16, "bold")).pack(anchor='w')
         
         # --- Attendance ---
-        tkb.Label(self.content_pane, text="Attendance", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
-        att = dm.get_attendance(student_id, course_id)
-        att_text = "No attendance recorded." if att is None else f"Your Attendance is: {att}%"
-        tkb.Label(self.content_pane, text=att_text, font=("Arial", 12)).pack(anchor='w')
+        tkb.Label(frame, text="Attendance", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
+        att_label = tkb.Label(frame, text="", font=("Arial", 12))
+        att_label.pack(anchor='w')
 
         # --- Marks ---
-        tkb.Label(self.content_pane, text="Marks", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
+        tkb.Label(frame, text="Marks", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
         cols = ('Exam', 'Mark')
-        tv_marks = tkb.Treeview(self.content_pane, columns=cols, show='headings', height=4, bootstyle="info")
+        tv_marks = tkb.Treeview(frame, columns=cols, show='headings', height=4, bootstyle="info")
         for c in cols: tv_marks.heading(c, text=c)
-        
-        marks = dm.get_marks(student_id, course_id)
-        if not marks:
-            tv_marks.insert('', 'end', values=("No marks available yet.", ""))
-        else:
-            for subj, mark in marks.items():
-                tv_marks.insert('', 'end', values=(subj, mark))
         tv_marks.pack(fill='x', pady=5)
+        total_label = tkb.Label(frame, text="", font=("Arial", 12))
+        total_label.pack(anchor='w')
         
         # --- Projects ---
-        tkb.Label(self.content_pane, text="Project Deadlines", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
-        cols = ('Project Title', 'Due Date')
-        tv_projects = tkb.Treeview(self.content_pane, columns=cols, show='headings', height=4, bootstyle="info")
+        tkb.Label(frame, text="Project Deadlines", font=("Arial", 14, "bold"), bootstyle="primary").pack(anchor='w', pady=(20, 5))
+        cols = ('Project Title', 'Due Date', 'Status')
+        tv_projects = tkb.Treeview(frame, columns=cols, show='headings', height=4, bootstyle="info")
         for c in cols: tv_projects.heading(c, text=c)
-        
-        projects = dm.get_projects(student_id, course_id)
-        if not projects:
-            tv_projects.insert('', 'end', values=("No projects assigned.", ""))
-        else:
-            for p in projects:
-                tv_projects.insert('', 'end', values=(p.get('title', 'N/A'), p.get('due', 'TBD')))
         tv_projects.pack(fill='x', pady=5)
 
+        def update(fields=None):
+            # fields: the kinds of data that changed, or None for all of them
+            if fields is None or 'attendance' in fields:
+                att = dm.get_attendance(student_id, course_id)
+                att_label.config(text="No attendance recorded." if att is None else f"Your Attendance is: {att}%")
+
+            if fields is None or fields & {'marks', 'assessments'}:
+                marks = dm.get_marks(student_id, course_id)
+                sync_rows(tv_marks, [(f"mark:{subj}", (subj, mark)) for subj, mark in marks.items()]
+                          or [("empty", ("No marks available yet.", ""))])
+                total = dm.weighted_total(student_id, course_id)
+                total_label.config(text="" if total is None else f"Weighted Total: {total:g}%")
+
+            if fields is not None and 'projects' not in fields:
+                return
+            projects = dm.get_projects(student_id, course_id)
+            sync_rows(tv_projects, [(f"project:{i}", (p.get('title', 'N/A'), p.get('due', 'TBD'), p.get('status', 'assigned')))
+                                    for i, p in enumerate(projects)]
+                      or [("empty", ("No projects assigned.", "", ""))])
+
+        update()
+        return update
 
     def show_timetable(self):
         self.clear_content_pane()
+        self.showing = 'timetable'
         tkb.Label(self.content_pane, text="Time Table", font=("Arial", 16, "bold")).pack(anchor='w')
         
-        cols = ('Day', '9:00 - 9:50', '10:00 - 10:50', '11:00 - 11:50', '12:00 - 12:50')
+        cols = ('Day',) + timetable.PERIOD_LABELS
         tv = tkb.Treeview(self.content_pane, columns=cols, show='headings', height=5, bootstyle="info")
         for c in cols:
             tv.heading(c, text=c)
             tv.column(c, width=120)
         
-        timetable_data = [
-            ('Mon', 'Basic Engineering', 'Computation Structures', 'Calculus', ''),
-            ('Tue', 'Chemistry', 'Python ', '', 'Calculus'),
-            ('Wed', 'Computation Structures', 'Basic Engineering', 'Python', ''),
-            ('Thu', 'Chemistry', 'Calculus', 'Computation Structures', ''),
-            ('Fri', 'Python', 'Basic Engineering', 'Chemistry', '')
-        ]
-        for row in timetable_data:
-            tv.insert('', 'end', values=row)
+        dm = self.controller.data_manager
+        for day, cells in dm.get_student_timetable(self.controller.current_user):
+            tv.insert('', 'end', values=(day, *cells))
             
         tv.pack(fill='x', pady=10)
 
     def show_exam_schedule(self):
         self.clear_content_pane()
+        self.showing = 'exams'
         tkb.Label(self.content_pane, text="Exam Schedule", font=("Arial", 16, "bold")).pack(anchor='w')
         
         cols = ('Subject', 'Date', 'Time')
         tv = tkb.Treeview(self.content_pane, columns=cols, show='headings', bootstyle="info")
         for c in cols: tv.heading(c, text=c)
+        tv.tag_configure('clash', foreground='red')
         
-        exams = self.controller.data_manager.get_exam_schedule()
+        exams = self.controller.data_manager.get_student_exams(self.controller.current_user)
         if not exams:
             tv.insert('', 'end', values=("No exams scheduled.", "", ""))
         else:
             for e in exams:
-                tv.insert('', 'end', values=(e.get('subject', 'N/A'), e.get('date', 'TBD'), e.get('time', 'TBD')))
+                subject = e.get('subject', 'N/A') + ("  ⚠ clash" if e['clash'] else "")
+                tv.insert('', 'end', values=(subject, e.get('date', 'TBD'), e.get('time', 'TBD')),
+                          tags=('clash',) if e['clash'] else ())
         tv.pack(fill='x', pady=10)
         
 
 # ---------- Faculty Dashboard ----------
 
 class FacultyFrame(DashboardFrame):
+    title = "🤓 Faculty Dashboard"
+    role = 'faculty'
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.header_label.config(text=f"🤓 Faculty Dashboard (Welcome, {controller.current_user})")
         
         self.faculty_courses = {}
 
@@ -323,48 +728,95 @@ class FacultyFrame(DashboardFrame):
         tkb.Label(self.content_pane, text="Welcome to your Dashboard", font=("Arial", 16, "bold")).pack(anchor='w')
         tkb.Label(self.content_pane, text="Select a course from the left menu to manage students, marks, and projects.").pack(anchor='w', pady=10)
 
+    def on_data_changed(self, events):
+        if any(e.field in ('faculty', None) for e in events):
+            self.refresh_course_nav()
+        if isinstance(self.showing, tuple):
+            course_id = self.showing[1]
+            if any(e.course_id == course_id or e.course_id is None and e.field is None for e in events):
+                self.patch_view(self.showing)
+
     def show_course_management(self, course_id):
-        self.clear_content_pane()
+        dm = self.controller.data_manager
+        dm.refresh()
+        stamp = lambda: (dm.data_version('courses', course_id), dm.data_version('roster', course_id),
+                         dm.data_version('student_data'))
+        self.show_view(('course', course_id), stamp, lambda frame: self.build_course_management(frame, course_id))
+
+    def build_course_management(self, frame, course_id):
+        """Builds a course's tabs and returns the callback that refreshes the stale ones."""
+        dm = self.controller.data_manager
         course_name = self.faculty_courses.get(course_id, course_id)
         
-        tkb.Label(self.content_pane, text=f"Manage: {course_name} ({course_id})", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
+        tkb.Label(frame, text=f"Manage: {course_name} ({course_id})", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
         
         # Use a Notebook (tabs) for clean layout
-        notebook = tkb.Notebook(self.content_pane)
+        notebook = tkb.Notebook(frame)
         notebook.pack(fill='both', expand=True)
         
         # --- Create tabs ---
         tab_att = tkb.Frame(notebook, padding=10)
         tab_marks = tkb.Frame(notebook, padding=10)
         tab_proj = tkb.Frame(notebook, padding=10)
+        tab_bulk = tkb.Frame(notebook, padding=10)
+        tab_stats = tkb.Frame(notebook, padding=10)
         
         notebook.add(tab_att, text="Mark Attendance")
         notebook.add(tab_marks, text="Add Marks")
-        notebook.add(tab_proj, text="Add Project")
-        
-        # --- Populate tabs ---
-        self.populate_attendance_tab(tab_att, course_id)
-        self.populate_marks_tab(tab_marks, course_id)
-        self.populate_project_tab(tab_proj, course_id)
+        notebook.add(tab_proj, text="Projects")
+        notebook.add(tab_bulk, text="Bulk Entry")
+        notebook.add(tab_stats, text="Statistics")
 
-    def _create_student_dropdown(self, parent, course_id):
-        """Helper to create a student dropdown for a course."""
-        dm = self.controller.data_manager
-        students = dm.get_students_in_course(course_id)
+        def fill(tab, populate, *args):
+            for widget in tab.winfo_children():
+                widget.destroy()
+            return populate(tab, course_id, *args)
+
+        refresh = {}
+
+        def fill_roster_tabs():
+            # The roster index is shared by all three student pickers
+            roster = SearchIndex(dm.get_students_in_course(course_id))
+            fill(tab_att, self.populate_attendance_tab, roster)
+            fill(tab_marks, self.populate_marks_tab, roster)
+            refresh['projects'] = fill(tab_proj, self.populate_project_tab, roster)
+            fill(tab_bulk, self.populate_bulk_tab)
         
-        student_var = tk.StringVar()
-        if not students:
+        # --- Populate tabs ---
+        fill_roster_tabs()
+        fill(tab_stats, self.populate_stats_tab)
+        seen = {'roster': dm.data_version('roster', course_id), 'course': dm.data_version('courses', course_id),
+                'students': dm.data_version('student_data')}
+
+        def update(fields=None):
+            # Only tabs whose data moved are redrawn; the others keep their input
+            roster_version = dm.data_version('roster', course_id)
+            if roster_version != seen['roster']:
+                fill_roster_tabs()
+            course_version = dm.data_version('courses', course_id)
+            if course_version != seen['course']:
+                refresh['projects']()
+            students_version = dm.data_version('student_data')
+            if (roster_version, course_version, students_version) != (seen['roster'], seen['course'], seen['students']):
+                fill(tab_stats, self.populate_stats_tab)
+            seen.update(roster=roster_version, course=course_version, students=students_version)
+
+        return update
+
+    def _create_student_picker(self, parent, roster):
+        """Helper to create a searchable student picker for a course roster."""
+        if not len(roster):
             tkb.Label(parent, text="No students enrolled.").pack()
-            return None, students
-            
-        student_menu = tkb.OptionMenu(parent, student_var, "Select Student", *students, bootstyle="secondary")
-        student_menu.pack(fill='x', pady=5)
-        return student_var, students
+            return None
 
-    def populate_attendance_tab(self, parent, course_id):
+        picker = StudentPicker(parent, roster)
+        picker.pack(fill='x', pady=5)
+        return picker
+
+    def populate_attendance_tab(self, parent, course_id, roster):
         tkb.Label(parent, text="Select Student:", width=15).pack(anchor='w')
-        student_var, students = self._create_student_dropdown(parent, course_id)
-        if not students: return
+        picker = self._create_student_picker(parent, roster)
+        if not picker: return
         
         tkb.Label(parent, text="Percentage (0-100):", width=20).pack(anchor='w', pady=(10,0))
         
@@ -377,8 +829,8 @@ class FacultyFrame(DashboardFrame):
         
         def on_submit():
             percent = percent_entry.get()
-            student = student_var.get()
-            if student == "Select Student":
+            student = picker.get()
+            if student is None:
                 status_label.config(text="Please select a student.", foreground="red")
                 return
 
@@ -386,23 +838,23 @@ class FacultyFrame(DashboardFrame):
             if success:
                 status_label.config(text=message, foreground="green")
                 percent_entry.delete(0, 'end')
-                student_var.set("Select Student")
+                picker.clear()
             else:
                 status_label.config(text=message, foreground="red")
         
         tkb.Button(parent, text="Submit", command=on_submit, bootstyle="success").pack(pady=10, ipadx=10)
 
-    def populate_marks_tab(self, parent, course_id):
+    def populate_marks_tab(self, parent, course_id, roster):
         tkb.Label(parent, text="Select Student:", width=15).pack(anchor='w')
-        student_var, students = self._create_student_dropdown(parent, course_id)
-        if not students: return
+        picker = self._create_student_picker(parent, roster)
+        if not picker: return
         
         tkb.Label(parent, text="Assessment Name:", width=30).pack(anchor='w', pady=(10,0))
         subject_entry = tkb.Entry(parent, width=40)
         subject_entry.pack(fill='x', pady=5, padx=5)
 
         tkb.Label(parent, text="Mark:", width=20).pack(anchor='w', pady=(10,0))
-        vcmd = (parent.register(self.validate_percent), '%P')
+        vcmd = (parent.register(self.validate_score), '%P')
         mark_entry = tkb.Entry(parent, width=40, validate='key', validatecommand=vcmd)
         mark_entry.pack(fill='x', pady=5, padx=5)
 
@@ -410,10 +862,10 @@ class FacultyFrame(DashboardFrame):
         status_label.pack(pady=10)
         
         def on_submit():
-            student = student_var.get()
+            student = picker.get()
             subject = subject_entry.get()
             mark = mark_entry.get()
-            if student == "Select Student":
+            if student is None:
                 status_label.config(text="Please select a student.", foreground="red")
                 return
 
@@ -422,13 +874,31 @@ class FacultyFrame(DashboardFrame):
                 status_label.config(text=message, foreground="green")
                 subject_entry.delete(0, 'end')
                 mark_entry.delete(0, 'end')
-                student_var.set("Select Student")
+                picker.clear()
             else:
                 status_label.config(text=message, foreground="red")
         
         tkb.Button(parent, text="Submit", command=on_submit, bootstyle="success").pack(pady=10, ipadx=10)
 
-    def populate_project_tab(self, parent, course_id):
+        # --- Assessment settings: max score and weight for the weighted total ---
+        tkb.Separator(parent).pack(fill='x', pady=10)
+        settings = tkb.Frame(parent)
+        settings.pack(fill='x')
+        tkb.Label(settings, text="Max Score:").pack(side='left')
+        max_entry = tkb.Entry(settings, width=8, validate='key', validatecommand=vcmd)
+        max_entry.pack(side='left', padx=5)
+        tkb.Label(settings, text="Weight:").pack(side='left')
+        weight_entry = tkb.Entry(settings, width=8, validate='key', validatecommand=vcmd)
+        weight_entry.pack(side='left', padx=5)
+
+        def on_define():
+            success, message = self.controller.data_manager.define_assessment(
+                course_id, subject_entry.get(), max_entry.get() or 100, weight_entry.get() or 1)
+            status_label.config(text=message, foreground="green" if success else "red")
+
+        tkb.Button(settings, text="Save Assessment Settings", command=on_define, bootstyle="secondary").pack(side='left', padx=5)
+
+    def populate_project_tab(self, parent, course_id, roster):
         tkb.Label(parent, text="Project Title:", width=15).pack(anchor='w')
         title_entry = tkb.Entry(parent, width=40)
         title_entry.pack(fill='x', pady=5, padx=5)
@@ -449,11 +919,174 @@ class FacultyFrame(DashboardFrame):
                 status_label.config(text=message, foreground="green")
                 title_entry.delete(0, 'end')
                 date_entry.delete(0, 'end')
+                refresh_projects()
             else:
                 status_label.config(text=message, foreground="red")
         
         tkb.Button(parent, text="Submit to All Students in Course", command=on_submit, bootstyle="warning").pack(pady=10, ipadx=10)
+
+        # --- Existing projects (shared by every enrolled student) ---
+        cols = ('ID', 'Project Title', 'Due Date')
+        tv_projects = tkb.Treeview(parent, columns=cols, show='headings', height=5, bootstyle="info")
+        for c in cols: tv_projects.heading(c, text=c)
+        tv_projects.column('ID', width=40, stretch=False)
+        tv_projects.pack(fill='x', pady=5)
+
+        def refresh_projects():
+            sync_rows(tv_projects, [(str(p['id']), (p['id'], p['title'], p['due']))
+                                    for p in self.controller.data_manager.get_course_projects(course_id)])
+
+        def on_update():
+            selected = tv_projects.selection()
+            if not selected:
+                status_label.config(text="Please select a project.", foreground="red")
+                return
+            success, message = self.controller.data_manager.edit_project(
+                course_id, int(selected[0]), title_entry.get() or None, date_entry.get() or None)
+            status_label.config(text=message, foreground="green" if success else "red")
+            refresh_projects()
+
+        def on_delete():
+            selected = tv_projects.selection()
+            if not selected:
+                status_label.config(text="Please select a project.", foreground="red")
+                return
+            if not messagebox.askyesno("Confirm", "Delete the selected project for all students?"):
+                return
+            success, message = self.controller.data_manager.delete_project(course_id, int(selected[0]))
+            status_label.config(text=message, foreground="green" if success else "red")
+            refresh_projects()
+
+        btn_frame = tkb.Frame(parent)
+        btn_frame.pack(fill='x')
+        tkb.Button(btn_frame, text="Delete Selected", command=on_delete, bootstyle="danger").pack(side='right', padx=5)
+        tkb.Button(btn_frame, text="Update Selected (Title/Date above)", command=on_update, bootstyle="secondary").pack(side='right', padx=5)
+
+        # --- Submission status of the selected project for one student ---
+        tkb.Separator(parent).pack(fill='x', pady=10)
+        tkb.Label(parent, text="Submission Status (for the selected project):").pack(anchor='w')
+        picker = self._create_student_picker(parent, roster)
+        if picker:
+            status_row = tkb.Frame(parent)
+            status_row.pack(fill='x')
+            submission_var = tk.StringVar(value="submitted")
+            tkb.OptionMenu(status_row, submission_var, "submitted", *PROJECT_STATUSES, bootstyle="secondary").pack(side='left')
+
+            def on_set_status():
+                selected = tv_projects.selection()
+                student = picker.get()
+                if not selected or student is None:
+                    status_label.config(text="Please select a project and a student.", foreground="red")
+                    return
+                success, message = self.controller.data_manager.set_project_status(
+                    student, course_id, int(selected[0]), submission_var.get())
+                status_label.config(text=message, foreground="green" if success else "red")
+                if success:
+                    picker.clear()
+
+            tkb.Button(status_row, text="Set Status", command=on_set_status, bootstyle="success").pack(side='left', padx=5)
+
+        refresh_projects()
+        return refresh_projects
         
+    def populate_bulk_tab(self, parent, course_id):
+        """A grid with one row per student so a whole column is submitted at once."""
+        dm = self.controller.data_manager
+        students = dm.get_students_in_course(course_id)
+        if not students:
+            tkb.Label(parent, text="No students enrolled.").pack()
+            return
+
+        top = tkb.Frame(parent)
+        top.pack(fill='x')
+        tkb.Label(top, text="Assessment Name (for Mark column):").pack(side='left')
+        subject_entry = tkb.Entry(top, width=30)
+        subject_entry.pack(side='left', fill='x', expand=True, padx=5)
+
+        # --- Scrollable grid (Canvas + inner Frame) ---
+        grid_frame = tkb.Frame(parent)
+        grid_frame.pack(fill='both', expand=True, pady=10)
+        canvas = tk.Canvas(grid_frame, highlightthickness=0, height=250)
+        scrollbar = tkb.Scrollbar(grid_frame, orient='vertical', command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+
+        rows = tkb.Frame(canvas)
+        canvas.create_window((0, 0), window=rows, anchor='nw')
+        rows.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+
+        tkb.Label(rows, text="Student", font=("Arial", 10, "bold")).grid(row=0, column=0, sticky='w', padx=5)
+        tkb.Label(rows, text="Attendance (%)", font=("Arial", 10, "bold")).grid(row=0, column=1, padx=5)
+        tkb.Label(rows, text="Mark", font=("Arial", 10, "bold")).grid(row=0, column=2, padx=5)
+
+        vcmd = (parent.register(self.validate_percent), '%P')
+        score_vcmd = (parent.register(self.validate_score), '%P')
+        att_entries = {}
+        mark_entries = {}
+        for i, student in enumerate(students, start=1):
+            tkb.Label(rows, text=student).grid(row=i, column=0, sticky='w', padx=5, pady=1)
+            att_entry = tkb.Entry(rows, width=10, validate='key', validatecommand=vcmd)
+            att_entry.grid(row=i, column=1, padx=5, pady=1)
+            mark_entry = tkb.Entry(rows, width=10, validate='key', validatecommand=score_vcmd)
+            mark_entry.grid(row=i, column=2, padx=5, pady=1)
+            att_entries[student] = att_entry
+            mark_entries[student] = mark_entry
+
+        status_label = tkb.Label(parent, text="", font=("Arial", 10))
+        status_label.pack(pady=5)
+
+        def filled(entries):
+            return {student: entry.get() for student, entry in entries.items() if entry.get()}
+
+        def on_submit_attendance():
+            success, message = dm.set_attendance_bulk(course_id, filled(att_entries))
+            status_label.config(text=message, foreground="green" if success else "red")
+            if success:
+                for entry in att_entries.values(): entry.delete(0, 'end')
+
+        def on_submit_marks():
+            success, message = dm.add_marks_bulk(course_id, subject_entry.get(), filled(mark_entries))
+            status_label.config(text=message, foreground="green" if success else "red")
+            if success:
+                subject_entry.delete(0, 'end')
+                for entry in mark_entries.values(): entry.delete(0, 'end')
+
+        btn_frame = tkb.Frame(parent)
+        btn_frame.pack(fill='x')
+        tkb.Button(btn_frame, text="Submit Marks Column", command=on_submit_marks, bootstyle="success").pack(side='right', padx=5)
+        tkb.Button(btn_frame, text="Submit Attendance Column", command=on_submit_attendance, bootstyle="success").pack(side='right', padx=5)
+
+    def populate_stats_tab(self, parent, course_id):
+        """Course averages, per-assessment spread and the attendance shortfall list."""
+        analytics = self.controller.data_manager.analytics
+        summary = analytics.course_summary(course_id)
+        if not summary["students"]:
+            tkb.Label(parent, text="No students enrolled.").pack()
+            return
+
+        def fmt(stats):
+            if not stats["count"]:
+                return "no data"
+            return (f"n={stats['count']}  mean={stats['mean']:.1f}  min={stats['min']:g}  "
+                    f"median={stats['p50']:g}  max={stats['max']:g}")
+
+        tkb.Label(parent, text=f"Enrolled students: {summary['students']}", font=("Arial", 11, "bold")).pack(anchor='w')
+        tkb.Label(parent, text=f"Attendance: {fmt(summary['attendance'])}").pack(anchor='w', pady=(5, 10))
+
+        tkb.Label(parent, text="Assessments", font=("Arial", 11, "bold")).pack(anchor='w')
+        if not summary["marks"]:
+            tkb.Label(parent, text="No marks recorded yet.").pack(anchor='w')
+        for subject, stats in summary["marks"].items():
+            tkb.Label(parent, text=f"{subject}: {fmt(stats)}").pack(anchor='w')
+
+        shortfall = analytics.attendance_below(75, course_id)
+        tkb.Label(parent, text=f"Attendance below 75% ({len(shortfall)})", font=("Arial", 11, "bold")).pack(anchor='w', pady=(10, 0))
+        listbox = tk.Listbox(parent, height=8)
+        listbox.pack(fill='both', expand=True, pady=5)
+        for student_id, _, percent in sorted(shortfall, key=lambda row: row[2]):
+            listbox.insert('end', f"{student_id}: {percent:g}%")
+
     def validate_percent(self, P):
         """Validation function: allow empty string or numbers 0-100."""
         if P == "":
@@ -466,6 +1099,15 @@ class FacultyFrame(DashboardFrame):
         except ValueError:
             return False
 
+    def validate_score(self, P):
+        """Validation function: allow empty string or a non-negative decimal."""
+        if P == "":
+            return True
+        try:
+            return float(P) >= 0 and P.replace('.', '', 1).isdigit()
+        except ValueError:
+            return False
+
     def show_add_exam(self):
         self.clear_content_pane()
         tkb.Label(self.content_pane, text="Add Global Exam Schedule", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
@@ -479,13 +1121,20 @@ class FacultyFrame(DashboardFrame):
             entry = tkb.Entry(row, width=40)
             entry.pack(side='left', fill='x', expand=True, padx=5)
             entries[field] = entry
+
+        row = tkb.Frame(self.content_pane)
+        row.pack(fill='x', pady=5)
+        tkb.Label(row, text="Course (optional):", width=20).pack(side='left')
+        course_var = tk.StringVar(value="All students")
+        tkb.OptionMenu(row, course_var, "All students", "All students", *self.faculty_courses, bootstyle="secondary").pack(side='left', fill='x', expand=True, padx=5)
             
         status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
         status_label.pack(pady=10)
 
         def on_submit():
             values = {field: entry.get() for field, entry in entries.items()}
-            success, message = self.controller.data_manager.add_exam(values["Exam"], values["Date (e.g., 12 March)"], values["Time (e.g., 10:00 AM)"])
+            course_id = course_var.get() if course_var.get() in self.faculty_courses else None
+            success, message = self.controller.data_manager.add_exam(values["Exam"], values["Date (e.g., 12 March)"], values["Time (e.g., 10:00 AM)"], course_id)
             if success:
                 status_label.config(text=message, foreground="green")
                 for entry in entries.values(): entry.delete(0, 'end')
@@ -498,12 +1147,19 @@ class FacultyFrame(DashboardFrame):
 # ---------- Admin Dashboard ----------
 
 class AdminFrame(DashboardFrame):
+    title = "👨‍🔧 Admin Dashboard"
+    role = 'admin'
+
     def __init__(self, parent, controller):
         super().__init__(parent, controller)
-        self.header_label.config(text=f"👨‍🔧 Admin Dashboard (Welcome, {controller.current_user})")
 
         tkb.Button(self.nav_pane, text="➕ Add User", bootstyle="info-outline", command=self.show_add_user).pack(fill='x', pady=5)
         tkb.Button(self.nav_pane, text="👥 Manage Users", bootstyle="info-outline", command=self.show_manage_users).pack(fill='x', pady=5)
+        tkb.Button(self.nav_pane, text="📥 Import CSV", bootstyle="info-outline", command=self.show_import).pack(fill='x', pady=5)
+        tkb.Button(self.nav_pane, text="📤 Export Reports", bootstyle="info-outline", command=self.show_export).pack(fill='x', pady=5)
+        tkb.Button(self.nav_pane, text="🗓 Timetable", bootstyle="info-outline", command=self.show_timetable_admin).pack(fill='x', pady=5)
+        tkb.Button(self.nav_pane, text="🧮 Schedule Exams", bootstyle="info-outline", command=self.show_schedule_exams).pack(fill='x', pady=5)
+        tkb.Button(self.nav_pane, text="🎓 Enrollment", bootstyle="info-outline", command=self.show_enrollment).pack(fill='x', pady=5)
         
         self.on_show()
 
@@ -533,12 +1189,13 @@ class AdminFrame(DashboardFrame):
         pass_entry = tkb.Entry(form_frame, show="*")
         pass_entry.grid(row=2, column=1, sticky='ew', padx=5, pady=5)
         
-        # --- Course Assignment UI (Faculty Only) ---
+        # --- Course Selection UI (courses to teach or to enroll in) ---
         
-        # Frame to hold the faculty course selection UI
+        # Frame to hold the course selection UI
         self.course_assignment_frame = tkb.Frame(form_frame)
         
-        tkb.Label(self.course_assignment_frame, text="Assign Courses (Faculty Only):", bootstyle="info").pack(anchor='w', pady=(10, 5))
+        course_label = tkb.Label(self.course_assignment_frame, text="", bootstyle="info")
+        course_label.pack(anchor='w', pady=(10, 5))
         
         # Get all courses from DataManager
         dm = self.controller.data_manager
@@ -559,13 +1216,14 @@ class AdminFrame(DashboardFrame):
             # Base row for elements after the password field (which is row 2)
             current_row = 3
             
-            if role_var.get() == 'faculty':
-                # If faculty, place the assignment frame at the current row
+            if role_var.get() in ('faculty', 'student'):
+                # Faculty pick courses to teach, students the courses to enroll in
+                course_label.config(text="Assign Courses:" if role_var.get() == 'faculty' else "Enroll in Courses:")
                 self.course_assignment_frame.grid(row=current_row, column=0, columnspan=2, sticky='ew', pady=10)
                 # Advance the current row for the next elements
                 current_row += 1 
             else:
-                # If not faculty (i.e., student/admin), ensure the assignment frame is hidden
+                # Admins have no courses, so hide the selection frame
                 self.course_assignment_frame.grid_forget()
 
             # Place the status label right after the optional course frame
@@ -594,8 +1252,7 @@ class AdminFrame(DashboardFrame):
                 return
             
             selected_courses = []
-            if role == 'faculty':
-                # Collect selected courses only if role is faculty
+            if role in ('faculty', 'student'):
                 for course_id, var in self.course_vars.items():
                     if var.get():
                         selected_courses.append(course_id)
@@ -606,8 +1263,8 @@ class AdminFrame(DashboardFrame):
                 status_label.config(text=f"✅ {message}", foreground="green")
                 id_entry.delete(0, 'end')
                 pass_entry.delete(0, 'end')
-                # Reset faculty course checkboxes
-                if role == 'faculty':
+                # Reset course checkboxes
+                if role in ('faculty', 'student'):
                     for var in self.course_vars.values():
                         var.set(False)
                 # Refresh the user list
@@ -631,8 +1288,7 @@ class AdminFrame(DashboardFrame):
                 return
             
             selected_courses = []
-            if role == 'faculty':
-                # Collect selected courses only if role is faculty
+            if role in ('faculty', 'student'):
                 for course_id, var in self.course_vars.items():
                     if var.get():
                         selected_courses.append(course_id)
@@ -643,8 +1299,8 @@ class AdminFrame(DashboardFrame):
                 status_label.config(text=f"✅ {message}", foreground="green")
                 id_entry.delete(0, 'end')
                 pass_entry.delete(0, 'end')
-                # Reset faculty course checkboxes
-                if role == 'faculty':
+                # Reset course checkboxes
+                if role in ('faculty', 'student'):
                     for var in self.course_vars.values():
                         var.set(False)
                 # Refresh the user list
@@ -658,7 +1314,285 @@ class AdminFrame(DashboardFrame):
         # Initial call to set the correct layout (defaults to student)
         update_form_layout()
 
+    def show_import(self):
+        self.clear_content_pane()
+        tkb.Label(self.content_pane, text="Import from CSV", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 10))
+        tkb.Label(self.content_pane, text="Users: role,user_id,password[,courses]  •  Grades: student_id,course_id[,assessment,mark][,attendance]").pack(anchor='w')
+
+        form_frame = tkb.Frame(self.content_pane)
+        form_frame.pack(fill='x', pady=10)
+        form_frame.columnconfigure(1, weight=1)
+
+        tkb.Label(form_frame, text="Import:").grid(row=0, column=0, sticky='w', padx=5, pady=5)
+        kind_var = tk.StringVar(value="users")
+        tkb.OptionMenu(form_frame, kind_var, "users", "users", "grades", bootstyle="info").grid(row=0, column=1, sticky='ew', padx=5, pady=5)
+
+        tkb.Label(form_frame, text="CSV File:").grid(row=1, column=0, sticky='w', padx=5, pady=5)
+        path_entry = tkb.Entry(form_frame)
+        path_entry.grid(row=1, column=1, sticky='ew', padx=5, pady=5)
+
+        def on_browse():
+            path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+            if path:
+                path_entry.delete(0, 'end')
+                path_entry.insert(0, path)
+
+        tkb.Button(form_frame, text="Browse...", command=on_browse, bootstyle="secondary").grid(row=1, column=2, padx=5)
+
+        dry_run_var = tk.BooleanVar(value=True)
+        tkb.Checkbutton(form_frame, text="Dry run (validate only, don't save)", variable=dry_run_var).grid(row=2, column=1, sticky='w', padx=5, pady=5)
+
+        progress = tkb.Progressbar(self.content_pane, maximum=100, bootstyle="success-striped")
+        progress.pack(fill='x', pady=5)
+        status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
+        status_label.pack(anchor='w', pady=5)
+        error_list = tk.Listbox(self.content_pane, font=("Arial", 10), height=8)
+        error_list.pack(fill='both', expand=True)
+
+        def on_import():
+            path = path_entry.get()
+            if not path:
+                status_label.config(text="⚠️ Please choose a CSV file", foreground="red")
+                return
+            from app import importer  # Only needed here; kept out of start-up
+            batches = importer.user_batches if kind_var.get() == "users" else importer.grade_batches
+            dm = self.controller.data_manager
+            dry_run = dry_run_var.get()
+            error_list.delete(0, 'end')
+
+            # Parsing large files and hashing passwords take a while, so they
+            # run on a worker thread. The writes stay on the Tk thread, which
+            # owns the DataManager (SQLite connections are bound to the thread
+            # that opened them): the worker queues each batch, poll() commits it.
+            state = {'fraction': 0.0, 'error': None, 'count': 0}
+            parse_errors, write_errors = [], []
+            ready = queue.Queue()
+
+            def on_progress(fraction):
+                state['fraction'] = fraction
+
+            def work():
+                try:
+                    for batch in batches(dm, path, parse_errors, dry_run=dry_run, progress=on_progress):
+                        ready.put(batch)
+                except Exception as e:
+                    state['error'] = e
+                finally:
+                    ready.put(None)
+
+            threading.Thread(target=work, name="csv-import", daemon=True).start()
+            import_button.config(state='disabled')
+            status_label.config(text="Importing...", foreground="")
+
+            def poll():
+                # Batches are committed even if the screen was left meanwhile
+                while True:
+                    try:
+                        batch = ready.get_nowait()
+                    except queue.Empty:
+                        break
+                    if batch is None:
+                        finish()
+                        return
+                    state['count'] += importer.commit(batch, write_errors, dry_run)
+                if progress.winfo_exists():
+                    progress['value'] = state['fraction'] * 100
+                self.after(50, poll)
+
+            def finish():
+                if not status_label.winfo_exists():
+                    return
+                progress['value'] = state['fraction'] * 100
+                import_button.config(state='normal')
+                if state['error'] is not None:
+                    status_label.config(text=f"⚠️ {state['error']}", foreground="red")
+                    return
+                errors = parse_errors + write_errors
+                verb = "would be imported" if dry_run else "imported"
+                status_label.config(text=f"✅ {state['count']} rows {verb}, {len(errors)} rows rejected.",
+                                    foreground="green" if not errors else "orange")
+                error_list.insert('end', *errors[:1000])
+            poll()
+
+        import_button = tkb.Button(self.content_pane, text="Run Import", command=on_import, bootstyle="primary")
+        import_button.pack(pady=10, ipadx=10)
+
+    def show_export(self):
+        from app import exporter  # Only needed here; kept out of start-up
+        self.clear_content_pane()
+        tkb.Label(self.content_pane, text="Export Reports", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
+
+        dm = self.controller.data_manager
+        form_frame = tkb.Frame(self.content_pane)
+        form_frame.pack(fill='x')
+        form_frame.columnconfigure(1, weight=1)
+
+        tkb.Label(form_frame, text="Report:").grid(row=0, column=0, sticky='w', padx=5, pady=5)
+        report_var = tk.StringVar(value="gradebook")
+        tkb.OptionMenu(form_frame, report_var, "gradebook", "gradebook", "attendance", bootstyle="info").grid(row=0, column=1, sticky='ew', padx=5, pady=5)
+
+        tkb.Label(form_frame, text="Course (gradebook):").grid(row=1, column=0, sticky='w', padx=5, pady=5)
+        course_ids = dm.get_all_course_ids()
+        course_var = tk.StringVar(value=course_ids[0] if course_ids else "")
+        tkb.OptionMenu(form_frame, course_var, course_var.get(), *course_ids, bootstyle="secondary").grid(row=1, column=1, sticky='ew', padx=5, pady=5)
+
+        tkb.Label(form_frame, text="Format:").grid(row=2, column=0, sticky='w', padx=5, pady=5)
+        format_var = tk.StringVar(value="csv")
+        tkb.OptionMenu(form_frame, format_var, "csv", "csv", "jsonl", bootstyle="secondary").grid(row=2, column=1, sticky='ew', padx=5, pady=5)
+
+        status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
+        status_label.pack(pady=10)
+
+        def on_export():
+            fmt = format_var.get()
+            path = filedialog.asksaveasfilename(defaultextension=f".{fmt}", filetypes=[(fmt.upper(), f"*.{fmt}")])
+            if not path:
+                return
+            try:
+                if report_var.get() == "gradebook":
+                    success, message = exporter.export_gradebook(dm, course_var.get(), path, fmt)
+                else:
+                    success, message = exporter.export_attendance(dm, path, fmt)
+            except OSError as e:
+                success, message = False, str(e)
+            status_label.config(text=message, foreground="green" if success else "red")
+
+        tkb.Button(self.content_pane, text="Export...", command=on_export, bootstyle="primary").pack(pady=10, ipadx=10)
+
     # ... (rest of AdminFrame)
+    def show_timetable_admin(self):
+        self.clear_content_pane()
+        dm = self.controller.data_manager
+        tkb.Label(self.content_pane, text="Course Timetable", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
+
+        tkb.Label(self.content_pane, text="Course:").pack(anchor='w')
+        course_var = tk.StringVar()
+        course_ids = dm.get_all_course_ids()
+        tkb.OptionMenu(self.content_pane, course_var, "Select Course", *course_ids, bootstyle="secondary").pack(fill='x', pady=5)
+
+        tkb.Label(self.content_pane, text=f"Slots (comma-separated, e.g. Mon 9:00, Wed 11:00; periods start at {', '.join(timetable.PERIODS)}):").pack(anchor='w', pady=(10, 0))
+        slots_entry = tkb.Entry(self.content_pane, width=60)
+        slots_entry.pack(fill='x', pady=5)
+
+        def on_course(*args):
+            slots_entry.delete(0, 'end')
+            slots_entry.insert(0, ", ".join(dm.get_course_slots(course_var.get())))
+        course_var.trace_add('write', on_course)
+
+        status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
+        status_label.pack(pady=5)
+
+        def on_save():
+            if course_var.get() not in course_ids:
+                status_label.config(text="Please select a course.", foreground="red")
+                return
+            slots = [s.strip() for s in slots_entry.get().split(",") if s.strip()]
+            success, message = dm.set_course_slots(course_var.get(), slots)
+            status_label.config(text=message, foreground="green" if success else "red")
+
+        cols = ('Student / Faculty', 'Course A', 'Course B', 'Slots')
+        tv = tkb.Treeview(self.content_pane, columns=cols, show='headings', height=10, bootstyle="info")
+        for c in cols: tv.heading(c, text=c)
+
+        def on_check():
+            tv.delete(*tv.get_children())
+            clashes = dm.find_timetable_clashes()
+            for owner, course_a, course_b, slots in clashes[:1000]:
+                tv.insert('', 'end', values=(owner, course_a, course_b, ", ".join(slots)))
+            status_label.config(text=f"{len(clashes)} clashes found.", foreground="green" if not clashes else "red")
+
+        btn_frame = tkb.Frame(self.content_pane)
+        btn_frame.pack(fill='x')
+        tkb.Button(btn_frame, text="Save Slots", command=on_save, bootstyle="success").pack(side='left', padx=5)
+        tkb.Button(btn_frame, text="Check All Clashes", command=on_check, bootstyle="warning").pack(side='left', padx=5)
+        tv.pack(fill='both', expand=True, pady=10)
+
+    def show_enrollment(self):
+        """Enrolls or drops a cohort of students in the selected courses."""
+        self.clear_content_pane()
+        dm = self.controller.data_manager
+        tkb.Label(self.content_pane, text="Enrollment", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
+
+        tkb.Label(self.content_pane, text="Courses:").pack(anchor='w')
+        course_vars = {}
+        for course_id in dm.get_all_course_ids():
+            var = tk.BooleanVar()
+            course_vars[course_id] = var
+            tkb.Checkbutton(self.content_pane, text=f"{dm.get_course_name(course_id)} ({course_id})", variable=var).pack(anchor='w', padx=10)
+
+        tkb.Label(self.content_pane, text="Student IDs (comma, space or newline separated):").pack(anchor='w', pady=(10, 0))
+        ids_text = tk.Text(self.content_pane, height=8)
+        ids_text.pack(fill='x', pady=5)
+
+        status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
+        status_label.pack(pady=10)
+
+        def selection():
+            courses = [c for c, var in course_vars.items() if var.get()]
+            students = ids_text.get('1.0', 'end').replace(',', ' ').split()
+            if not courses or not students:
+                status_label.config(text="Select at least one course and enter student IDs.", foreground="red")
+                return None
+            return students, courses
+
+        def on_enroll():
+            chosen = selection()
+            if chosen:
+                success, message = dm.enroll_cohort(*chosen)
+                status_label.config(text=message, foreground="green" if success else "red")
+
+        def on_drop():
+            chosen = selection()
+            if chosen and messagebox.askyesno("Confirm", "Drop these students from the selected courses?"):
+                success, message = dm.drop_cohort(*chosen)
+                status_label.config(text=message, foreground="green" if success else "red")
+
+        btn_frame = tkb.Frame(self.content_pane)
+        btn_frame.pack(fill='x')
+        tkb.Button(btn_frame, text="Enroll", command=on_enroll, bootstyle="success").pack(side='left', padx=5)
+        tkb.Button(btn_frame, text="Drop", command=on_drop, bootstyle="danger").pack(side='left', padx=5)
+
+    def show_schedule_exams(self):
+        """Auto-assigns every course an exam slot, minimising student clashes."""
+        self.clear_content_pane()
+        dm = self.controller.data_manager
+        tkb.Label(self.content_pane, text="Schedule Exams", font=("Arial", 16, "bold")).pack(anchor='w', pady=(0, 20))
+
+        fields = ["Dates (comma-separated)", "Times (comma-separated)", "Seats per slot (optional)"]
+        entries = {}
+        for field in fields:
+            row = tkb.Frame(self.content_pane)
+            row.pack(fill='x', pady=5)
+            tkb.Label(row, text=f"{field}:", width=25).pack(side='left')
+            entry = tkb.Entry(row, width=40)
+            entry.pack(side='left', fill='x', expand=True, padx=5)
+            entries[field] = entry
+
+        status_label = tkb.Label(self.content_pane, text="", font=("Arial", 10))
+        status_label.pack(pady=10)
+
+        cols = ('Course', 'Date', 'Time')
+        tv = tkb.Treeview(self.content_pane, columns=cols, show='headings', height=10, bootstyle="info")
+        for c in cols: tv.heading(c, text=c)
+
+        def on_schedule():
+            dates = [d.strip() for d in entries[fields[0]].get().split(",") if d.strip()]
+            times = [t.strip() for t in entries[fields[1]].get().split(",") if t.strip()]
+            seats = entries[fields[2]].get().strip()
+            if seats and not seats.isdigit():
+                status_label.config(text="Seats per slot must be a whole number.", foreground="red")
+                return
+            slots = [(d, t) for d in dates for t in times]
+            success, message = dm.schedule_exams(slots, capacity=int(seats) if seats else None)
+            status_label.config(text=message, foreground="green" if success else "red")
+            tv.delete(*tv.get_children())
+            for e in dm.get_exam_schedule():
+                if e.get('course_id'):
+                    tv.insert('', 'end', values=(e['course_id'], e['date'], e['time']))
+
+        tkb.Button(self.content_pane, text="Schedule All Courses", command=on_schedule, bootstyle="success").pack(pady=5, ipadx=10)
+        tv.pack(fill='both', expand=True, pady=10)
+
     def show_manage_users(self):
         self.clear_content_pane()
         tkb.Label(self.content_pane, text="Manage Users", font=("Arial", 16, "bold")).pack(anchor='w')
@@ -678,64 +1612,68 @@ class AdminFrame(DashboardFrame):
         
     def create_user_list_tab(self, parent, role):
         dm = self.controller.data_manager
-        
-        # Get users
-        if role == "student":
-            users = dm.get_all_students()
-        else:
-            users = dm.get_all_faculty()
+        users = dm.search_users(role)
             
-        tkb.Label(parent, text=f"Total Registered: {len(users)}").pack(anchor='w', pady=5)
-        
-        # --- Frame for Listbox and Scrollbar ---
-        list_frame = tkb.Frame(parent)
-        list_frame.pack(fill='both', expand=True)
-        
-        scrollbar = tkb.Scrollbar(list_frame, orient='vertical')
-        listbox = tk.Listbox(list_frame, font=("Arial", 12), height=15, yscrollcommand=scrollbar.set) 
-        
-        scrollbar.config(command=listbox.yview)
-        scrollbar.pack(side='right', fill='y')
-        listbox.pack(side='left', fill='both', expand=True)
-        
-        for user in users:
-            listbox.insert('end', user)
+        count_label = tkb.Label(parent, text=f"Total Registered: {len(users)}")
+        count_label.pack(anchor='w', pady=5)
+
+        # --- Search box: prefix matches first, then substring matches ---
+        search_frame = tkb.Frame(parent)
+        search_frame.pack(fill='x', pady=(0, 5))
+        tkb.Label(search_frame, text="Search:").pack(side='left')
+        search_var = tk.StringVar()
+        tkb.Entry(search_frame, textvariable=search_var).pack(side='left', fill='x', expand=True, padx=5)
+        
+        # --- Virtualised list: only the visible rows are in the Listbox ---
+        user_list = VirtualList(parent, users)
+        user_list.pack(fill='both', expand=True)
+
+        def update_count():
+            total = len(dm.credentials.get(role, {}))
+            shown = f" (showing {len(user_list.items)})" if search_var.get() else ""
+            count_label.config(text=f"Total Registered: {total}{shown}")
+
+        def on_search(*args):
+            user_list.set_items(dm.search_users(role, search_var.get()))
+            update_count()
+        search_var.trace_add('write', on_search)
             
         # --- Frame for Buttons ---
         btn_frame = tkb.Frame(parent)
         btn_frame.pack(fill='x', pady=10)
 
         def on_delete():
-            try:
-                selected_user = listbox.get(listbox.curselection())
-                if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{selected_user}'? This cannot be undone."):
-                    return
-                
-                success, message = dm.delete_user(role, selected_user)
-                if success:
-                    messagebox.showinfo("Success", message)
-                    self.show_manage_users()
-                else:
-                    messagebox.showerror("Error", message)
-            except tk.TclError:
+            selected_user = user_list.selected
+            if selected_user is None:
                 messagebox.showwarning("Warning", "Please select a user from the list first.")
+                return
+            if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{selected_user}'? This cannot be undone."):
+                return
+
+            success, message = dm.delete_user(role, selected_user)
+            if success:
+                messagebox.showinfo("Success", message)
+                user_list.remove(selected_user)
+                update_count()
+            else:
+                messagebox.showerror("Error", message)
         
         def on_reset_pass():
-            try:
-                selected_user = listbox.get(listbox.curselection())
-                new_pass = simpledialog.askstring("Reset Password", f"Enter new password for '{selected_user}':", show='*')
-                
-                if not new_pass:
-                    messagebox.showwarning("Cancelled", "Password not changed.")
-                    return
-
-                success, message = dm.reset_password(role, selected_user, new_pass)
-                if success:
-                    messagebox.showinfo("Success", message)
-                else:
-                    messagebox.showerror("Error", message)
-            except tk.TclError:
+            selected_user = user_list.selected
+            if selected_user is None:
                 messagebox.showwarning("Warning", "Please select a user from the list first.")
+                return
+            new_pass = simpledialog.askstring("Reset Password", f"Enter new password for '{selected_user}':", show='*')
+            
+            if not new_pass:
+                messagebox.showwarning("Cancelled", "Password not changed.")
+                return
+
+            success, message = dm.reset_password(role, selected_user, new_pass)
+            if success:
+                messagebox.showinfo("Success", message)
+            else:
+                messagebox.showerror("Error", message)
 
         tkb.Button(btn_frame, text="Reset Password", command=on_reset_pass, bootstyle="warning").pack(side='right', padx=5)
         tkb.Button(btn_frame, text="Delete Selected User", command=on_delete, bootstyle="danger").pack(side='right', padx=5)
\ No newline at end of file
@@ -0,0 +1,196 @@
+# app/importer.py
+
+import os
+import csv
+
+from app.passwords import hash_passwords
+from app.data_manager import DEFAULT_MAX_SCORE
+
+# Expected CSV headers:
+#   users:  role,user_id,password[,courses]   (courses separated by ';': enrolled or taught)
+#   grades: student_id,course_id[,assessment,mark][,attendance]
+USER_COLUMNS = ('role', 'user_id', 'password')
+GRADE_COLUMNS = ('student_id', 'course_id')
+
+
+class _CountingLines:
+    """Wraps a text file so progress can be reported while csv reads it."""
+    def __init__(self, f):
+        self.f = f
+        self.consumed = 0
+
+    def __iter__(self):
+        for line in self.f:
+            self.consumed += len(line)
+            yield line
+
+
+def _stream_rows(path, required, progress):
+    """Yields (line_number, row) from a CSV file without loading it whole.
+
+    progress(fraction) is called every 1000 rows, with the fraction based
+    on how much of the file has been read.
+    """
+    total = os.path.getsize(path) or 1
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        lines = _CountingLines(f)
+        reader = csv.DictReader(lines)
+        missing = [c for c in required if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+        for row in reader:
+            yield reader.line_num, {k: (v or '').strip() for k, v in row.items() if k}
+            if progress and reader.line_num % 1000 == 0:
+                progress(min(lines.consumed / total, 1.0))
+    if progress:
+        progress(1.0)
+
+
+def commit(batch, errors, dry_run=False):
+    """Writes one (count, write) batch from user_batches() or grade_batches()
+    and returns how many rows it added; a failed write is added to errors.
+
+    Must run on the thread that owns the DataManager (e.g. the Tk thread),
+    since SQLite connections can't be shared between threads.
+    """
+    count, write = batch
+    if dry_run:
+        return count
+    success, message = write()
+    if not success:
+        errors.append(message)
+        return 0
+    return count
+
+
+def user_batches(dm, path, errors, batch_size=1000, dry_run=False, progress=None):
+    """Streams users from a CSV file, yielding (count, write) batches for commit().
+
+    Rows are checked against an in-memory set of every existing user ID, so
+    each row costs O(1) to validate. Invalid rows are skipped and added to
+    errors. Each batch's passwords are hashed here (skipped for a dry run),
+    so this is the slow part and safe to run on a worker thread: nothing
+    is written until commit().
+    """
+    with dm.lock:
+        known_ids = {user_id for users in dm.credentials.values() for user_id in users}
+        course_ids = set(dm.courses)
+    batch = []
+
+    def close_batch():
+        users = list(batch)
+        batch.clear()
+        if dry_run:
+            return len(users), None
+        hashes = hash_passwords([password for _, _, password, _ in users], dm.password_iterations)
+        return len(users), lambda: dm.add_users_bulk(users, hashes)
+
+    for line, row in _stream_rows(path, USER_COLUMNS, progress):
+        role, user_id, password = row['role'].lower(), row['user_id'], row['password']
+        if role not in ('student', 'faculty', 'admin'):
+            errors.append(f"Line {line}: invalid role '{row['role']}'.")
+            continue
+        if not user_id or not password:
+            errors.append(f"Line {line}: user ID and password cannot be empty.")
+            continue
+        if user_id in known_ids:
+            errors.append(f"Line {line}: user ID '{user_id}' already exists.")
+            continue
+        courses = [c.strip() for c in row.get('courses', '').split(';') if c.strip()]
+        unknown = [c for c in courses if c not in course_ids]
+        if unknown:
+            errors.append(f"Line {line}: unknown course '{unknown[0]}'.")
+            continue
+
+        known_ids.add(user_id)
+        batch.append((role, user_id, password, courses))
+        if len(batch) >= batch_size:
+            yield close_batch()
+    if batch:
+        yield close_batch()
+
+
+def grade_batches(dm, path, errors, batch_size=1000, dry_run=False, progress=None):
+    """Streams marks and/or attendance from a CSV file, yielding (count, write)
+    batches for commit().
+
+    Each row needs student_id and course_id plus either assessment+mark,
+    attendance, or both. Invalid rows are skipped and added to errors.
+    Rows are checked against a snapshot of the students, rosters and
+    assessment maxima taken up front, since commit() keeps changing the
+    live data on another thread while this one parses.
+    """
+    with dm.lock:
+        students = set(dm.credentials.get('student', {}))
+        rosters = {course_id: set(dm.get_students_in_course(course_id)) for course_id in dm.courses}
+        max_scores = {course_id: {subject: definition.get('max', DEFAULT_MAX_SCORE)
+                                  for subject, definition in dm.get_assessments(course_id).items()}
+                      for course_id in dm.courses}
+    batch = []
+
+    def close_batch():
+        rows = list(batch)
+        batch.clear()
+        return len(rows), lambda: dm.record_grades_bulk(rows)
+
+    for line, row in _stream_rows(path, GRADE_COLUMNS, progress):
+        student_id, course_id = row['student_id'], row['course_id']
+        subject, mark = row.get('assessment', ''), row.get('mark', '')
+        if student_id not in students:
+            errors.append(f"Line {line}: student '{student_id}' not found.")
+            continue
+        if course_id not in rosters:
+            errors.append(f"Line {line}: course '{course_id}' not found.")
+            continue
+        if student_id not in rosters[course_id]:
+            errors.append(f"Line {line}: '{student_id}' is not enrolled in '{course_id}'.")
+            continue
+        if bool(subject) != bool(mark):
+            errors.append(f"Line {line}: assessment and mark must be given together.")
+            continue
+        if subject:
+            mark, error = dm.parse_mark(mark, max_scores[course_id].get(subject, DEFAULT_MAX_SCORE))
+            if error:
+                errors.append(f"Line {line}: {error}")
+                continue
+
+        attendance = None
+        if row.get('attendance'):
+            attendance, error = dm.parse_attendance(row['attendance'])
+            if error:
+                errors.append(f"Line {line}: {error}")
+                continue
+        if not subject and attendance is None:
+            errors.append(f"Line {line}: nothing to record.")
+            continue
+
+        batch.append((student_id, course_id, subject or None, mark if subject else None, attendance))
+        if len(batch) >= batch_size:
+            yield close_batch()
+    if batch:
+        yield close_batch()
+
+
+def import_users(dm, path, batch_size=1000, dry_run=False, progress=None):
+    """Streams users from a CSV file into the DataManager in batches.
+
+    Valid rows are committed batch_size at a time with a single flush each.
+    With dry_run=True nothing is written.
+
+    Returns (imported_count, errors) where errors is a list of strings.
+    """
+    errors = []
+    imported = sum(commit(batch, errors, dry_run)
+                   for batch in user_batches(dm, path, errors, batch_size, dry_run, progress))
+    return imported, errors
+
+
+def import_grades(dm, path, batch_size=1000, dry_run=False, progress=None):
+    """Streams marks and/or attendance from a CSV file in batches.
+
+    Returns (imported_count, errors).
+    """
+    errors = []
+    imported = sum(commit(batch, errors, dry_run)
+                   for batch in grade_batches(dm, path, errors, batch_size, dry_run, progress))
+    return imported, errors
@@ -0,0 +1,112 @@
+# app/journal.py
+
+import os
+import json
+
+from app.durable_io import atomic_write
+
+class Journal:
+    """Append-only log of DataManager mutations.
+
+    Each line is one compact JSON record holding the new value of a single
+    top-level key of a store, e.g.
+        {"s": "student_data", "k": ["students", "Harshit"], "v": {...}}
+    A record without "v" means the key was deleted.
+
+    Appends are fsynced according to the optional FsyncBatcher, so bursts of
+    mutations share one fsync.
+    """
+    def __init__(self, path, batcher=None):
+        self.path = path
+        self.batcher = batcher
+        self.pending = 0  # Records written since the last compaction
+        self.offset = 0  # Bytes of the file already applied in memory
+
+    def append(self, records):
+        """Writes a batch of (store, key, value, deleted) records in one go."""
+        self.write(self.encode(records))
+
+    def encode(self, records):
+        """Returns the journal lines for a batch of records.
+
+        Values are usually live references into DataManager's data, so this
+        is the part that has to run under its lock; write() does not.
+        """
+        lines = []
+        for store, key, value, deleted in records:
+            record = {"s": store, "k": list(key)}
+            if not deleted:
+                record["v"] = value
+            lines.append(json.dumps(record, separators=(',', ':')))
+        return lines
+
+    def write(self, lines):
+        """Appends lines from encode() and fsyncs them per the batcher."""
+        if not lines:
+            return
+        with open(self.path, 'a') as j:
+            j.write("\n".join(lines) + "\n")
+            j.flush()
+            self.offset = j.tell()
+            synced = self.batcher is None or self.batcher.due()
+            if synced:
+                os.fsync(j.fileno())
+        if self.batcher is not None:
+            self.batcher.written(self.path, synced)
+        self.pending += len(lines)
+
+    def replay(self, from_offset=False):
+        """Returns (records, clean) for the journal's records.
+
+        With from_offset=True only records appended (e.g. by another
+        process) since the last replay or append are returned.
+
+        A crash in the middle of an append can leave a torn last line; replay
+        stops there and reports clean=False so the caller can compact.
+        """
+        records = []
+        if not os.path.exists(self.path):
+            self.offset = 0
+            return records, True
+        start = self.offset if from_offset else 0
+        if not from_offset:
+            self.pending = 0
+        self.offset = start
+        with open(self.path, 'rb') as j:
+            j.seek(start)
+            for line in j:
+                if not line.endswith(b"\n"):
+                    return records, False
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    return records, False
+                records.append((record["s"], tuple(record["k"]), record.get("v"), "v" not in record))
+                start += len(line)
+                self.offset = start
+                self.pending += 1
+        return records, True
+
+    def size(self):
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def truncate(self, upto=None):
+        """Empties the journal once its records are in the snapshot files.
+
+        With upto, only the bytes before that offset are dropped: complete
+        records appended after it (while the snapshots were being written)
+        are kept, and a torn last line is not.
+        """
+        tail = b""
+        if upto is not None and os.path.exists(self.path):
+            with open(self.path, 'rb') as j:
+                j.seek(upto)
+                tail = j.read()
+            tail = tail[:tail.rfind(b"\n") + 1]
+        if tail:
+            atomic_write(self.path, tail, self.batcher)
+        else:
+            with open(self.path, 'w'):
+                pass
+        self.pending = tail.count(b"\n")
+        self.offset = len(tail)
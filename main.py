@@ -1,7 +1,13 @@
 # main.py
+import time
+STARTED = time.perf_counter()  # Before the heavier imports, for the startup report
+
 import os
+import argparse
+from app.startup import StartupTimer
 from app.gui import App
 from app.data_manager import DataManager
+from app.serializers import UnsupportedFormatError
 
 # Define the data directory
 # This ensures JSON files are stored cleanly in the 'data' subfolder
@@ -12,11 +18,40 @@ if not os.path.exists(DATA_DIR):
 CRED_PATH = os.path.join(DATA_DIR, 'credentials.json')
 STUDENT_DATA_PATH = os.path.join(DATA_DIR, 'student_data.json')
 COURSE_PATH = os.path.join(DATA_DIR, 'courses.json')
+JOURNAL_PATH = os.path.join(DATA_DIR, 'journal.log')
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VIT University Portal")
+    parser.add_argument("--fast-start", action="store_true",
+                        help="show the login screen after reading credentials only; load the rest after login")
+    parser.add_argument("--startup-report", nargs="?", const="", metavar="FILE",
+                        help="print startup timings on exit, and append them to FILE as a JSON line if given")
+    parser.add_argument("--shared", action="store_true",
+                        help="let several portals (or the API server) use the data folder at once, e.g. on a network share")
+    args = parser.parse_args()
+
+    startup = StartupTimer(STARTED)
+    startup.mark('imports')
+
     # 1. Initialize the data manager
-    data_manager = DataManager(CRED_PATH, STUDENT_DATA_PATH, COURSE_PATH)
-    
+    try:
+        data_manager = DataManager(CRED_PATH, STUDENT_DATA_PATH, COURSE_PATH, journal_file=JOURNAL_PATH,
+                                   background_writes=True, fsync_every=20, fsync_interval_ms=200,
+                                   file_format='compact', defer_loading=args.fast_start, shared=args.shared)
+    except UnsupportedFormatError as e:
+        raise SystemExit(f"Cannot start: {e}")
+    startup.mark('data manager ready')
+    if data_manager.loaded.is_set():
+        startup.mark('data loaded')
+
     # 2. Create and run the GUI App
-    app = App(data_manager)
-    app.mainloop()
\ No newline at end of file
+    app = App(data_manager, startup)
+    app.mainloop()
+
+    # 3. Drain pending saves and fold the journal back into the JSON files on exit
+    data_manager.close()
+
+    if args.startup_report is not None:
+        print(startup.report(data_manager.load_times))
+        if args.startup_report:
+            startup.append_to(args.startup_report, data_manager.load_times, fast_start=args.fast_start)
@@ -0,0 +1,109 @@
+# app/passwords.py
+
+import os
+import hmac
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Stored format: pbkdf2_sha256$<iterations>$<salt b64>$<hash b64>
+# Anything without the prefix is a legacy plaintext password.
+SCHEME = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 200_000
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode('ascii')
+
+
+def hash_password(password, iterations=DEFAULT_ITERATIONS):
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{SCHEME}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def hash_passwords(passwords, iterations=DEFAULT_ITERATIONS):
+    """Hashes many passwords at once, returning the hashes in order.
+
+    PBKDF2 releases the GIL, so a thread per core hashes a large batch
+    several times faster than a loop.
+    """
+    passwords = list(passwords)
+    if len(passwords) < 2:
+        return [hash_password(p, iterations) for p in passwords]
+    with ThreadPoolExecutor(max_workers=min(len(passwords), os.cpu_count() or 1)) as pool:
+        return list(pool.map(lambda p: hash_password(p, iterations), passwords))
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith(SCHEME + "$")
+
+
+def verify_password(password, stored, iterations=DEFAULT_ITERATIONS):
+    """Checks a password against a stored value in constant time.
+
+    Returns (ok, needs_upgrade); needs_upgrade is True for legacy plaintext
+    entries and for hashes made with fewer iterations than requested.
+    """
+    if not isinstance(stored, str) or not isinstance(password, str):
+        return False, False
+
+    if not is_hashed(stored):
+        ok = hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+        return ok, ok
+
+    try:
+        _, rounds, salt, expected = stored.split('$')
+        rounds = int(rounds)
+        salt = base64.b64decode(salt)
+        expected = base64.b64decode(expected)
+    except ValueError:
+        return False, False
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, rounds)
+    ok = hmac.compare_digest(digest, expected)
+    return ok, ok and rounds < iterations
+
+
+class VerifiedCache:
+    """Short-lived memory of successful logins so re-authentication skips the KDF.
+
+    Entries hold a keyed digest of the password (never the password itself)
+    together with the stored hash it was checked against, so a password
+    reset invalidates them automatically. Bounded to max_entries, LRU.
+    Thread-safe, as API logins check it from executor threads.
+    """
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._key = os.urandom(32)  # Per-process, so digests are useless elsewhere
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, password):
+        return hmac.new(self._key, password.encode('utf-8'), hashlib.sha256).digest()
+
+    def check(self, role, user_id, password, stored):
+        with self._lock:
+            entry = self._entries.get((role, user_id))
+            if entry is None:
+                return False
+            digest, cached_stored, expires = entry
+            if time.monotonic() > expires or cached_stored != stored:
+                self._entries.pop((role, user_id), None)
+                return False
+        return hmac.compare_digest(digest, self._digest(password))
+
+    def add(self, role, user_id, password, stored):
+        digest = self._digest(password)
+        with self._lock:
+            self._entries[(role, user_id)] = (digest, stored, time.monotonic() + self.ttl)
+            self._entries.move_to_end((role, user_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, role, user_id):
+        with self._lock:
+            self._entries.pop((role, user_id), None)
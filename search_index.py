@@ -0,0 +1,71 @@
+# app/search_index.py
+
+import re
+import bisect
+from itertools import accumulate
+
+
+class SearchIndex:
+    """Case-insensitive prefix and substring search over a set of IDs.
+
+    Prefix queries bisect a sorted key list; substring queries run one
+    regex over all keys joined by newlines, which stays in C code. add()
+    and remove() update the sorted list in place; the joined text is
+    rebuilt lazily on the next substring query.
+    """
+    def __init__(self, ids=()):
+        self._keys = sorted((i.lower(), i) for i in ids)
+        self._text = None
+        self._line_starts = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, item):
+        entry = (item.lower(), item)
+        pos = bisect.bisect_left(self._keys, entry)
+        return pos < len(self._keys) and self._keys[pos] == entry
+
+    def add(self, item):
+        entry = (item.lower(), item)
+        pos = bisect.bisect_left(self._keys, entry)
+        if pos == len(self._keys) or self._keys[pos] != entry:
+            self._keys.insert(pos, entry)
+            self._text = None
+
+    def remove(self, item):
+        entry = (item.lower(), item)
+        pos = bisect.bisect_left(self._keys, entry)
+        if pos < len(self._keys) and self._keys[pos] == entry:
+            del self._keys[pos]
+            self._text = None
+
+    def prefix(self, query):
+        """Returns IDs starting with query, in sorted order."""
+        query = query.lower()
+        start = bisect.bisect_left(self._keys, (query,))
+        end = bisect.bisect_left(self._keys, (query + '\U0010ffff',))
+        return [item for _, item in self._keys[start:end]]
+
+    def search(self, query, limit=None):
+        """Returns prefix matches first, then other substring matches, each sorted."""
+        query = query.strip().lower()
+        if not query:
+            items = [item for _, item in self._keys]
+            return items if limit is None else items[:limit]
+        results = self.prefix(query)
+        if limit is not None and len(results) >= limit:
+            return results[:limit]
+
+        if self._text is None:
+            keys = [key for key, _ in self._keys]
+            self._text = "\n".join(keys)
+            self._line_starts = [0] + list(accumulate(len(key) + 1 for key in keys[:-1]))
+        # A match's line number is its position in the sorted key list
+        for match in re.finditer(f"^[^\\n]*?{re.escape(query)}", self._text, re.MULTILINE):
+            key, item = self._keys[bisect.bisect_right(self._line_starts, match.start()) - 1]
+            if not key.startswith(query):
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
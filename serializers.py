@@ -0,0 +1,69 @@
+# app/serializers.py
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up for JSON
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional binary format; compact JSON is the fallback
+    msgpack = None
+
+# Binary files start with a magic header so load() can tell the formats apart.
+# Anything without one is treated as JSON, which keeps old files readable.
+MSGPACK_MAGIC = b"UPMP1\n"
+
+FORMATS = ('json', 'compact', 'binary')
+
+
+class CorruptDataError(ValueError):
+    """Raised when a data file can't be decoded in any known format."""
+
+
+class UnsupportedFormatError(RuntimeError):
+    """Raised when a data file is intact but needs a library that isn't
+    installed. Unlike CorruptDataError, callers must not replace the file."""
+
+
+def dumps(data, fmt='json'):
+    """Serializes data to bytes in the given format.
+
+    'json' is the original indented layout, 'compact' is JSON without
+    whitespace (orjson when installed), and 'binary' is msgpack when
+    installed, otherwise compact JSON. marshal and pickle are not used:
+    their formats are tied to the Python version or can run code on load.
+    """
+    if fmt == 'json':
+        return json.dumps(data, indent=4).encode('utf-8')
+    if fmt == 'binary' and msgpack is not None:
+        return MSGPACK_MAGIC + msgpack.packb(data, use_bin_type=True)
+    if fmt in ('compact', 'binary'):
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+    raise ValueError(f"Unknown file format '{fmt}'.")
+
+
+def loads(raw):
+    """Decodes bytes written by dumps(), detecting the format from the header."""
+    try:
+        if raw.startswith(MSGPACK_MAGIC):
+            if msgpack is None:
+                raise UnsupportedFormatError("File is msgpack-encoded but msgpack is not installed.")
+            return msgpack.unpackb(raw[len(MSGPACK_MAGIC):], raw=False, strict_map_key=False)
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+    except CorruptDataError:
+        raise
+    except (ValueError, TypeError) as e:
+        # msgpack's unpacking errors are ValueError subclasses too
+        raise CorruptDataError(str(e)) from e
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,149 @@
+# app/shard_store.py
+
+import os
+import hashlib
+from urllib.parse import quote, unquote
+
+from app.durable_io import atomic_write
+from app import serializers
+
+INDEX_FILE = '_index.json'
+
+
+class ShardStore:
+    """Student data stored as one JSON file per student.
+
+    A small index file keeps every student's enrolled course IDs and the
+    exam schedule, so DataManager can build its enrollment index without
+    opening any shard. Writes touch only the affected student's file; the
+    index is rewritten only when enrollments or the exam schedule change.
+    """
+    def __init__(self, directory, batcher=None, file_format='compact'):
+        self.directory = directory
+        self.batcher = batcher
+        self.file_format = file_format
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.index = {"enrollments": {}, "exam_schedule": []}
+        self.stamps = {}  # student_id -> (mtime_ns, size) of the shard we last read or wrote
+        self.reload_index()
+
+    def reload_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            self.index = serializers.load(self.index_path)
+        except serializers.CorruptDataError:
+            # Enrollments can be recovered from the shards themselves; the
+            # exam schedule starts empty, with the old index kept aside
+            self._quarantine(self.index_path)
+            self.index = {"enrollments": self._scan_enrollments(), "exam_schedule": []}
+            self._save_index()
+
+    def _quarantine(self, path):
+        """Moves an unreadable file aside, so a later write can't overwrite it."""
+        os.replace(path, f"{path}.corrupt")
+
+    def _scan_enrollments(self):
+        enrollments = {}
+        for name in sorted(os.listdir(self.directory)):
+            if name == INDEX_FILE or not name.endswith('.json'):
+                continue
+            student_id = unquote(name.rsplit('.', 2)[0])
+            entry = self.load_student(student_id)
+            if entry is not None:
+                enrollments[student_id] = list(entry.get("enrolled_courses", []))
+        return enrollments
+
+    def is_empty(self):
+        return not os.path.exists(self.index_path)
+
+    def _shard_path(self, student_id):
+        # The hash suffix keeps IDs differing only by case apart on
+        # case-insensitive filesystems.
+        digest = hashlib.md5(student_id.encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.directory, f"{quote(student_id, safe='')}.{digest}.json")
+
+    # ---------- Reads ----------
+
+    def student_ids(self):
+        return list(self.index["enrollments"])
+
+    def enrollments(self):
+        return [(student_id, course_id)
+                for student_id, course_ids in self.index["enrollments"].items()
+                for course_id in course_ids]
+
+    def load_exam_schedule(self):
+        return self.index.get("exam_schedule", [])
+
+    def _stamp(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def load_student(self, student_id):
+        """Returns a student's entry, or None if there is no readable shard.
+
+        An undecodable shard is quarantined first, so the empty entry the
+        caller falls back to is never saved over the original.
+        """
+        path = self._shard_path(student_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = serializers.load(path)
+        except serializers.CorruptDataError:
+            self._quarantine(path)
+            entry = None
+        self.stamps[student_id] = self._stamp(path)
+        return entry
+
+    def changed_students(self, student_ids):
+        """Returns the IDs whose shard was changed by someone else since we read it."""
+        return [s for s in student_ids if self.stamps.get(s) != self._stamp(self._shard_path(s))]
+
+    # ---------- Writes ----------
+
+    def write(self, records):
+        """Applies ('student_data', key, value, deleted) records."""
+        index_changed = False
+        enrollments = self.index["enrollments"]
+        for store, key, value, deleted in records:
+            if key[0] == 'exam_schedule':
+                self.index["exam_schedule"] = value or []
+                index_changed = True
+                continue
+
+            student_id = key[1]
+            path = self._shard_path(student_id)
+            if deleted:
+                self.stamps.pop(student_id, None)
+                if os.path.exists(path):
+                    os.remove(path)
+                if enrollments.pop(student_id, None) is not None:
+                    index_changed = True
+                continue
+
+            atomic_write(path, serializers.dumps(value, self.file_format), self.batcher)
+            self.stamps[student_id] = self._stamp(path)
+            enrolled = list(value.get("enrolled_courses", []))
+            if enrollments.get(student_id) != enrolled:
+                enrollments[student_id] = enrolled
+                index_changed = True
+
+        if index_changed:
+            self._save_index()
+
+    def _save_index(self):
+        atomic_write(self.index_path, serializers.dumps(self.index, self.file_format), self.batcher)
+
+    def migrate_from(self, student_data):
+        """Splits a whole student_data dict into shards (one-shot)."""
+        records = [('student_data', ('students', student_id), entry, False)
+                   for student_id, entry in student_data.get("students", {}).items()]
+        records.append(('student_data', ('exam_schedule',), student_data.get("exam_schedule", []), False))
+        self.write(records)
+        self._save_index()
@@ -0,0 +1,245 @@
+# app/sqlite_store.py
+
+import os
+import json
+import sqlite3
+
+from app import serializers
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    role TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    password TEXT NOT NULL,
+    PRIMARY KEY (role, user_id)
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_id TEXT PRIMARY KEY,
+    name TEXT,
+    faculty TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_courses_faculty ON courses (faculty);
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    position INTEGER,
+    enrolled INTEGER NOT NULL,
+    attendance INTEGER,
+    extra TEXT,
+    PRIMARY KEY (student_id, course_id)
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments (course_id, student_id);
+CREATE TABLE IF NOT EXISTS marks (
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    mark,
+    PRIMARY KEY (student_id, course_id, subject)
+);
+CREATE TABLE IF NOT EXISTS projects (
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    due TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projects_student_course ON projects (student_id, course_id);
+CREATE TABLE IF NOT EXISTS exams (
+    position INTEGER PRIMARY KEY,
+    subject TEXT,
+    date TEXT,
+    time TEXT,
+    course_id TEXT
+);
+"""
+
+COURSE_DATA_FIELDS = ("attendance", "marks", "projects")
+
+
+class SQLiteStore:
+    """Normalised SQLite storage for the data DataManager keeps in memory.
+
+    Writes use the same (store, key) addressing as the journal, so a
+    DataManager mutation touching one student only rewrites that student's
+    rows, inside a single transaction.
+    """
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def is_empty(self):
+        row = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM users) + (SELECT COUNT(*) FROM courses)").fetchone()
+        return row[0] == 0
+
+    def close(self):
+        self.conn.close()
+
+    def data_version(self):
+        """Changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # ---------- Reads ----------
+
+    def load_credentials(self):
+        credentials = {'admin': {}, 'student': {}, 'faculty': {}}
+        for role, user_id, password in self.conn.execute("SELECT role, user_id, password FROM users"):
+            credentials.setdefault(role, {})[user_id] = password
+        return credentials
+
+    def load_courses(self):
+        courses = {}
+        for course_id, name, faculty, extra in self.conn.execute(
+                "SELECT course_id, name, faculty, extra FROM courses ORDER BY rowid"):
+            course = {"name": name, "faculty": faculty}
+            if extra:
+                course.update(json.loads(extra))
+            courses[course_id] = course
+        return courses
+
+    def load_exam_schedule(self):
+        exams = []
+        for subject, date, time, course_id in self.conn.execute(
+                "SELECT subject, date, time, course_id FROM exams ORDER BY position"):
+            exam = {"subject": subject, "date": date, "time": time}
+            if course_id is not None:
+                exam["course_id"] = course_id
+            exams.append(exam)
+        return exams
+
+    def student_ids(self):
+        return [row[0] for row in self.conn.execute("SELECT student_id FROM students ORDER BY rowid")]
+
+    def enrollments(self):
+        """Yields (student_id, course_id) for every active enrollment."""
+        return self.conn.execute(
+            "SELECT student_id, course_id FROM enrollments WHERE enrolled = 1 ORDER BY rowid").fetchall()
+
+    def load_student(self, student_id):
+        """Builds one student's nested entry, or returns None if unknown."""
+        if self.conn.execute("SELECT 1 FROM students WHERE student_id = ?", (student_id,)).fetchone() is None:
+            return None
+
+        entry = {"enrolled_courses": [], "course_data": {}}
+        rows = self.conn.execute(
+            "SELECT course_id, enrolled, attendance, extra FROM enrollments "
+            "WHERE student_id = ? ORDER BY position", (student_id,))
+        for course_id, enrolled, attendance, extra in rows:
+            if enrolled:
+                entry["enrolled_courses"].append(course_id)
+            course_data = {"attendance": attendance, "marks": {}, "projects": []}
+            if extra:
+                course_data.update(json.loads(extra))
+            entry["course_data"][course_id] = course_data
+
+        rows = self.conn.execute(
+            "SELECT course_id, subject, mark FROM marks WHERE student_id = ? ORDER BY rowid", (student_id,))
+        for course_id, subject, mark in rows:
+            entry["course_data"][course_id]["marks"][subject] = mark
+
+        rows = self.conn.execute(
+            "SELECT course_id, title, due FROM projects WHERE student_id = ? ORDER BY course_id, position",
+            (student_id,))
+        for course_id, title, due in rows:
+            entry["course_data"][course_id]["projects"].append({"title": title, "due": due})
+        return entry
+
+    # ---------- Writes ----------
+
+    def write(self, records):
+        """Applies (store, key, value, deleted) records in one transaction."""
+        with self.conn:
+            for store, key, value, deleted in records:
+                if store == 'credentials':
+                    self._write_user(key, value, deleted)
+                elif store == 'courses':
+                    self._write_course(key, value, deleted)
+                elif key[0] == 'students':
+                    self._write_student(key[1], value, deleted)
+                elif key[0] == 'exam_schedule':
+                    self._write_exams(value or [])
+
+    def _write_user(self, key, password, deleted):
+        role, user_id = key
+        self.conn.execute("DELETE FROM users WHERE role = ? AND user_id = ?", (role, user_id))
+        if not deleted:
+            self.conn.execute("INSERT INTO users VALUES (?, ?, ?)", (role, user_id, password))
+
+    def _write_course(self, key, course, deleted):
+        course_id = key[0]
+        if deleted:
+            self.conn.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
+            return
+        extra = {k: v for k, v in course.items() if k not in ("name", "faculty")}
+        self.conn.execute(
+            "INSERT INTO courses VALUES (?, ?, ?, ?) ON CONFLICT (course_id) DO UPDATE SET "
+            "name = excluded.name, faculty = excluded.faculty, extra = excluded.extra",
+            (course_id, course.get("name"), course.get("faculty"), json.dumps(extra) if extra else None))
+
+    def _write_student(self, student_id, entry, deleted):
+        for table in ("enrollments", "marks", "projects"):
+            self.conn.execute(f"DELETE FROM {table} WHERE student_id = ?", (student_id,))
+        if deleted:
+            self.conn.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+            return
+        self.conn.execute("INSERT OR IGNORE INTO students VALUES (?)", (student_id,))
+
+        enrolled = entry.get("enrolled_courses", [])
+        course_data = entry.get("course_data", {})
+        # Keep enrolled courses first, in enrollment order
+        ordered = list(enrolled) + [c for c in course_data if c not in enrolled]
+        for position, course_id in enumerate(ordered):
+            data = course_data.get(course_id, {})
+            extra = {k: v for k, v in data.items() if k not in COURSE_DATA_FIELDS}
+            self.conn.execute(
+                "INSERT INTO enrollments VALUES (?, ?, ?, ?, ?, ?)",
+                (student_id, course_id, position, int(course_id in enrolled), data.get("attendance"),
+                 json.dumps(extra) if extra else None))
+            self.conn.executemany(
+                "INSERT INTO marks VALUES (?, ?, ?, ?)",
+                [(student_id, course_id, subject, mark) for subject, mark in data.get("marks", {}).items()])
+            self.conn.executemany(
+                "INSERT INTO projects VALUES (?, ?, ?, ?, ?)",
+                [(student_id, course_id, i, p.get("title"), p.get("due"))
+                 for i, p in enumerate(data.get("projects", []))])
+
+    def _write_exams(self, exams):
+        self.conn.execute("DELETE FROM exams")
+        self.conn.executemany(
+            "INSERT INTO exams VALUES (?, ?, ?, ?, ?)",
+            [(i, e.get("subject"), e.get("date"), e.get("time"), e.get("course_id")) for i, e in enumerate(exams)])
+
+
+def migrate_json_to_sqlite(credentials_file, student_data_file, courses_file, db_file):
+    """One-shot copy of the JSON layout into a SQLite database."""
+    def read(path, default):
+        if not os.path.exists(path):
+            return default
+        try:
+            return serializers.load(path)
+        except serializers.CorruptDataError:
+            return default
+
+    credentials = read(credentials_file, {})
+    student_data = read(student_data_file, {})
+    courses = read(courses_file, {})
+
+    records = []
+    for role, users in credentials.items():
+        for user_id, password in users.items():
+            records.append(('credentials', (role, user_id), password, False))
+    for course_id, course in courses.items():
+        records.append(('courses', (course_id,), course, False))
+    for student_id, entry in student_data.get('students', {}).items():
+        records.append(('student_data', ('students', student_id), entry, False))
+    records.append(('student_data', ('exam_schedule',), student_data.get('exam_schedule', []), False))
+
+    store = SQLiteStore(db_file)
+    store.write(records)
+    return store
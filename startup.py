@@ -0,0 +1,36 @@
+# app/startup.py
+
+import json
+import time
+
+
+class StartupTimer:
+    """Wall-clock milestones since launch, for tracking cold-start time.
+
+    mark() keeps only the first time a milestone is reached, so callbacks
+    that run again (e.g. on a later login) do not move it.
+    """
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def report(self, phases=None):
+        """Returns a readable report; phases are e.g. DataManager.load_times."""
+        lines = ["Startup timing (seconds since launch):"]
+        lines += [f"  {name:<24}{elapsed:8.3f}" for name, elapsed in self.marks.items()]
+        if phases:
+            lines.append("Data loading phases (seconds):")
+            lines += [f"  {name:<24}{elapsed:8.3f}" for name, elapsed in phases.items()]
+        return "\n".join(lines)
+
+    def append_to(self, path, phases=None, **extra):
+        """Appends the run as one JSON line, so regressions show up across runs."""
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                  "marks": {name: round(elapsed, 4) for name, elapsed in self.marks.items()},
+                  "phases": {name: round(elapsed, 4) for name, elapsed in (phases or {}).items()},
+                  **extra}
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
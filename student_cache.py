@@ -0,0 +1,91 @@
+# app/student_cache.py
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+class LazyStudentMap(MutableMapping):
+    """Dict-like view of student entries that loads each one on first access.
+
+    Only the list of student IDs is read up front; a student's marks,
+    attendance and projects are fetched from the store (SQLiteStore or
+    ShardStore) when a screen asks for them.
+
+    Loaded entries are kept in LRU order and the least recently used ones
+    beyond max_loaded are evicted. Entries that DataManager is about to
+    change are marked dirty and stay pinned until the next flush(), so
+    unsaved changes are never thrown away.
+    """
+    def __init__(self, store, max_loaded=None):
+        self.store = store
+        self.max_loaded = max_loaded
+        self._ids = dict.fromkeys(store.student_ids())  # Ordered set of known IDs
+        self._loaded = OrderedDict()
+        self._dirty = set()
+
+    def __getitem__(self, student_id):
+        if student_id not in self._ids:
+            raise KeyError(student_id)
+        if student_id in self._loaded:
+            self._loaded.move_to_end(student_id)
+        else:
+            entry = self.store.load_student(student_id) or {"enrolled_courses": [], "course_data": {}}
+            self._loaded[student_id] = entry
+            self._evict(keep=student_id)
+        return self._loaded[student_id]
+
+    def __setitem__(self, student_id, entry):
+        self._ids[student_id] = None
+        self._loaded[student_id] = entry
+        self._loaded.move_to_end(student_id)
+        self._dirty.add(student_id)
+
+    def __delitem__(self, student_id):
+        del self._ids[student_id]
+        self._loaded.pop(student_id, None)
+        self._dirty.discard(student_id)
+
+    def __contains__(self, student_id):
+        return student_id in self._ids
+
+    def __iter__(self):
+        return iter(list(self._ids))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def reload_ids(self):
+        """Re-reads the known IDs after the store was changed externally."""
+        self._ids = dict.fromkeys(self.store.student_ids())
+        for student_id in list(self._loaded):
+            if student_id not in self._ids:
+                del self._loaded[student_id]
+
+    def invalidate(self, student_ids):
+        """Drops cached entries so they are re-read on next access."""
+        for student_id in student_ids:
+            self._loaded.pop(student_id, None)
+
+    def loaded_ids(self):
+        return list(self._loaded)
+
+    def loaded_count(self):
+        return len(self._loaded)
+
+    def mark_dirty(self, student_id):
+        """Pins an entry that is about to be modified until the next flush()."""
+        self._dirty.add(student_id)
+
+    def flush(self):
+        """Called once changes are saved: unpins everything and evicts."""
+        self._dirty.clear()
+        self._evict()
+
+    def _evict(self, keep=None):
+        if self.max_loaded is None or len(self._loaded) <= self.max_loaded:
+            return
+        for student_id in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded:
+                break
+            if student_id not in self._dirty and student_id != keep:
+                del self._loaded[student_id]
@@ -0,0 +1,47 @@
+# tests/conftest.py
+
+import os
+import sys
+import shutil
+import importlib.util
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The modules import each other as the `app` package (see main.py), so map
+# the repository directory to that name before any test imports it
+if 'app' not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        'app', os.path.join(ROOT, '__init__.py'), submodule_search_locations=[ROOT])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['app'] = module
+    spec.loader.exec_module(module)
+
+from app.data_manager import DataManager  # noqa: E402
+
+DATA_FILES = ('credentials.json', 'student_data.json', 'courses.json')
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A copy of the sample data files shipped with the repository."""
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture
+def open_dm(data_dir):
+    """Returns a factory for DataManagers over data_dir, closing them afterwards."""
+    opened = []
+
+    def open_dm(**kwargs):
+        kwargs.setdefault('password_iterations', 1000)  # Keep the KDF cheap in tests
+        dm = DataManager(*(str(data_dir / name) for name in DATA_FILES), **kwargs)
+        opened.append(dm)
+        return dm
+
+    yield open_dm
+    for dm in opened:
+        dm.close()
@@ -0,0 +1,53 @@
+# tests/test_analytics.py
+
+import pytest
+
+
+def test_course_summary_follows_saved_changes(open_dm):
+    dm = open_dm()
+    summary = dm.analytics.course_summary('CS101')
+    assert summary['students'] == 3
+    assert summary['attendance']['count'] == 1
+    assert summary['marks']['Problem solving using Python']['max'] == 16.7  # Legacy string mark
+
+    # Built once, then updated per saved student
+    assert dm.set_attendance('SHILAJIT', 'CS101', 75)[0]
+    assert dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 4, 'SHILAJIT': 8})[0]
+    summary = dm.analytics.course_summary('CS101')
+    assert summary['attendance'] == {"count": 2, "mean": 71.0, "min": 67.0, "max": 75.0,
+                                     "p25": 69.0, "p50": 71.0, "p75": 73.0}
+    assert summary['marks']['Quiz']['mean'] == 6.0
+
+    assert dm.drop_student('SHILAJIT', 'CS101')[0]
+    summary = dm.analytics.course_summary('CS101')
+    assert summary['students'] == 2
+    assert summary['marks']['Quiz']['count'] == 1
+
+
+def test_percentiles_and_histogram(open_dm):
+    dm = open_dm()
+    dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 2, 'SHILAJIT': 4, 'sakcham': 10})
+    assert dm.analytics.percentiles('CS101', 'Quiz') == {25: 3.0, 50: 4.0, 75: 7.0}
+    assert dm.analytics.percentiles('CS101', 'Missing') == {}
+    counts, edges = dm.analytics.histogram('CS101', 'Quiz', bins=4, value_range=(0, 10))
+    assert counts == [1, 1, 0, 1]
+    assert edges == [0, 2.5, 5.0, 7.5, 10]
+
+
+def test_weighted_totals_match_the_per_student_calculation(open_dm):
+    dm = open_dm()
+    dm.define_assessment('CS101', 'Quiz', 10, 1)
+    dm.define_assessment('CS101', 'Final', 50, 3)
+    dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 5, 'SHILAJIT': 10})
+    dm.add_marks_bulk('CS101', 'Final', {'Harshit': 50})
+    totals = dm.analytics.weighted_totals('CS101')
+    assert [student for student, _ in totals] == ['SHILAJIT', 'Harshit']
+    for student_id, total in totals:
+        assert total == pytest.approx(dm.weighted_total(student_id, 'CS101'))
+
+
+def test_attendance_below_skips_missing_values(open_dm):
+    dm = open_dm()
+    assert dm.analytics.attendance_below(80) == [('Harshit', 'CS101', 67.0)]
+    dm.set_attendance('SHILAJIT', 'CHEM101', 10)
+    assert dm.analytics.attendance_below(80, 'CHEM101') == [('SHILAJIT', 'CHEM101', 10.0)]
@@ -0,0 +1,155 @@
+# tests/test_api_server.py
+
+import json
+import time
+import socket
+import asyncio
+import threading
+import http.client
+
+import pytest
+
+from app import api_server
+
+
+@pytest.fixture
+def api(open_dm):
+    """Serves a DataManager on an ephemeral localhost port; yields a request function."""
+    dm = open_dm()
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(api_server.serve(dm, port=0, session_ttl=60))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+
+    def request(method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    request.dm = dm
+    request.port = port
+    yield request
+    conn.close()
+
+    async def stop():
+        server.close()
+        await server.wait_closed()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def login(api, role, user_id, password):
+    status, body = api('POST', '/login', {"role": role, "user_id": user_id, "password": password})
+    assert status == 200, body
+    return body['token']
+
+
+def test_login_and_sessions(api):
+    assert api('POST', '/login', {"role": "student", "user_id": "Harshit", "password": "nope"})[0] == 401
+    assert api('POST', '/login', {"role": "student", "user_id": 5, "password": "x"})[0] == 400
+    assert api('GET', '/exams')[0] == 401
+
+    first = login(api, 'student', 'Harshit', 'harshit12')
+    second = login(api, 'student', 'Harshit', 'harshit12')
+    status, body = api('GET', '/students/Harshit/courses', token=first)
+    assert (status, body) == (200, {"courses": ['CS101', 'PHYS101']})
+
+    # Logging out ends only the presented session
+    assert api('POST', '/logout', token=first)[0] == 200
+    assert api('GET', '/exams', token=first)[0] == 401
+    assert api('GET', '/exams', token=second)[0] == 200
+
+
+def test_sessions_expire(api, monkeypatch):
+    token = login(api, 'student', 'Harshit', 'harshit12')
+    now = time.monotonic()
+    monkeypatch.setattr(api_server.time, 'monotonic', lambda: now + 61)
+    assert api('GET', '/exams', token=token)[0] == 401
+
+
+def test_role_checks(api):
+    student = login(api, 'student', 'Harshit', 'harshit12')
+    faculty = login(api, 'faculty', 'Prabhu', 'prabhu12')
+
+    assert api('GET', '/students/Shourya/courses', token=student)[0] == 403
+    assert api('PUT', '/students/Harshit/courses/CS101/attendance', {"attendance": 100}, token=student)[0] == 403
+    assert api('GET', '/courses/MATH201/students', token=faculty)[0] == 403  # Sukanta's course
+    assert api('POST', '/exams', {"subject": "x", "date": "d", "time": "t"}, token=faculty)[0] == 403
+    assert api('GET', '/courses/CS101/students', token=faculty) == (200, {"students": ['Harshit', 'SHILAJIT', 'sakcham']})
+
+
+def test_errors(api):
+    faculty = login(api, 'faculty', 'Prabhu', 'prabhu12')
+    assert api('GET', '/nowhere', token=faculty)[0] == 404
+    assert api('GET', '/students/Nobody/courses', token=faculty)[0] == 404
+    assert api('GET', '/students/Harshit/courses/NOPE', token=faculty)[0] == 404
+    assert api('DELETE', '/exams', token=faculty)[0] == 405
+
+    path = '/students/Harshit/courses/CS101/attendance'
+    for bad in (1e400, 55.9, 101, "abc", True, [1]):
+        status, body = api('PUT', path, {"attendance": bad}, token=faculty)
+        assert status == 400, (bad, body)
+    status, body = api('POST', '/courses/CS101/attendance', {"attendance": {"Harshit": 10 ** 400}}, token=faculty)
+    assert status == 400, body
+    status, body = api('POST', '/students/Harshit/courses/CS101/marks',
+                       {"subject": "Quiz", "mark": 10 ** 400}, token=faculty)
+    assert status == 400, body
+    assert api.dm.get_attendance('Harshit', 'CS101') == 67
+
+
+def test_handler_errors_are_not_reported_as_bad_json(api, monkeypatch):
+    faculty = login(api, 'faculty', 'Prabhu', 'prabhu12')
+
+    def broken(student_id):
+        raise ValueError("bug")
+    monkeypatch.setattr(api.dm, 'get_courses_for_student', broken)
+    assert api('GET', '/students/Harshit/courses', token=faculty) == (500, {"error": "Internal server error."})
+
+    path = '/students/Harshit/courses/CS101/projects/%C2%B2/status'  # "²" passes str.isdigit()
+    assert api('PUT', path, {"status": "graded"}, token=faculty)[0] == 404
+
+
+def test_malformed_json_bodies(api):
+    with socket.create_connection(('127.0.0.1', api.port), timeout=10) as sock:
+        sock.sendall(b"POST /login HTTP/1.1\r\nContent-Length: 5\r\nConnection: close\r\n\r\n{nope")
+        response = sock.makefile('rb').read()
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert response.endswith(b'{"error":"Request body is not valid JSON."}')
+
+
+def test_a_stalled_body_closes_the_connection(api, monkeypatch):
+    monkeypatch.setattr(api_server, 'BODY_TIMEOUT', 0.2)
+    with socket.create_connection(('127.0.0.1', api.port), timeout=10) as sock:
+        sock.sendall(b"POST /login HTTP/1.1\r\nContent-Length: 100\r\n\r\n{")
+        assert sock.recv(1024) == b""
+
+
+def test_mutations_and_batches(api):
+    faculty = login(api, 'faculty', 'Prabhu', 'prabhu12')
+    assert api('PUT', '/students/Harshit/courses/CS101/attendance', {"attendance": 90.0}, token=faculty)[0] == 200
+    assert api('POST', '/courses/CS101/marks', {"subject": "Quiz", "marks": {"Harshit": 8, "SHILAJIT": 6}},
+               token=faculty)[0] == 200
+
+    status, body = api('POST', '/batch', {"requests": [
+        {"method": "GET", "path": "/students/Harshit/courses/CS101"},
+        {"method": "POST", "path": "/batch", "body": {"requests": []}},
+    ]}, token=faculty)
+    assert status == 200
+    first, nested = body['results']
+    assert first['status'] == 200
+    assert first['body']['attendance'] == 90
+    assert first['body']['marks']['Quiz'] == 8
+    assert nested['status'] == 400
+    assert api.dm.get_marks('SHILAJIT', 'CS101') == {'Quiz': 6}
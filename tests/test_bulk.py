@@ -0,0 +1,69 @@
+# tests/test_bulk.py
+
+import pytest
+
+
+@pytest.fixture
+def saves(open_dm, monkeypatch):
+    """A DataManager without a journal that records each whole-file save.
+
+    Saving a sample student with a legacy per-student project list also
+    saves the course the project moves to, so tests count student_data saves.
+    """
+    dm = open_dm()
+    dm.saves = []
+    save_store = dm._save_store
+    monkeypatch.setattr(dm, '_save_store', lambda store: (dm.saves.append(store), save_store(store)))
+    return dm
+
+
+def test_set_attendance_bulk_saves_once(saves, open_dm):
+    dm = saves
+    ok, message = dm.set_attendance_bulk('CS101', {'Harshit': 80, 'SHILAJIT': '75.0', 'sakcham': 60})
+    assert ok and message == "Attendance saved for 3 students in CS101."
+    assert dm.saves.count('student_data') == 1
+
+    dm.saves.clear()
+    assert not dm.set_attendance_bulk('CS101', {'Harshit': 90, 'Shourya': 50})[0]  # Nothing is half-applied
+    assert dm.saves == []
+
+    dm = open_dm()
+    assert [dm.get_attendance(s, 'CS101') for s in ('Harshit', 'SHILAJIT', 'sakcham')] == [80, 75, 60]
+
+
+def test_add_marks_bulk_saves_once_per_store(saves, open_dm):
+    dm = saves
+    ok, _ = dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 7, 'SHILAJIT': 9.5})
+    assert ok
+    assert dm.saves.count('student_data') == 1
+    assert 'courses' in dm.saves  # The new assessment's definition
+
+    dm.saves.clear()
+    assert not dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 8, 'sakcham': 'x'})[0]
+    assert dm.saves == []
+
+    dm = open_dm()
+    assert dm.get_marks('Harshit', 'CS101')['Quiz'] == 7
+    assert dm.get_marks('SHILAJIT', 'CS101') == {'Quiz': 9.5}
+    assert 'Quiz' in dm.get_assessments('CS101')
+
+
+def test_enroll_students_saves_once(saves, open_dm):
+    dm = saves
+    ok, message = dm.enroll_students('CHEM101', ['Harshit', 'Shourya', 'sakcham'])
+    assert ok and message == "2 enrollments added for 2 students."
+    assert dm.saves.count('student_data') == 1
+
+    dm = open_dm()
+    assert sorted(dm.get_students_in_course('CHEM101')) == ['Harshit', 'SHILAJIT', 'Shourya', 'sakcham']
+
+
+def test_bulk_writes_append_one_journal_batch(data_dir, open_dm, monkeypatch):
+    dm = open_dm(journal_file=str(data_dir / 'journal.log'))
+    batches = []
+    append = dm._append_journal
+    monkeypatch.setattr(dm, '_append_journal', lambda records: (batches.append(records), append(records)))
+    assert dm.set_attendance_bulk('CS101', {'Harshit': 80, 'SHILAJIT': 75})[0]
+    assert dm.enroll_students('CHEM101', ['Harshit', 'Shourya'])[0]
+    students = [[r for r in records if r[0] == 'student_data'] for records in batches]
+    assert [len(records) for records in students if records] == [2, 2]
@@ -0,0 +1,53 @@
+# tests/test_durable_io.py
+
+import os
+import logging
+
+import pytest
+
+from app import durable_io
+from app.durable_io import atomic_write, FsyncBatcher
+from app.journal import Journal
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'data.json')
+    atomic_write(path, '{"a": 1}')
+    atomic_write(path, b'{"a": 2}')
+    assert open(path).read() == '{"a": 2}'
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_journal_appends_are_fsynced_in_batches(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(durable_io.os, 'fsync', lambda fd: synced.append(fd))
+    batcher = FsyncBatcher(every=3)
+    journal = Journal(str(tmp_path / 'journal.log'), batcher)
+    for i in range(5):
+        journal.append([('courses', ('CS101',), {"name": str(i)}, False)])
+    # One fsync for the third append, covering the first two as well
+    assert len(synced) == 3  # The append's descriptor, then the file and its directory
+    batcher.sync_pending()
+    assert len(synced) == 5
+
+
+def test_files_are_fsynced_through_a_writable_descriptor(tmp_path, monkeypatch):
+    fcntl = pytest.importorskip('fcntl')
+    modes = []
+    monkeypatch.setattr(durable_io.os, 'fsync',
+                        lambda fd: modes.append(fcntl.fcntl(fd, fcntl.F_GETFL) & os.O_ACCMODE))
+    path = tmp_path / 'journal.log'
+    path.write_text('x\n')
+    durable_io._fsync_path(str(path))
+    assert modes == [os.O_RDWR]  # Windows rejects fsync on read-only descriptors
+
+
+def test_a_failed_fsync_is_logged(tmp_path, monkeypatch, caplog):
+    def fail(fd):
+        raise OSError(9, "Bad file descriptor")
+    monkeypatch.setattr(durable_io.os, 'fsync', fail)
+    path = tmp_path / 'journal.log'
+    path.write_text('x\n')
+    with caplog.at_level(logging.WARNING, logger='app.durable_io'):
+        durable_io._fsync_path(str(path))
+    assert 'fsync of' in caplog.text
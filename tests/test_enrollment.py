@@ -0,0 +1,35 @@
+# tests/test_enrollment.py
+
+
+def test_writes_never_enroll_implicitly(open_dm):
+    dm = open_dm()
+    assert not dm.add_student_mark('Shourya', 'NOPE', 'Quiz', 5)[0]
+    assert not dm.set_attendance('Shourya', 'CS101', 50)[0]
+    assert not dm.add_marks_bulk('CHEM101', 'Quiz', {'Harshit': 5})[0]
+    assert not dm.set_attendance_bulk('CS101', {'Shourya': 50})[0]
+    assert dm.get_courses_for_student('Shourya') == ['MATH201']
+    assert 'Shourya' not in dm.get_students_in_course('CS101')
+
+
+def test_cohorts_enroll_and_drop_with_one_flush(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    assert not dm.enroll_cohort(['Shourya'], ['NOPE'])[0]
+    assert not dm.enroll_cohort(['Nobody'], ['CS101'])[0]
+
+    ok, message = dm.enroll_cohort(['Shourya', 'Harshit'], ['CS101', 'CHEM101'])
+    assert ok and message == "3 enrollments added for 2 students."
+    assert dm.get_courses_for_student('Shourya') == ['MATH201', 'CS101', 'CHEM101']
+    assert dm.set_attendance('Shourya', 'CS101', 50)[0]
+
+    ok, message = dm.drop_cohort(['Shourya'], ['CS101', 'CHEM101', 'PHYS101'])
+    assert ok and message == "2 enrollments dropped for 1 students."
+    assert dm.get_courses_for_student('Shourya') == ['MATH201']
+    dm.close()
+
+    # Recorded attendance survives the drop and reappears on re-enrollment
+    dm = open_dm(journal_file=journal_file)
+    assert 'Shourya' not in dm.get_students_in_course('CS101')
+    assert dm.enroll_student('Shourya', 'CS101')[0]
+    assert dm.get_attendance('Shourya', 'CS101') == 50
+    assert 'CHEM101' not in dm.student_data['students']['Shourya']['course_data']
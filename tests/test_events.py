@@ -0,0 +1,59 @@
+# tests/test_events.py
+
+import threading
+
+from app.events import EVERYTHING, ChangeEvent, EventBus
+
+
+def test_batches_coalesce_events():
+    bus = EventBus()
+    received = []
+    unsubscribe = bus.subscribe(received.append)
+    with bus.batch():
+        bus.emit('S1', 'CS101', 'marks')
+        with bus.batch():
+            bus.emit('S1', 'CS101', 'marks')
+            bus.emit(None, 'CS101', 'projects')
+        assert received == []
+    assert received == [[ChangeEvent('S1', 'CS101', 'marks'), ChangeEvent(None, 'CS101', 'projects')]]
+
+    with bus.batch():
+        bus.emit('S1')
+        bus.emit()
+    assert received[-1] == [EVERYTHING]
+
+    unsubscribe()
+    bus.emit('S2')
+    assert len(received) == 2
+
+
+def test_batches_are_per_thread():
+    bus = EventBus()
+    received = []
+    bus.subscribe(lambda events: received.append((threading.current_thread().name, events)))
+    with bus.batch():
+        bus.emit('S1')
+        worker = threading.Thread(target=bus.emit, args=('S2',), name='worker')
+        worker.start()
+        worker.join()
+        assert received == [('worker', [ChangeEvent('S2', None, None)])]
+    assert received[-1] == (threading.current_thread().name, [ChangeEvent('S1', None, None)])
+
+
+def test_subscribers_run_after_the_lock_is_released(open_dm):
+    dm = open_dm()
+    held = []
+    dm.subscribe(lambda events: held.append(dm.lock._is_owned()))
+    assert dm.enroll_cohort(['Shourya'], ['CS101', 'CHEM101'])[0]
+    assert dm.set_attendance('Shourya', 'CS101', 50)[0]
+    assert held == [False, False]
+
+
+def test_a_deferred_load_reports_everything(open_dm):
+    dm = open_dm(defer_loading=True)
+    received = []
+    dm.subscribe(lambda events: received.append((dm.lock._is_owned(), events)))
+    loader = threading.Thread(target=dm.load)
+    loader.start()
+    loader.join()
+    assert received == [(False, [EVERYTHING])]
@@ -0,0 +1,59 @@
+# tests/test_exam_scheduler.py
+
+import pytest
+
+from app import exam_scheduler
+
+
+def test_conflict_graph_counts_shared_students():
+    graph = exam_scheduler.conflict_graph({"A": ["s1", "s2", "s3"], "B": ["s1", "s2"], "C": ["s3"], "D": []})
+    assert graph == {"A": {"B": 2, "C": 1}, "B": {"A": 2}, "C": {"A": 1}, "D": {}}
+
+
+def test_assign_slots_avoids_clashes_when_it_can():
+    graph = exam_scheduler.conflict_graph({"A": ["s1", "s2"], "B": ["s1"], "C": ["s2"], "D": ["s3"]})
+    assignment, stats = exam_scheduler.assign_slots(graph, 2)
+    assert stats == {"conflicts": 0, "over_capacity": []}
+    assert assignment["A"] != assignment["B"] and assignment["A"] != assignment["C"]
+
+    # A triangle in two slots: the lightest edge is the one left clashing
+    graph = exam_scheduler.conflict_graph({"A": ["s1", "s2", "s3"], "B": ["s1", "s2", "s4"], "C": ["s3", "s4"]})
+    assignment, stats = exam_scheduler.assign_slots(graph, 2)
+    assert stats["conflicts"] == 1
+    with pytest.raises(ValueError):
+        exam_scheduler.assign_slots(graph, 0)
+
+
+def test_assign_slots_respects_capacity():
+    graph = exam_scheduler.conflict_graph({"A": ["s1"], "B": ["s2"], "C": ["s3"]})
+    assignment, stats = exam_scheduler.assign_slots(graph, 2, sizes={"A": 1, "B": 1, "C": 1}, capacity=2)
+    assert sorted(assignment.values()).count(0) <= 2 and not stats["over_capacity"]
+
+    assignment, stats = exam_scheduler.assign_slots(graph, 1, sizes={"A": 1, "B": 1, "C": 1}, capacity=2)
+    assert stats["over_capacity"] == [0]
+
+
+def test_student_clashes():
+    exams = [{"date": "1 May", "time": "9:00"}, {"date": "1 May", "time": "9:00"}, {"date": "2 May", "time": "9:00"}]
+    assert exam_scheduler.student_clashes(exams) == {("1 May", "9:00")}
+
+
+def test_schedule_exams(open_dm):
+    dm = open_dm()
+    assert not dm.schedule_exams([])[0]
+    assert not dm.schedule_exams([("1 May", "9:00")], course_ids=['NOPE'])[0]
+
+    slots = [("1 May", "9:00"), ("2 May", "9:00"), ("3 May", "9:00"), ("4 May", "9:00")]
+    ok, message = dm.schedule_exams(slots)
+    assert ok and '0 student clashes' in message
+    exams = dm.get_student_exams('sakcham')
+    linked = [e for e in exams if e.get('course_id')]
+    assert len(linked) == 4 and not any(e['clash'] for e in exams)
+    assert sum(1 for e in dm.get_student_exams('Shourya') if e.get('course_id')) == 1
+
+    # Rescheduling replaces the course-linked exams and keeps the others
+    ok, message = dm.schedule_exams(slots[:1], course_ids=['CS101', 'PHYS101'])
+    assert ok and '2 student clashes' in message
+    assert len(dm.get_exam_schedule()) == 3 + 4
+    clashing = {e['course_id'] for e in dm.get_student_exams('Harshit') if e['clash']}
+    assert clashing == {'CS101', 'PHYS101'}
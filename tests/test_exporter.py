@@ -0,0 +1,61 @@
+# tests/test_exporter.py
+
+import csv
+import json
+import shutil
+
+import pytest
+
+from app import exporter, export_cli
+from conftest import DATA_FILES, ROOT
+
+
+def test_gradebook_has_a_column_per_assessment(data_dir, open_dm, tmp_path):
+    dm = open_dm()
+    assert dm.define_assessment('CS101', 'Quiz', 10, 2)[0]
+    assert dm.add_student_mark('SHILAJIT', 'CS101', 'Quiz', 5)[0]
+
+    path = tmp_path / 'cs101.csv'
+    assert exporter.export_gradebook(dm, 'CS101', str(path))[0]
+    rows = list(csv.DictReader(open(path)))
+    assert [row['student_id'] for row in rows] == ['Harshit', 'SHILAJIT', 'sakcham']
+    assert rows[1]['Quiz'] == '5'
+    assert rows[1]['weighted_total'] == '50.0'
+    assert not exporter.export_gradebook(dm, 'NOPE', str(path))[0]
+
+
+def test_attendance_report_filters_by_threshold(open_dm, tmp_path):
+    dm = open_dm()
+    path = tmp_path / 'shortfall.jsonl'
+    assert exporter.export_attendance(dm, str(path), 'jsonl', below=80)[0]
+    rows = [json.loads(line) for line in open(path)]
+    assert rows == [{'student_id': 'Harshit', 'course_id': 'CS101',
+                     'course_name': 'Intro to Python', 'attendance': 67}]
+
+
+def test_a_read_only_view_never_writes(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    dm.set_attendance('Harshit', 'CS101', 42)
+    with open(journal_file, 'a') as j:
+        j.write('{"s":"student_data","k":["students"')  # Another process mid-append
+    before = {name: (data_dir / name).read_bytes() for name in DATA_FILES + ('journal.log',)}
+
+    view = open_dm(journal_file=journal_file, read_only=True)
+    assert view.get_attendance('Harshit', 'CS101') == 42
+    with pytest.raises(RuntimeError):
+        view.set_attendance('Harshit', 'CS101', 43)
+    view.close()
+    assert {name: (data_dir / name).read_bytes() for name in before} == before
+
+
+def test_export_cli_reads_the_data_directory(tmp_path, monkeypatch):
+    (tmp_path / 'data').mkdir()
+    for name in DATA_FILES:
+        shutil.copy(f"{ROOT}/{name}", tmp_path / 'data' / name)
+    monkeypatch.chdir(tmp_path)
+
+    assert export_cli.main(['gradebook', 'CS101', '-o', 'out.csv']) == 0
+    assert next(csv.reader(open(tmp_path / 'out.csv')))[:2] == ['student_id', 'attendance']
+    assert export_cli.main(['gradebook', 'NOPE', '-o', 'out.csv']) == 1
+    assert not (tmp_path / 'data' / 'journal.log').exists()
@@ -0,0 +1,25 @@
+# tests/test_faculty_index.py
+
+import pytest
+
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_faculty_courses_follow_reassignment_and_deletion(data_dir, open_dm, journal):
+    kwargs = {'journal_file': str(data_dir / 'journal.log')} if journal else {}
+    dm = open_dm(**kwargs)
+    assert dm.get_courses_for_faculty('Prabhu') == {'CS101': 'Intro to Python', 'PHYS101': 'Basic Engineering'}
+
+    assert dm.add_user('faculty', 'Neo', 'neo12', courses=['CS101', 'NOPE'])[0]
+    assert dm.get_courses_for_faculty('Neo') == {'CS101': 'Intro to Python'}
+    assert dm.get_courses_for_faculty('Prabhu') == {'PHYS101': 'Basic Engineering'}
+
+    assert dm.delete_user('faculty', 'Prabhu')[0]
+    assert dm.get_courses_for_faculty('Prabhu') == {}
+    assert dm.courses['PHYS101']['faculty'] is None
+    assert not dm.journal or dm.journal.pending  # The reopen below replays it
+
+    # Rebuilt from the saved courses (or the journal) on the next start
+    dm = open_dm(**kwargs)
+    assert dm.get_courses_for_faculty('Neo') == {'CS101': 'Intro to Python'}
+    assert dm.get_courses_for_faculty('Prabhu') == {}
+    assert dm.get_courses_for_faculty('Sukanta') == {'MATH201': 'Calculus I'}
@@ -0,0 +1,59 @@
+# tests/test_importer.py
+
+import threading
+
+from app import importer
+
+
+def write_csv(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_users_are_imported_and_bad_rows_reported(open_dm, tmp_path):
+    dm = open_dm()
+    path = write_csv(tmp_path / 'users.csv',
+                     "role,user_id,password,courses\n"
+                     "student,Newbie,pw,CS101;MATH201\n"
+                     "faculty,Prof,pw,CHEM101\n"
+                     "student,Harshit,pw,\n"
+                     "wizard,Merlin,pw,\n"
+                     "student,Lost,pw,NOPE\n")
+
+    assert importer.import_users(dm, path, dry_run=True)[0] == 2
+    assert 'Newbie' not in dm.credentials['student']
+
+    count, errors = importer.import_users(dm, path, batch_size=1)
+    assert count == 2
+    assert len(errors) == 3
+    assert dm.validate_login('student', 'Newbie', 'pw')
+    assert dm.get_courses_for_student('Newbie') == ['CS101', 'MATH201']
+    assert dm.courses['CHEM101']['faculty'] == 'Prof'
+
+
+def test_grades_are_imported(open_dm, tmp_path):
+    dm = open_dm()
+    path = write_csv(tmp_path / 'grades.csv',
+                     "student_id,course_id,assessment,mark,attendance\n"
+                     "Harshit,CS101,Quiz,7,90\n"
+                     "Shourya,CS101,Quiz,7,\n"
+                     "Harshit,PHYS101,,,101\n")
+    count, errors = importer.import_grades(dm, path)
+    assert count == 1 and len(errors) == 2
+    assert dm.get_marks('Harshit', 'CS101')['Quiz'] == 7
+    assert dm.get_attendance('Harshit', 'CS101') == 90
+
+
+def test_sqlite_imports_parse_on_a_worker_and_write_on_the_owning_thread(data_dir, open_dm, tmp_path):
+    dm = open_dm(db_file=str(data_dir / 'portal.db'))
+    path = write_csv(tmp_path / 'users.csv', "role,user_id,password\nstudent,Newbie,pw\nadmin,Boss,pw\n")
+    batches, errors = [], []
+    worker = threading.Thread(target=lambda: batches.extend(importer.user_batches(dm, path, errors)))
+    worker.start()
+    worker.join()
+
+    assert sum(importer.commit(batch, errors) for batch in batches) == 2
+    assert errors == []
+    dm.close()
+    dm = open_dm(db_file=str(data_dir / 'portal.db'))
+    assert dm.validate_login('admin', 'Boss', 'pw')
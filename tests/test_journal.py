@@ -0,0 +1,81 @@
+# tests/test_journal.py
+
+import json
+
+from app.journal import Journal
+from app import serializers
+
+
+def test_replay_returns_appended_records_in_order(tmp_path):
+    journal = Journal(str(tmp_path / 'journal.log'))
+    journal.append([('courses', ('CS101',), {"name": "Python"}, False)])
+    journal.append([('credentials', ('student', 'Harshit'), None, True),
+                    ('courses', ('CS101',), {"name": "Python 2"}, False)])
+
+    records, clean = Journal(journal.path).replay()
+    assert clean
+    assert records == [('courses', ('CS101',), {"name": "Python"}, False),
+                       ('credentials', ('student', 'Harshit'), None, True),
+                       ('courses', ('CS101',), {"name": "Python 2"}, False)]
+
+
+def test_replay_stops_at_a_torn_line(tmp_path):
+    journal = Journal(str(tmp_path / 'journal.log'))
+    journal.append([('courses', ('CS101',), {"name": "Python"}, False)])
+    with open(journal.path, 'a') as j:
+        j.write('{"s":"courses","k":["MATH')
+
+    records, clean = Journal(journal.path).replay()
+    assert not clean
+    assert records == [('courses', ('CS101',), {"name": "Python"}, False)]
+
+
+def test_changes_survive_a_restart_through_the_journal(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    assert dm.set_attendance('Harshit', 'CS101', 91)[0]
+    assert dm.add_student_mark('Harshit', 'CS101', 'Quiz', 7)[0]
+
+    # Not compacted yet: the snapshot still has the old value
+    snapshot = serializers.load(str(data_dir / 'student_data.json'))
+    assert snapshot['students']['Harshit']['course_data']['CS101']['attendance'] == 67
+
+    reopened = open_dm(journal_file=journal_file)
+    assert reopened.get_attendance('Harshit', 'CS101') == 91
+    assert reopened.get_marks('Harshit', 'CS101')['Quiz'] == 7
+
+
+def test_compaction_folds_the_journal_into_the_snapshots(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file, compact_every=5)
+    for percent in range(12):
+        dm.set_attendance('Harshit', 'CS101', percent)
+
+    # The journal never grows past compact_every records
+    assert sum(1 for _ in open(journal_file)) < 5
+    snapshot = serializers.load(str(data_dir / 'student_data.json'))
+    assert snapshot['students']['Harshit']['course_data']['CS101']['attendance'] != 67
+    dm.close()
+    assert open(journal_file).read() == ""
+    snapshot = serializers.load(str(data_dir / 'student_data.json'))
+    assert snapshot['students']['Harshit']['course_data']['CS101']['attendance'] == 11
+
+
+def test_a_torn_journal_is_compacted_on_load(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    dm.set_attendance('Harshit', 'CS101', 42)
+    dm.close()
+    with open(journal_file, 'a') as j:
+        j.write('{"s":"student_data","k":["students"')
+
+    dm = open_dm(journal_file=journal_file)
+    assert dm.get_attendance('Harshit', 'CS101') == 42
+    assert open(journal_file).read() == ""
+
+    # New records must not land after the torn line
+    dm.set_attendance('Harshit', 'CS101', 43)
+    dm.close()
+    lines = open(journal_file).read().splitlines()
+    assert all(json.loads(line) for line in lines)
+    assert open_dm(journal_file=journal_file).get_attendance('Harshit', 'CS101') == 43
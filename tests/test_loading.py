@@ -0,0 +1,58 @@
+# tests/test_loading.py
+
+import pytest
+
+from app import serializers
+
+
+def test_mutations_finish_a_deferred_load_first(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file, defer_loading=True)
+    assert not dm.loaded.is_set()
+    assert dm.delete_user('student', 'Harshit')[0]
+    assert dm.loaded.is_set()
+    dm.close()
+
+    dm = open_dm(journal_file=journal_file)
+    assert 'Harshit' not in dm.credentials['student']
+    assert 'Harshit' not in dm.get_students_in_course('CS101')
+
+
+def test_a_failed_load_never_overwrites_the_data(data_dir, open_dm, monkeypatch):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    assert dm.set_attendance('Harshit', 'CS101', 42)[0]  # Left in the journal
+
+    student_file = data_dir / 'student_data.json'
+    student_file.write_bytes(serializers.MSGPACK_MAGIC + b'\x80')
+    monkeypatch.setattr(serializers, 'msgpack', None)
+    before = {path.name: path.read_bytes() for path in data_dir.iterdir()}
+
+    dm = open_dm(journal_file=journal_file, defer_loading=True)
+    for _ in range(2):
+        with pytest.raises(serializers.UnsupportedFormatError):
+            dm.load()
+        assert not dm.loaded.is_set()
+    with pytest.raises(serializers.UnsupportedFormatError):
+        dm.set_attendance('Harshit', 'CS101', 43)
+    with pytest.raises(RuntimeError):
+        dm.compact()
+    dm.close()
+    assert {path.name: path.read_bytes() for path in data_dir.iterdir()} == before
+
+
+def test_a_failed_load_can_be_retried(data_dir, open_dm, monkeypatch):
+    student_file = data_dir / 'student_data.json'
+    good = student_file.read_bytes()
+    student_file.write_bytes(serializers.MSGPACK_MAGIC + b'\x80')
+    monkeypatch.setattr(serializers, 'msgpack', None)
+
+    dm = open_dm(journal_file=str(data_dir / 'journal.log'), defer_loading=True)
+    with pytest.raises(serializers.UnsupportedFormatError):
+        dm.load()
+
+    student_file.write_bytes(good)  # e.g. msgpack installed, or the file restored
+    dm.load()
+    assert dm.loaded.is_set()
+    assert dm.get_attendance('Harshit', 'CS101') == 67
+    assert dm.set_attendance('Harshit', 'CS101', 70)[0]
@@ -0,0 +1,56 @@
+# tests/test_marks.py
+
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize('raw, expected', [('7', 7), (' 7.5 ', 7.5), (10, 10), ('100.0', 100), (0, 0)])
+def test_parse_mark_accepts_numbers_in_range(open_dm, raw, expected):
+    score, error = open_dm().parse_mark(raw)
+    assert error is None and score == expected and type(score) is type(expected)
+
+
+@pytest.mark.parametrize('raw', ['abc', '', None, [5], 10 ** 400])
+def test_parse_mark_rejects_non_numbers(open_dm, raw):
+    assert open_dm().parse_mark(raw) == (None, "Mark must be a valid number.")
+
+
+@pytest.mark.parametrize('raw', ['nan', 'inf', -1, '100.5'])
+def test_parse_mark_rejects_out_of_range_marks(open_dm, raw):
+    assert open_dm().parse_mark(raw) == (None, "Mark must be between 0 and 100.")
+
+
+def test_parse_mark_uses_the_assessment_maximum(open_dm):
+    dm = open_dm()
+    assert dm.parse_mark('5', 4) == (None, "Mark must be between 0 and 4.")
+    assert dm.define_assessment('CS101', 'Quiz', 10)[0]
+    assert not dm.add_student_mark('Harshit', 'CS101', 'Quiz', 11)[0]
+    assert dm.add_student_mark('Harshit', 'CS101', 'Quiz', '9.5')[0]
+    assert dm.get_marks('Harshit', 'CS101')['Quiz'] == 9.5
+
+
+def test_legacy_string_marks_become_numbers_when_rewritten(data_dir, open_dm):
+    dm = open_dm()
+    assert dm.get_marks('Harshit', 'CS101') == {'Problem solving using Python': '16.7'}
+    assert dm.weighted_total('Harshit', 'CS101') == 16.7  # Read as numbers before any rewrite
+
+    assert dm.set_attendance('Harshit', 'CS101', 70)[0]
+    saved = json.loads((data_dir / 'student_data.json').read_text())['students']['Harshit']['course_data']
+    assert saved['CS101']['marks'] == {'Problem solving using Python': 16.7}
+    assert saved['PHYS101']['marks'] == {'Lab 1': '95'}  # Not rewritten yet
+
+
+def test_define_assessment_keeps_existing_marks_in_range(open_dm):
+    dm = open_dm()
+    assert dm.add_marks_bulk('CS101', 'Midterm', {'Harshit': 80, 'SHILAJIT': 45})[0]
+    ok, message = dm.define_assessment('CS101', 'Midterm', 50)
+    assert not ok and message == "Existing marks for 'Midterm' go up to 80."
+    assert dm.max_score('CS101', 'Midterm') == 100
+
+    assert dm.define_assessment('CS101', 'Midterm', '80', '2.5')[0]
+    assert dm.get_assessments('CS101')['Midterm'] == {"max": 80, "weight": 2.5}
+    assert not dm.define_assessment('CS101', 'Midterm', 0)[0]
+    assert not dm.define_assessment('CS101', 'Midterm', 'x')[0]
+    assert not dm.define_assessment('CS101', 'Midterm', 90, -1)[0]
+    assert not dm.define_assessment('NOPE', 'Midterm', 90)[0]
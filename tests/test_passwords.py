@@ -0,0 +1,64 @@
+# tests/test_passwords.py
+
+import threading
+
+from app.passwords import hash_password, is_hashed, verify_password, VerifiedCache
+
+
+def test_hashes_verify_and_upgrade():
+    stored = hash_password('secret', 1000)
+    assert is_hashed(stored) and 'secret' not in stored
+    assert verify_password('secret', stored, 1000) == (True, False)
+    assert verify_password('wrong', stored, 1000) == (False, False)
+    assert verify_password('secret', stored, 2000) == (True, True)  # Fewer iterations than wanted
+    assert verify_password('secret', 'secret') == (True, True)  # Legacy plaintext
+    assert verify_password('secret', 'pbkdf2_sha256$broken') == (False, False)
+
+
+def test_the_cache_forgets_changed_hashes_and_expired_entries():
+    cache = VerifiedCache(ttl=300)
+    cache.add('student', 'Harshit', 'pw', 'hash1')
+    assert cache.check('student', 'Harshit', 'pw', 'hash1')
+    assert not cache.check('student', 'Harshit', 'other', 'hash1')
+    assert not cache.check('student', 'Harshit', 'pw', 'hash2')  # Password was reset
+    assert not cache.check('student', 'Harshit', 'pw', 'hash1')
+
+    expired = VerifiedCache(ttl=-1)
+    expired.add('student', 'Harshit', 'pw', 'hash1')
+    assert not expired.check('student', 'Harshit', 'pw', 'hash1')
+
+
+def test_concurrent_checks_of_an_expired_entry():
+    cache = VerifiedCache(ttl=-1)
+    failures = []
+
+    def check():
+        try:
+            for _ in range(2000):
+                cache.add('student', 'Harshit', 'pw', 'hash')
+                cache.check('student', 'Harshit', 'pw', 'hash')
+        except Exception as e:
+            failures.append(e)
+
+    threads = [threading.Thread(target=check) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert failures == []
+
+
+def test_plaintext_passwords_are_hashed_on_load(data_dir, open_dm):
+    dm = open_dm()
+    assert all(is_hashed(stored) for users in dm.credentials.values() for stored in users.values())
+    assert 'harshit12' not in (data_dir / 'credentials.json').read_text()
+    assert dm.validate_login('student', 'Harshit', 'harshit12')
+    assert not dm.validate_login('student', 'Harshit', 'wrong')
+
+
+def test_a_reset_password_invalidates_the_login_cache(open_dm):
+    dm = open_dm()
+    assert dm.validate_login('student', 'Harshit', 'harshit12')
+    assert dm.reset_password('student', 'Harshit', 'new')[0]
+    assert not dm.validate_login('student', 'Harshit', 'harshit12')
+    assert dm.validate_login('student', 'Harshit', 'new')
@@ -0,0 +1,54 @@
+# tests/test_projects.py
+
+
+def test_projects_are_defined_once_per_course(open_dm):
+    dm = open_dm()
+    assert dm.add_project('CS101', 'Parser', '1 May')[0]
+    project = dm.get_course_projects('CS101')[-1]
+    assert dm.set_project_status('Harshit', 'CS101', project['id'], 'submitted')[0]
+    assert not dm.set_project_status('Shourya', 'CS101', project['id'], 'submitted')[0]
+    assert not dm.set_project_status('Harshit', 'CS101', project['id'], 'lost')[0]
+
+    statuses = {p['title']: p['status'] for p in dm.get_projects('Harshit', 'CS101')}
+    assert statuses['Parser'] == 'submitted'
+    assert {p['title']: p['status'] for p in dm.get_projects('SHILAJIT', 'CS101')}['Parser'] == 'assigned'
+
+
+def test_deleted_project_ids_are_never_reused(data_dir, open_dm):
+    dm = open_dm()
+    assert dm.add_project('PHYS101', 'Lab 1', '1 May')[0]
+    assert dm.add_project('PHYS101', 'Lab 2', '8 May')[0]
+    first, second = dm.get_course_projects('PHYS101')
+    assert dm.set_project_status('Harshit', 'PHYS101', second['id'], 'graded')[0]
+    assert dm.delete_project('PHYS101', second['id'])[0]
+    dm.close()
+
+    dm = open_dm()
+    assert dm.add_project('PHYS101', 'Lab 3', '15 May')[0]
+    third = dm.get_course_projects('PHYS101')[-1]
+    assert third['id'] not in (first['id'], second['id'])
+    assert {p['title']: p['status'] for p in dm.get_projects('Harshit', 'PHYS101')}['Lab 3'] == 'assigned'
+
+
+def test_deleting_from_a_file_without_the_counter(open_dm):
+    dm = open_dm()
+    assert dm.add_project('PHYS101', 'Lab 1', '1 May')[0]
+    project = dm.get_course_projects('PHYS101')[0]
+    del dm.courses['PHYS101']['next_project_id']  # As written by older versions
+    assert dm.delete_project('PHYS101', project['id'])[0]
+    assert dm.add_project('PHYS101', 'Lab 2', '8 May')[0]
+    assert dm.get_course_projects('PHYS101')[0]['id'] != project['id']
+
+
+def test_bulk_writes_keep_every_student_with_a_tiny_cache(data_dir, open_dm):
+    # Adopting legacy projects saves courses mid-write; that must not evict
+    # students the bulk write has not saved yet
+    db_file = str(data_dir / 'portal.db')
+    dm = open_dm(db_file=db_file, max_loaded_students=1)
+    assert dm.record_grades_bulk([('Shourya', 'MATH201', None, None, 41),
+                                  ('Harshit', 'CS101', None, None, 42)])[0]
+    dm.close()
+
+    dm = open_dm(db_file=db_file, max_loaded_students=1)
+    assert dm.get_attendance('Shourya', 'MATH201') == 41
+    assert dm.get_attendance('Harshit', 'CS101') == 42
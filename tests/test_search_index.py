@@ -0,0 +1,35 @@
+# tests/test_search_index.py
+
+from app.search_index import SearchIndex
+
+
+def test_prefix_matches_come_before_substring_matches():
+    index = SearchIndex(["bob", "Alice", "malice", "alfred", "Zed"])
+    assert index.search("") == ["alfred", "Alice", "bob", "malice", "Zed"]
+    assert index.search("AL") == ["alfred", "Alice", "malice"]
+    assert index.search("lic") == ["Alice", "malice"]
+    assert index.search("al", limit=1) == ["alfred"]
+    assert index.search("e", limit=2) == ["alfred", "Alice"]
+    assert index.search("q") == []
+
+
+def test_add_and_remove_keep_the_index_current():
+    index = SearchIndex(["carol"])
+    assert index.search("ar") == ["carol"]
+    index.add("Barbara")
+    index.add("Barbara")
+    assert len(index) == 2 and "Barbara" in index
+    assert index.search("ar") == ["Barbara", "carol"]
+    index.remove("carol")
+    index.remove("nobody")
+    assert "carol" not in index
+    assert index.search("ar") == ["Barbara"]
+
+
+def test_user_search_follows_adds_and_deletes(open_dm):
+    dm = open_dm()
+    assert dm.search_users('student', 'sh') == ['SHILAJIT', 'Shourya', 'Harshit']
+    assert dm.add_user('student', 'Ashish', 'pw12')[0]
+    assert dm.delete_user('student', 'Shourya')[0]
+    assert dm.search_users('student', 'sh') == ['SHILAJIT', 'Ashish', 'Harshit']
+    assert dm.search_users('faculty', '') == ['Diddy', 'Prabhu', 'Sukanta']
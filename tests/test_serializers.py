@@ -0,0 +1,36 @@
+# tests/test_serializers.py
+
+import pytest
+
+from app import serializers
+
+DATA = {"students": {"Harshit": {"enrolled_courses": ["CS101"], "course_data": {}}}, "exam_schedule": []}
+
+
+@pytest.mark.parametrize('fmt', serializers.FORMATS)
+def test_every_format_round_trips(fmt):
+    assert serializers.loads(serializers.dumps(DATA, fmt)) == DATA
+
+
+def test_binary_falls_back_to_compact_json(monkeypatch):
+    monkeypatch.setattr(serializers, 'msgpack', None)
+    raw = serializers.dumps(DATA, 'binary')
+    assert raw == serializers.dumps(DATA, 'compact')
+    assert serializers.loads(raw) == DATA
+
+
+def test_msgpack_files_need_msgpack(monkeypatch):
+    monkeypatch.setattr(serializers, 'msgpack', None)
+    with pytest.raises(serializers.UnsupportedFormatError):
+        serializers.loads(serializers.MSGPACK_MAGIC + b"\x80")
+
+
+def test_garbage_is_corrupt():
+    with pytest.raises(serializers.CorruptDataError):
+        serializers.loads(b'{"students": ')
+
+
+def test_switching_formats_needs_no_migration(data_dir, open_dm):
+    dm = open_dm(file_format='binary')
+    assert dm.set_attendance('Harshit', 'CS101', 12)[0]
+    assert open_dm(file_format='json').get_attendance('Harshit', 'CS101') == 12
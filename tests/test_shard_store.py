@@ -0,0 +1,90 @@
+# tests/test_shard_store.py
+
+import os
+
+from app.shard_store import ShardStore, INDEX_FILE
+
+
+def test_write_and_reload(tmp_path):
+    store = ShardStore(str(tmp_path))
+    entry = {"enrolled_courses": ["CS101"], "course_data": {"CS101": {"attendance": 80}}}
+    store.write([('student_data', ('students', 'Harshit'), entry, False),
+                 ('student_data', ('students', 'Shourya'), {"enrolled_courses": [], "course_data": {}}, False),
+                 ('student_data', ('exam_schedule',), [{"subject": "Finals"}], False)])
+    store.write([('student_data', ('students', 'Shourya'), None, True)])
+
+    reopened = ShardStore(str(tmp_path))
+    assert reopened.student_ids() == ['Harshit']
+    assert reopened.load_student('Harshit') == entry
+    assert reopened.load_student('Shourya') is None
+    assert reopened.enrollments() == [('Harshit', 'CS101')]
+    assert reopened.load_exam_schedule() == [{"subject": "Finals"}]
+
+
+def test_a_corrupt_shard_is_quarantined(tmp_path):
+    store = ShardStore(str(tmp_path))
+    store.write([('student_data', ('students', 'Harshit'), {"enrolled_courses": [], "course_data": {}}, False)])
+    path = store._shard_path('Harshit')
+    with open(path, 'w') as f:
+        f.write('{not json')
+
+    assert store.load_student('Harshit') is None
+    assert not os.path.exists(path)
+    assert open(f"{path}.corrupt").read() == '{not json'
+
+
+def test_a_corrupt_index_is_rebuilt_from_the_shards(tmp_path):
+    store = ShardStore(str(tmp_path))
+    store.write([('student_data', ('students', 'Harshit'), {"enrolled_courses": ["CS101"], "course_data": {}}, False)])
+    with open(store.index_path, 'w') as f:
+        f.write('{not json')
+
+    reopened = ShardStore(str(tmp_path))
+    assert reopened.enrollments() == [('Harshit', 'CS101')]
+    assert os.path.exists(os.path.join(str(tmp_path), INDEX_FILE + '.corrupt'))
+    assert not reopened.is_empty()
+
+
+def test_student_data_round_trips_through_shards(data_dir, open_dm):
+    student_dir = str(data_dir / 'students')
+    from_json = open_dm()
+    dm = open_dm(student_dir=student_dir, max_loaded_students=1)
+    for student_id in from_json.student_data['students']:
+        assert dm.student_data['students'][student_id] == from_json.student_data['students'][student_id]
+
+    assert dm.record_grades_bulk([('Shourya', 'MATH201', 'Quiz', 5, 41),
+                                  ('Harshit', 'CS101', None, None, 42)])[0]
+    assert dm.enroll_student('Shourya', 'CS101')[0]
+    dm.close()
+
+    dm = open_dm(student_dir=student_dir, max_loaded_students=1)
+    assert dm.get_attendance('Shourya', 'MATH201') == 41
+    assert dm.get_marks('Shourya', 'MATH201')['Quiz'] == 5
+    assert dm.get_attendance('Harshit', 'CS101') == 42
+    assert 'Shourya' in dm.get_students_in_course('CS101')
+
+
+def test_uncompacted_journal_records_reach_the_shards(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    student_dir = str(data_dir / 'students')
+    dm = open_dm(journal_file=journal_file)
+    assert dm.set_attendance('Harshit', 'CS101', 99)[0]
+
+    dm = open_dm(journal_file=journal_file, student_dir=student_dir)
+    assert dm.get_attendance('Harshit', 'CS101') == 99
+    assert dm.set_attendance('SHILAJIT', 'CS101', 50)[0]
+    dm.close()
+
+    dm = open_dm(journal_file=journal_file, student_dir=student_dir)
+    assert dm.get_attendance('Harshit', 'CS101') == 99
+    assert dm.get_attendance('SHILAJIT', 'CS101') == 50
+
+
+def test_later_shard_writes_win_over_old_journal_records(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    student_dir = str(data_dir / 'students')
+    open_dm(journal_file=journal_file).set_attendance('Harshit', 'CS101', 99)
+
+    # Not closed, so the journal still holds the record from before sharding
+    open_dm(journal_file=journal_file, student_dir=student_dir).set_attendance('Harshit', 'CS101', 50)
+    assert open_dm(journal_file=journal_file, student_dir=student_dir).get_attendance('Harshit', 'CS101') == 50
@@ -0,0 +1,80 @@
+# tests/test_shared.py
+
+import os
+import shutil
+import threading
+
+import pytest
+
+from app.file_lock import FileLock
+from conftest import DATA_FILES, ROOT
+
+
+def test_the_file_lock_excludes_other_holders(tmp_path):
+    path = str(tmp_path / '.portal.lock')
+    first, second = FileLock(path), FileLock(path)
+    acquired = threading.Event()
+
+    def take():
+        with second:
+            acquired.set()
+
+    with first:
+        with first:  # Re-entrant
+            thread = threading.Thread(target=take)
+            thread.start()
+            assert not acquired.wait(0.2)
+    assert acquired.wait(5)
+    thread.join()
+
+
+@pytest.mark.parametrize('journal', [False, True])
+def test_two_portals_see_each_others_changes(data_dir, open_dm, journal):
+    kwargs = {'shared': True}
+    if journal:
+        kwargs['journal_file'] = str(data_dir / 'journal.log')
+    desk_a, desk_b = open_dm(**kwargs), open_dm(**kwargs)
+
+    assert desk_a.set_attendance('Harshit', 'CS101', 70)[0]
+    desk_b.refresh()
+    assert desk_b.get_attendance('Harshit', 'CS101') == 70
+
+    # Neither desk overwrites the other's change
+    assert desk_b.add_student_mark('SHILAJIT', 'CS101', 'Quiz', 9)[0]
+    assert desk_a.add_user('student', 'Newbie', 'pw', ['CS101'])[0]
+    desk_a.close()
+    desk_b.close()
+
+    dm = open_dm()
+    assert dm.get_attendance('Harshit', 'CS101') == 70
+    assert dm.get_marks('SHILAJIT', 'CS101')['Quiz'] == 9
+    assert 'Newbie' in dm.get_students_in_course('CS101')
+
+
+def test_change_events_follow_external_changes(data_dir, open_dm):
+    desk_a, desk_b = open_dm(shared=True), open_dm(shared=True)
+    events = []
+    desk_b.subscribe(events.extend)
+    desk_a.set_attendance('Harshit', 'CS101', 70)
+    desk_b.refresh()
+    assert events
+    assert desk_b.data_version('student_data', 'students', 'Harshit') > 0
+
+
+def test_shared_sqlite_desks(data_dir, open_dm):
+    db_file = str(data_dir / 'portal.db')
+    desk_a = open_dm(db_file=db_file, shared=True)
+    desk_b = open_dm(db_file=db_file, shared=True)
+    assert desk_a.set_attendance('Harshit', 'CS101', 33)[0]
+    desk_b.refresh()
+    assert desk_b.get_attendance('Harshit', 'CS101') == 33
+
+
+def test_export_cli_accepts_shared(tmp_path, monkeypatch):
+    from app import export_cli
+    (tmp_path / 'data').mkdir()
+    for name in DATA_FILES:
+        shutil.copy(os.path.join(ROOT, name), tmp_path / 'data' / name)
+    monkeypatch.chdir(tmp_path)
+    assert export_cli.main(['attendance', '--shared', '-o', 'out.csv']) == 0
+    assert (tmp_path / 'data' / '.portal.lock').exists()
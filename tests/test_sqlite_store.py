@@ -0,0 +1,50 @@
+# tests/test_sqlite_store.py
+
+from app.passwords import verify_password
+
+
+def test_json_is_migrated_to_sqlite_unchanged(data_dir, open_dm):
+    from_json = open_dm()
+    from_db = open_dm(db_file=str(data_dir / 'portal.db'))
+
+    assert from_db.courses == from_json.courses
+    assert from_db.get_exam_schedule() == from_json.get_exam_schedule()
+    assert set(from_db.student_data['students']) == set(from_json.student_data['students'])
+    for student_id in from_json.student_data['students']:
+        assert from_db.student_data['students'][student_id] == from_json.student_data['students'][student_id]
+    for role, users in from_json.credentials.items():
+        assert set(from_db.credentials[role]) == set(users)
+    assert verify_password('harshit12', from_db.credentials['student']['Harshit'])[0]
+
+
+def test_writes_round_trip_through_the_database(data_dir, open_dm):
+    db_file = str(data_dir / 'portal.db')
+    dm = open_dm(db_file=db_file)
+    assert dm.set_attendance('Harshit', 'CS101', 88)[0]
+    assert dm.add_marks_bulk('CS101', 'Quiz', {'Harshit': 4, 'SHILAJIT': 9})[0]
+    assert dm.add_user('student', 'Newbie', 'pw', ['MATH201'])[0]
+    assert dm.add_exam('Finals', '2026-12-01', '10:00')[0]
+    assert dm.delete_user('student', 'Shourya')[0]
+    dm.close()
+
+    dm = open_dm(db_file=db_file)
+    assert dm.get_attendance('Harshit', 'CS101') == 88
+    assert dm.get_marks('SHILAJIT', 'CS101') == {'Quiz': 9}
+    assert dm.validate_login('student', 'Newbie', 'pw')
+    assert dm.get_courses_for_student('Newbie') == ['MATH201']
+    assert 'Shourya' not in dm.credentials['student']
+    assert 'Shourya' not in dm.student_data['students']
+    assert {"subject": "Finals", "date": "2026-12-01", "time": "10:00"} in dm.get_exam_schedule()
+
+
+def test_uncompacted_journal_records_are_migrated(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    assert dm.set_attendance('Harshit', 'CS101', 99)[0]
+    assert dm.delete_user('student', 'Shourya')[0]
+
+    dm = open_dm(db_file=str(data_dir / 'portal.db'), journal_file=journal_file)
+    assert dm.get_attendance('Harshit', 'CS101') == 99
+    assert 'Shourya' not in dm.credentials['student']
+    assert 'Shourya' not in dm.student_data['students']
+    assert open(journal_file).read() == ""
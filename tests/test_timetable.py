@@ -0,0 +1,55 @@
+# tests/test_timetable.py
+
+import pytest
+
+from app.timetable import TimetableIndex, mask_slots, slot_mask
+
+
+def test_slot_masks_round_trip():
+    mask = slot_mask(["Wed 11:00", "Mon 9:00"])
+    assert mask_slots(mask) == ["Mon 9:00", "Wed 11:00"]
+    assert slot_mask([]) == 0
+    with pytest.raises(ValueError):
+        slot_mask(["Sat 9:00"])
+
+
+def test_index_finds_clashes_and_shares_grids():
+    courses = {"A": {"name": "Alpha", "timetable": ["Mon 9:00", "Tue 10:00"]},
+               "B": {"name": "Beta", "timetable": ["Tue 10:00"]},
+               "C": {"name": "Gamma", "timetable": ["Fri 12:00"]},
+               "D": {"name": "Broken", "timetable": ["Someday"]}}
+    index = TimetableIndex(courses)
+    assert index.masks["D"] == 0
+    assert index.clashes(["A", "B", "C"]) == [("A", "B", ["Tue 10:00"])]
+    assert index.find_clashes([("x", ["A", "C"]), ("y", ["B", "A"])]) == [("y", "B", "A", ["Tue 10:00"])]
+
+    grid = index.grid(["B", "A"])
+    assert grid is index.grid(["A", "B"])
+    assert dict(grid)["Tue"][1] == "Alpha / Beta"
+
+    courses["B"]["timetable"] = ["Wed 9:00"]
+    index.update_course("B")
+    assert index.clashes(["A", "B"]) == []
+    assert dict(index.grid(["A", "B"]))["Tue"][1] == "Alpha"
+
+
+def test_students_see_their_own_timetable(open_dm):
+    dm = open_dm()
+    rows = dict(dm.get_student_timetable('Harshit'))
+    assert rows['Mon'] == ['Basic Engineering', '', '', '']
+    assert rows['Fri'] == ['Intro to Python', 'Basic Engineering', '', '']
+    assert dm.find_timetable_clashes() == []
+
+
+def test_set_course_slots(open_dm):
+    dm = open_dm()
+    ok, message = dm.set_course_slots('CS101', ['Mon 9:00'])  # Prabhu teaches PHYS101 then
+    assert not ok and 'PHYS101' in message
+    assert not dm.set_course_slots('CS101', ['Noon'])[0]
+    assert not dm.set_course_slots('NOPE', [])[0]
+
+    ok, message = dm.set_course_slots('CHEM101', ['Mon 11:00', 'Tue 9:00'])
+    assert ok and '1 enrolled students' in message
+    assert dm.find_timetable_clashes() == [('sakcham', 'CHEM101', 'MATH201', ['Mon 11:00'])]
+    assert dict(dm.get_student_timetable('sakcham'))['Mon'][2] == 'Chemistry / Calculus I'
+    assert dm.find_timetable_clashes(['Harshit']) == []
@@ -0,0 +1,85 @@
+# tests/test_writer.py
+
+import threading
+
+import pytest
+
+from app import data_manager as data_manager_module
+from app.writer import BackgroundWriter
+
+
+def test_jobs_run_in_order_and_keyed_jobs_coalesce():
+    writer = BackgroundWriter()
+    gate = threading.Event()
+    ran = []
+    writer.submit(None, gate.wait)  # Hold the worker so later jobs queue up
+    writer.submit('courses', lambda: ran.append('courses 1'))
+    writer.submit(None, lambda: ran.append('append'))
+    writer.submit('courses', lambda: ran.append('courses 2'))  # Dropped: 'courses' is still queued
+    gate.set()
+    writer.close()
+    assert ran == ['courses 1', 'append']
+    with pytest.raises(RuntimeError):
+        writer.submit(None, lambda: None)
+
+
+def test_wait_reraises_a_failed_job():
+    writer = BackgroundWriter()
+    writer.submit(None, lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        writer.wait()
+    writer.wait()  # Reported once
+    writer.close()
+
+
+def test_background_writes_keep_appends_and_compactions_in_order(data_dir, open_dm):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file, compact_every=7, background_writes=True)
+    for i in range(100):
+        dm.set_attendance('Harshit', 'CS101', i)
+        dm.add_student_mark('SHILAJIT', 'CS101', 'Quiz', i % 20)
+    dm.flush()
+
+    reopened = open_dm(journal_file=journal_file)
+    assert reopened.get_attendance('Harshit', 'CS101') == 99
+    assert reopened.get_marks('SHILAJIT', 'CS101')['Quiz'] == 19
+
+
+def test_compaction_writes_files_without_holding_the_lock(data_dir, open_dm, monkeypatch):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file, background_writes=True)
+    dm.set_attendance('Harshit', 'CS101', 55)
+    dm.flush()
+
+    held = []
+    real_write = data_manager_module.atomic_write
+
+    def atomic_write(path, data, batcher=None):
+        held.append(dm.lock._is_owned())
+        real_write(path, data, batcher)
+    monkeypatch.setattr(data_manager_module, 'atomic_write', atomic_write)
+    dm.compact()
+    assert held == [False, False, False]
+    assert open(journal_file).read() == ""
+
+
+def test_records_appended_during_a_compaction_are_kept(data_dir, open_dm, monkeypatch):
+    journal_file = str(data_dir / 'journal.log')
+    dm = open_dm(journal_file=journal_file)
+    dm.set_attendance('Harshit', 'CS101', 55)
+
+    real_write = data_manager_module.atomic_write
+
+    def atomic_write(path, data, batcher=None):
+        real_write(path, data, batcher)
+        if path == dm.student_data_file:
+            # Another thread saves a change after the snapshot was encoded
+            thread = threading.Thread(target=dm.set_attendance, args=('Harshit', 'CS101', 56))
+            thread.start()
+            thread.join()
+    monkeypatch.setattr(data_manager_module, 'atomic_write', atomic_write)
+    dm.compact()
+    monkeypatch.undo()
+    assert len(open(journal_file).read().splitlines()) == 1
+
+    assert open_dm(journal_file=journal_file).get_attendance('Harshit', 'CS101') == 56
@@ -0,0 +1,107 @@
+# app/timetable.py
+
+# The week is a fixed grid of teaching periods. Each (day, period) slot owns
+# one bit, so a course's timetable is an int bitmask and two courses clash
+# exactly when their masks share a bit.
+
+DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri')
+PERIODS = ('9:00', '10:00', '11:00', '12:00')
+PERIOD_LABELS = ('9:00 - 9:50', '10:00 - 10:50', '11:00 - 11:50', '12:00 - 12:50')
+
+SLOT_BITS = {f"{day} {start}": d * len(PERIODS) + p
+             for d, day in enumerate(DAYS) for p, start in enumerate(PERIODS)}
+SLOT_NAMES = {bit: name for name, bit in SLOT_BITS.items()}
+
+
+def slot_mask(slots):
+    """Returns the bitmask for slots like ["Mon 9:00", "Wed 11:00"]."""
+    mask = 0
+    for slot in slots:
+        bit = SLOT_BITS.get(slot)
+        if bit is None:
+            raise ValueError(f"Unknown timetable slot '{slot}'.")
+        mask |= 1 << bit
+    return mask
+
+
+def mask_slots(mask):
+    """Returns the slot names set in a mask, in week order."""
+    return [SLOT_NAMES[bit] for bit in range(len(SLOT_BITS)) if mask >> bit & 1]
+
+
+class TimetableIndex:
+    """Course slot masks plus a cache of rendered per-student timetables.
+
+    Students with the same set of courses share one cached grid, so the
+    cache stays small even for thousands of students.
+    """
+    def __init__(self, courses, max_cached=512):
+        self.courses = courses
+        self.max_cached = max_cached
+        self.masks = {}
+        self._grids = {}
+        self.rebuild()
+
+    def rebuild(self):
+        self.masks = {}
+        for course_id, data in self.courses.items():
+            try:
+                self.masks[course_id] = slot_mask(data.get('timetable', []))
+            except ValueError:
+                self.masks[course_id] = 0
+        self._grids = {}
+
+    def update_course(self, course_id):
+        self.masks[course_id] = slot_mask(self.courses.get(course_id, {}).get('timetable', []))
+        self._grids = {}
+
+    def grid(self, course_ids):
+        """Returns [(day, [course name or '' per period])] for a set of courses."""
+        key = tuple(sorted(course_ids))
+        rows = self._grids.get(key)
+        if rows is None:
+            cells = [[''] * len(PERIODS) for _ in DAYS]
+            for course_id in key:
+                name = self.courses.get(course_id, {}).get('name', course_id)
+                mask = self.masks.get(course_id, 0)
+                for bit in range(len(SLOT_BITS)):
+                    if mask >> bit & 1:
+                        day, period = divmod(bit, len(PERIODS))
+                        cell = cells[day][period]
+                        cells[day][period] = f"{cell} / {name}" if cell else name
+            rows = list(zip(DAYS, cells))
+            if len(self._grids) >= self.max_cached:
+                self._grids.pop(next(iter(self._grids)))
+            self._grids[key] = rows
+        return rows
+
+    def clashes(self, course_ids):
+        """Returns (course_a, course_b, [slots]) for every overlapping pair in a set."""
+        found = []
+        seen = 0
+        placed = []
+        for course_id in course_ids:
+            mask = self.masks.get(course_id, 0)
+            if seen & mask:
+                # Only now look for the partner(s); the common case is one AND per course
+                for other, other_mask in placed:
+                    if other_mask & mask:
+                        found.append((other, course_id, mask_slots(other_mask & mask)))
+            seen |= mask
+            placed.append((course_id, mask))
+        return found
+
+    def find_clashes(self, assignments):
+        """Checks many assignments at once.
+
+        assignments yields (owner, course_ids) pairs, e.g. students with their
+        enrolled courses; returns [(owner, course_a, course_b, slots)].
+        """
+        clashes = []
+        cache = {}
+        for owner, course_ids in assignments:
+            key = tuple(course_ids)
+            if key not in cache:
+                cache[key] = self.clashes(key)
+            clashes.extend((owner,) + clash for clash in cache[key])
+        return clashes
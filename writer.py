@@ -0,0 +1,78 @@
+# app/writer.py
+
+import sys
+import threading
+import traceback
+from collections import deque
+
+
+class BackgroundWriter:
+    """Runs DataManager save jobs on a worker thread, in submission order.
+
+    Jobs submitted with a key (e.g. 'student_data') are coalesced: if a job
+    for the same key is still waiting, the new one is dropped, because the
+    waiting job reads the latest in-memory state when it runs. Jobs with
+    key=None (journal appends) always run.
+    """
+    def __init__(self):
+        self._queue = deque()
+        self._pending_keys = set()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="DataManagerWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, key, job):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BackgroundWriter is closed.")
+            if key is not None:
+                if key in self._pending_keys:
+                    return
+                self._pending_keys.add(key)
+            self._queue.append((key, job))
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                key, job = self._queue.popleft()
+                self._pending_keys.discard(key)
+                self._busy = True
+            try:
+                job()
+            except Exception as e:
+                self.error = e
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def wait(self):
+        """Durability barrier: blocks until every submitted job has run.
+
+        Re-raises the last error a job hit, if any.
+        """
+        with self._cond:
+            while self._queue or self._busy:
+                self._cond.wait()
+        if self.error:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        """Waits for outstanding jobs and stops the worker thread."""
+        try:
+            self.wait()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()